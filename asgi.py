@@ -0,0 +1,370 @@
+#!/usr/bin/env python3
+"""ASGI entry point for async serving (e.g. `uvicorn asgi:application`).
+
+The character and campaign API routes that players hit constantly at the
+table are served natively on the async Mongo driver, so a single worker
+can keep hundreds of requests in flight while they wait on the database.
+Every other route (auth, pages, admin, character creation, advancement)
+is handed to the Flask app through asgiref's WsgiToAsgi, which runs it in
+a thread pool. Both paths accept the same JWTs and session cookies.
+
+Validation, serialization, pagination and access checks come from
+swrpg_character_manager.api_common, shared with the Flask handlers; this
+module only adds the ASGI request/response glue.
+"""
+
+import asyncio
+import json
+import os
+import re
+import sys
+from dataclasses import dataclass
+from http.cookies import SimpleCookie
+from urllib.parse import parse_qs
+
+# Add the src directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+# Add the web directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'web'))
+
+# Change to web directory so Flask can find templates and static files
+web_dir = os.path.join(os.path.dirname(__file__), 'web')
+os.chdir(web_dir)
+
+from bson import ObjectId
+from flask_jwt_extended import decode_token
+
+from app_with_auth import app as flask_app
+from swrpg_character_manager import api_common
+from swrpg_character_manager.async_database import async_db_manager
+
+try:
+    from asgiref.wsgi import WsgiToAsgi
+except ImportError:  # asgiref is only needed for the routes Flask still serves
+    WsgiToAsgi = None
+
+SECURITY_HEADERS = [
+    (b'x-content-type-options', b'nosniff'),
+    (b'x-frame-options', b'DENY'),
+    (b'x-xss-protection', b'1; mode=block'),
+    (b'referrer-policy', b'strict-origin-when-cross-origin'),
+    (b'server', b'SWRPG-Manager'),
+]
+
+
+class Request:
+    """The parts of an ASGI HTTP request the native routes need."""
+
+    def __init__(self, scope, receive):
+        self.method = scope['method']
+        self.path = scope['path']
+        self.headers = {name.decode('latin-1').lower(): value.decode('latin-1')
+                        for name, value in scope.get('headers', [])}
+        self.query = parse_qs(scope.get('query_string', b'').decode('latin-1'))
+        self._receive = receive
+
+    def arg(self, name):
+        values = self.query.get(name)
+        return values[0] if values else None
+
+    async def json(self):
+        body = b''
+        while True:
+            message = await self._receive()
+            body += message.get('body', b'')
+            if not message.get('more_body'):
+                break
+        try:
+            return json.loads(body) if body else None
+        except ValueError:
+            return None  # Like Flask's get_json(silent=True); validation rejects it
+
+
+async def send_json(send, payload, status=200):
+    body = json.dumps(payload).encode('utf-8')
+    await send({
+        'type': 'http.response.start',
+        'status': status,
+        'headers': [(b'content-type', b'application/json'),
+                    (b'content-length', str(len(body)).encode())] + SECURITY_HEADERS
+    })
+    await send({'type': 'http.response.body', 'body': body})
+
+
+async def send_ndjson(send, records):
+    """Stream an async iterator of dicts as NDJSON, one chunk per record.
+
+    Once the response has started its status can't change, so a failure
+    mid-stream ends the body with an {"error": ...} line instead of raising
+    into the handler that would try to start a second response.
+    """
+    await send({
+        'type': 'http.response.start',
+        'status': 200,
+        'headers': [(b'content-type', api_common.NDJSON_MIMETYPE.encode())] + SECURITY_HEADERS
+    })
+    tail = b''
+    try:
+        async for record in records:
+            line = api_common.ndjson_line(record)
+            await send({'type': 'http.response.body', 'body': line.encode('utf-8'), 'more_body': True})
+    except Exception as e:
+        flask_app.logger.error(f"NDJSON stream interrupted: {e}")
+        tail = json.dumps({'error': 'Stream interrupted'}).encode('utf-8') + b'\n'
+    await send({'type': 'http.response.body', 'body': tail})
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+def validated(parse, *args):
+    """Run an api_common parser, turning its ValueError into a 400."""
+    try:
+        return parse(*args)
+    except ValueError as e:
+        raise HTTPError(400, str(e))
+
+
+# Authentication (mirrors AuthManager.require_auth: JWT first, then the session cookie)
+@dataclass
+class Principal:
+    user_id: ObjectId
+    role: str
+
+
+def _jwt_user_id(request):
+    authorization = request.headers.get('authorization', '')
+    if not authorization.startswith('Bearer '):
+        return None, None
+    try:
+        with flask_app.app_context():
+            claims = decode_token(authorization[len('Bearer '):])
+        return ObjectId(claims['sub']), claims
+    except Exception:
+        return None, None
+
+
+def _session_user_id(request):
+    cookie = SimpleCookie(request.headers.get('cookie', '')).get(flask_app.config['SESSION_COOKIE_NAME'])
+    if cookie is None:
+        return None
+    try:
+        serializer = flask_app.session_interface.get_signing_serializer(flask_app)
+        data = serializer.loads(cookie.value, max_age=int(flask_app.permanent_session_lifetime.total_seconds()))
+    except Exception:
+        return None
+    if data.get('user_id') and data.get('authenticated'):
+        return ObjectId(data['user_id'])
+    return None
+
+
+async def authenticate(request):
+    """Resolve the request's user, or raise 401."""
+    user_id, claims = _jwt_user_id(request)
+    if user_id is None:
+        user_id = _session_user_id(request)
+    if user_id is None:
+        raise HTTPError(401, 'Authentication required')
+
+    state = await async_db_manager.get_user_auth_state(user_id)
+    if not state or not state['is_active']:
+        raise HTTPError(401, 'Authentication required')
+    if claims and not api_common.token_version_current(claims, state['token_version']):
+        raise HTTPError(401, 'Authentication required')  # Token revoked
+
+    return Principal(user_id, state['role'])
+
+
+def get_page_args(request):
+    """Parse keyset pagination arguments (?limit=&after=), as the Flask app does."""
+    return validated(api_common.parse_page_args, request.arg('limit'), request.arg('after'))
+
+
+def wants_ndjson(request):
+    return api_common.wants_ndjson(request.arg('format'), request.headers.get('accept'))
+
+
+async def paginated_response(request, send, key, fetch, serialize):
+    """Async counterpart of app_with_auth.paginated_response."""
+    limit, after = get_page_args(request)
+
+    if wants_ndjson(request):
+        async def records():
+            async for record in fetch(after, limit):
+                yield serialize(record)
+        return await send_ndjson(send, records())
+
+    items = [serialize(record) async for record in fetch(after, api_common.page_fetch_limit(limit))]
+    await send_json(send, api_common.build_page(key, items, limit))
+
+
+async def load_owned_character(character_id, principal, allow_admin=False, active_only=False):
+    character = await async_db_manager.get_character_by_id(ObjectId(character_id))
+    error = api_common.character_access_error(character, principal.user_id, principal.role,
+                                              allow_admin=allow_admin, active_only=active_only)
+    if error:
+        raise HTTPError(*error)
+    return character
+
+
+# Native routes
+async def list_characters(request, send):
+    principal = await authenticate(request)
+
+    await paginated_response(
+        request, send, 'characters',
+        lambda after, limit: async_db_manager.iter_user_character_summaries(principal.user_id, after=after, limit=limit),
+        api_common.serialize_character_summary
+    )
+
+
+async def get_character_detail(request, send, character_id):
+    principal = await authenticate(request)
+    character = await load_owned_character(character_id, principal, allow_admin=True)
+
+    await send_json(send, api_common.serialize_character_detail(character))
+
+
+async def update_character(request, send, character_id):
+    principal = await authenticate(request)
+    await load_owned_character(character_id, principal)
+
+    updates = validated(api_common.character_updates, await request.json())
+    if await async_db_manager.update_character(ObjectId(character_id), updates):
+        await send_json(send, {'message': 'Character updated successfully'})
+    else:
+        raise HTTPError(500, 'Failed to update character')
+
+
+async def delete_character(request, send, character_id):
+    principal = await authenticate(request)
+    await load_owned_character(character_id, principal, active_only=True)
+
+    # Mark character as inactive instead of deleting
+    if await async_db_manager.deactivate_character(ObjectId(character_id)):
+        await send_json(send, {'message': 'Character deleted successfully'})
+    else:
+        raise HTTPError(500, 'Failed to delete character')
+
+
+async def award_xp(request, send, character_id):
+    principal = await authenticate(request)
+    xp_amount, reason = validated(api_common.parse_xp_award, await request.json())
+
+    owner_filter = api_common.xp_award_owner_filter(principal.role, principal.user_id)
+    result = await async_db_manager.award_character_xp(ObjectId(character_id), xp_amount, user_id=owner_filter)
+
+    if not result:
+        if not await async_db_manager.get_character_by_id(ObjectId(character_id)):
+            raise HTTPError(404, 'Character not found')
+        raise HTTPError(403, 'Access denied')
+
+    await send_json(send, {
+        'message': f'Awarded {xp_amount} XP for: {reason}',
+        'total_xp': result['total_xp'],
+        'available_xp': result['available_xp']
+    })
+
+
+async def list_campaigns(request, send):
+    principal = await authenticate(request)
+
+    await paginated_response(
+        request, send, 'campaigns',
+        lambda after, limit: async_db_manager.iter_user_campaigns(principal.user_id, after=after, limit=limit),
+        lambda campaign: api_common.serialize_campaign_summary(campaign, principal.user_id)
+    )
+
+
+async def create_campaign(request, send):
+    principal = await authenticate(request)
+    campaign = validated(api_common.new_campaign, await request.json(), principal.user_id)
+    campaign_id = await async_db_manager.create_campaign(campaign)
+
+    await send_json(send, api_common.serialize_created_campaign(campaign_id, campaign), status=201)
+
+
+ROUTES = [
+    ('GET', re.compile(r'^/api/characters/?$'), list_characters),
+    ('GET', re.compile(r'^/api/characters/(?P<character_id>[0-9a-fA-F]{24})$'), get_character_detail),
+    ('PUT', re.compile(r'^/api/characters/(?P<character_id>[0-9a-fA-F]{24})$'), update_character),
+    ('DELETE', re.compile(r'^/api/characters/(?P<character_id>[0-9a-fA-F]{24})$'), delete_character),
+    ('POST', re.compile(r'^/api/characters/(?P<character_id>[0-9a-fA-F]{24})/award-xp$'), award_xp),
+    ('GET', re.compile(r'^/api/campaigns/?$'), list_campaigns),
+    ('POST', re.compile(r'^/api/campaigns/?$'), create_campaign),
+]
+
+
+def match_route(method, path):
+    for route_method, pattern, handler in ROUTES:
+        if route_method == method:
+            match = pattern.match(path)
+            if match:
+                return handler, match.groupdict()
+    return None, None
+
+
+_connect_lock = asyncio.Lock()
+
+
+async def ensure_connected():
+    """Connect the async manager on first use (for servers without lifespan events)."""
+    if async_db_manager.client is None:
+        async with _connect_lock:
+            if async_db_manager.client is None:
+                await async_db_manager.connect()
+
+
+async def flask_fallback(scope, receive, send):
+    if WsgiToAsgi is None:
+        return await send_json(send, {'error': 'This route needs asgiref installed for ASGI serving'}, 501)
+    return await _wsgi_app(scope, receive, send)
+
+
+_wsgi_app = WsgiToAsgi(flask_app) if WsgiToAsgi is not None else None
+
+
+async def application(scope, receive, send):
+    """ASGI application: native async routes, everything else through Flask."""
+    if scope['type'] == 'lifespan':
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                try:
+                    await ensure_connected()
+                except Exception as e:
+                    await send({'type': 'lifespan.startup.failed', 'message': str(e)})
+                    return
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await async_db_manager.disconnect()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    if scope['type'] != 'http':
+        return await flask_fallback(scope, receive, send)
+
+    handler, params = match_route(scope['method'], scope['path'])
+    if handler is None:
+        return await flask_fallback(scope, receive, send)
+
+    request = Request(scope, receive)
+    try:
+        await ensure_connected()
+        await handler(request, send, **params)
+    except HTTPError as e:
+        await send_json(send, {'error': e.message}, e.status)
+    except Exception as e:
+        flask_app.logger.error(f"{request.method} {request.path} error: {e}")
+        await send_json(send, {'error': 'Operation failed'}, 500)
+
+
+if __name__ == "__main__":
+    # For development/testing only
+    import uvicorn
+    uvicorn.run(application, host='0.0.0.0', port=8000)
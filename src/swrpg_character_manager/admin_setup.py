@@ -48,10 +48,11 @@ def ensure_admin_user_exists(admin_email: str, admin_password: str) -> Tuple[Use
     existing_admin = db_manager.get_user_by_email(admin_email)
     if existing_admin:
         print(f"✅ Admin user {admin_email} already exists")
-        # Always update password to ensure it's current
-        updates = {"password_hash": auth_manager.hash_password(admin_password)}
-        db_manager.update_user(existing_admin._id, updates)
-        print("🔄 Updated admin password")
+        # Update password only when it changed, so restarts don't revoke admin tokens
+        if not auth_manager.verify_password(admin_password, existing_admin.password_hash):
+            updates = {"password_hash": auth_manager.hash_password(admin_password)}
+            db_manager.update_user(existing_admin._id, updates)
+            print("🔄 Updated admin password")
         return existing_admin, False
     else:
         # Create new admin user
@@ -0,0 +1,222 @@
+"""Request-independent parts of the character and campaign API.
+
+The same endpoints are served by the Flask app (web/app_with_auth.py) and,
+in ASGI mode, by the native async routes (asgi.py). Each of those keeps only
+its framework glue - reading the request, running the query, sending the
+response - and calls these functions for validation, serialization,
+pagination and access decisions, so the two cannot drift apart.
+
+Validation failures raise ValueError with a client-facing message; the Flask
+routes answer it with 400 and asgi.py turns it into HTTPError(400).
+"""
+
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+from bson import ObjectId
+from werkzeug.datastructures import MIMEAccept
+from werkzeug.http import parse_accept_header
+
+from .database import Campaign
+
+# Largest page a listing endpoint will return when ?limit= is given
+MAX_PAGE_SIZE = 500
+
+NDJSON_MIMETYPE = 'application/x-ndjson'
+
+# Character fields a player may change through PUT /api/characters/<id>
+UPDATABLE_CHARACTER_FIELDS = ['name', 'player_name', 'background', 'brawn', 'agility',
+                              'intellect', 'cunning', 'willpower', 'presence', 'credits',
+                              'equipment', 'obligations', 'skills', 'talents']
+
+# Roles that may award XP to characters they don't own
+XP_AWARDING_ROLES = ('admin', 'gamemaster')
+
+
+# Pagination
+def parse_page_args(limit: Optional[str], after: Optional[str],
+                    default_limit: Optional[int] = None) -> Tuple[Optional[int], Optional[ObjectId]]:
+    """Parse the raw ?limit= and ?after= values of a keyset-paginated listing."""
+    if limit is None:
+        limit = default_limit
+    else:
+        try:
+            limit = int(limit)
+        except ValueError:
+            raise ValueError('limit must be an integer')
+    if limit is not None and not 1 <= limit <= MAX_PAGE_SIZE:
+        raise ValueError(f'limit must be between 1 and {MAX_PAGE_SIZE}')
+
+    if after:
+        if not ObjectId.is_valid(after):
+            raise ValueError('Invalid after cursor')
+        after = ObjectId(after)
+
+    return limit, after or None
+
+
+def wants_ndjson(format_param: Optional[str], accept_header: Optional[str]) -> bool:
+    """Whether the client asked for a streamed NDJSON listing (?format=ndjson or Accept)."""
+    return (format_param == 'ndjson' or
+            parse_accept_header(accept_header or '', MIMEAccept).best == NDJSON_MIMETYPE)
+
+
+def page_fetch_limit(limit: Optional[int]) -> Optional[int]:
+    """Records to fetch for a JSON page: one extra to learn whether another page exists."""
+    return limit + 1 if limit else None
+
+
+def build_page(key: str, items: List[Dict], limit: Optional[int]) -> Dict:
+    """JSON page body from up to page_fetch_limit(limit) serialized records."""
+    next_cursor = None
+    if limit and len(items) > limit:
+        items = items[:limit]
+        next_cursor = items[-1]['id']
+    return {key: items, 'total': len(items), 'next': next_cursor}
+
+
+def ndjson_line(record: Dict) -> str:
+    return json.dumps(record, separators=(',', ':')) + '\n'
+
+
+# Serialization
+def serialize_character_summary(char) -> Dict:
+    """List-view fields of a CharacterSummary (or Character)."""
+    return {
+        'id': str(char._id),
+        'name': char.name,
+        'playerName': char.player_name,
+        'species': char.species,
+        'career': char.career,
+        'background': char.background or '',
+        'created_at': char.created_at.isoformat() if char.created_at else None
+    }
+
+
+def serialize_character_detail(character) -> Dict:
+    """Full character sheet for GET /api/characters/<id>."""
+    return {
+        'id': str(character._id),
+        'name': character.name,
+        'player_name': character.player_name,
+        'species': character.species,
+        'career': character.career,
+        'background': character.background,
+        'brawn': character.brawn,
+        'agility': character.agility,
+        'intellect': character.intellect,
+        'cunning': character.cunning,
+        'willpower': character.willpower,
+        'presence': character.presence,
+        'total_xp': character.total_xp,
+        'available_xp': character.available_xp,
+        'spent_xp': character.spent_xp,
+        'skills': character.skills,
+        'talents': character.talents,
+        'credits': character.credits,
+        'equipment': character.equipment,
+        'obligations': character.obligations,
+        'creation_context': character.creation_context,
+        'created_at': character.created_at.isoformat() if character.created_at else None,
+        'updated_at': character.updated_at.isoformat() if character.updated_at else None,
+        'campaign_id': str(character.campaign_id) if character.campaign_id else None
+    }
+
+
+def serialize_campaign_summary(campaign: Campaign, user_id: ObjectId) -> Dict:
+    """List-view fields of a campaign, as seen by user_id."""
+    return {
+        'id': str(campaign._id),
+        'name': campaign.name,
+        'description': campaign.description,
+        'is_game_master': campaign.game_master_id == user_id,
+        'player_count': len(campaign.players),
+        'character_count': len(campaign.characters),
+        'created_at': campaign.created_at.isoformat()
+    }
+
+
+def serialize_created_campaign(campaign_id: ObjectId, campaign: Campaign) -> Dict:
+    """Response body for POST /api/campaigns."""
+    return {
+        'message': 'Campaign created successfully',
+        'campaign_id': str(campaign_id),
+        'campaign': {
+            'id': str(campaign_id),
+            'name': campaign.name,
+            'description': campaign.description,
+            'game_system': campaign.settings['game_system'],
+            'max_players': campaign.settings['max_players']
+        }
+    }
+
+
+# Validation
+def character_updates(data: Any) -> Dict:
+    """The whitelisted fields of a character update body."""
+    if not isinstance(data, dict):
+        raise ValueError('Request body must be a JSON object')
+    updates = {field: data[field] for field in UPDATABLE_CHARACTER_FIELDS if field in data}
+    if not updates:
+        raise ValueError('No valid fields to update')
+    return updates
+
+
+def is_positive_xp(amount: Any) -> bool:
+    """XP amounts are positive integers (JSON true/false are not amounts)."""
+    return isinstance(amount, int) and not isinstance(amount, bool) and amount > 0
+
+
+def parse_xp_award(data: Any) -> Tuple[int, str]:
+    """(xp_amount, reason) of a single-character award body."""
+    if not isinstance(data, dict):
+        raise ValueError('Request body must be a JSON object')
+    xp_amount = data.get('xp_amount', 0)
+    if not is_positive_xp(xp_amount):
+        raise ValueError('XP amount must be positive')
+    return xp_amount, data.get('reason', 'XP Award')
+
+
+def xp_award_owner_filter(role: str, user_id: ObjectId) -> Optional[ObjectId]:
+    """Owners may award their own characters; GMs and admins may award any."""
+    return None if role in XP_AWARDING_ROLES else user_id
+
+
+def new_campaign(data: Any, game_master_id: ObjectId) -> Campaign:
+    """Campaign to create from a POST /api/campaigns body."""
+    if not isinstance(data, dict):
+        raise ValueError('Request body must be a JSON object')
+    if not isinstance(data.get('name'), str) or not data['name'].strip():
+        raise ValueError('Campaign name is required')
+    if not data.get('game_system'):
+        raise ValueError('Game system is required')
+
+    return Campaign(
+        name=data['name'].strip(),
+        description=data.get('description', ''),
+        game_master_id=game_master_id,
+        settings={
+            'game_system': data.get('game_system'),
+            'max_players': data.get('max_players', 4)
+        }
+    )
+
+
+# Access checks
+def character_access_error(character, user_id: ObjectId, role: Optional[str] = None,
+                           allow_admin: bool = False, active_only: bool = False) -> Optional[Tuple[int, str]]:
+    """(status, message) when user_id may not act on character, else None."""
+    if not character or (active_only and not character.is_active):
+        return 404, 'Character not found'
+    if character.user_id != user_id and not (allow_admin and role == 'admin'):
+        return 403, 'Access denied'
+    return None
+
+
+def token_version_current(claims: Dict, current_version: Optional[int]) -> bool:
+    """Whether a JWT is still valid for a user at current_version (None: gone or disabled).
+
+    Tokens issued before versioning carry no 'ver' claim and are only
+    rejected for missing or disabled users.
+    """
+    return current_version is not None and claims.get('ver', current_version) == current_version
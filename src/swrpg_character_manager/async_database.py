@@ -0,0 +1,205 @@
+"""Async MongoDB operations for the ASGI serving mode (see asgi.py).
+
+Mirrors the subset of MongoDBManager used by the character and campaign
+API routes, on pymongo's native asyncio client (AsyncMongoClient, hence
+the pymongo>=4.9 requirement). The models, projections and update documents are
+shared with the sync manager so both modes read and write the same shapes.
+Indexes are created by the sync manager at startup.
+"""
+
+import os
+from dataclasses import asdict
+from datetime import datetime, timezone
+from typing import AsyncIterator, Dict, Optional
+
+from bson import ObjectId
+from pymongo import AsyncMongoClient, ReturnDocument
+
+from .mongo_pool import PoolMetricsListener, mongo_client_options
+from .database import (
+    Campaign, Character, CharacterSummary, CHARACTER_SUMMARY_PROJECTION, STATS_COUNTERS_ID, db_manager
+)
+
+
+class AsyncMongoDBManager:
+    """Async counterpart of MongoDBManager for the character and campaign routes."""
+
+    def __init__(self):
+        self.client = None
+        self.db = None
+        self.users = None
+        self.campaigns = None
+        self.characters = None
+        self.stats_counters = None
+        self.pool_listener = None
+
+        # Per-process cache of the user fields authorization needs, shared with
+        # db_manager so password, role and activation changes made through the
+        # Flask routes in this process revoke tokens here at once
+        self.auth_state_cache = db_manager.auth_state_cache
+        # Campaign dashboards are served by the Flask app in this process from
+        # db_manager's cache; character writes made here drop their entry too
+        self.dashboard_cache = db_manager.dashboard_cache
+
+    async def connect(self):
+        """Connect to MongoDB. Must run inside the serving event loop."""
+        try:
+            mongodb_uri = os.getenv('MONGO_URI', os.getenv('MONGODB_URI', 'mongodb://localhost:27017/'))
+            db_name = os.getenv('MONGODB_DB', 'swrpg_manager')
+
+            # Same pool, timeout and compression settings as the sync manager
+            self.pool_listener = PoolMetricsListener()
+            self.client = AsyncMongoClient(mongodb_uri, event_listeners=[self.pool_listener],
+                                           **mongo_client_options(mongodb_uri))
+            self.pool_listener.max_pool_size = self.client.options.pool_options.max_pool_size
+            self.db = self.client[db_name]
+            self.users = self.db.users
+            self.campaigns = self.db.campaigns
+            self.characters = self.db.characters
+            self.stats_counters = self.db.stats_counters
+
+            await self.client.admin.command('ping')
+            print("✅ Connected to MongoDB (async) successfully")
+
+        except Exception as e:
+            print(f"❌ Failed to connect to MongoDB (async): {e}")
+            raise
+
+    async def disconnect(self):
+        """Disconnect from MongoDB."""
+        if self.client:
+            await self.client.close()
+
+    def pool_metrics(self) -> Dict:
+        """Connection pool utilization for this process."""
+        if self.pool_listener is None:
+            return {'connected': False}
+        return dict(self.pool_listener.snapshot(), connected=True)
+
+    # User operations
+    async def get_user_auth_state(self, user_id: ObjectId) -> Optional[Dict]:
+        """Get role, active flag and token version for a user (cached briefly), or None."""
+        state = self.auth_state_cache.get(user_id)
+        if state is None:
+            doc = await self.users.find_one(
+                {"_id": user_id}, {"role": 1, "is_active": 1, "token_version": 1}
+            )
+            state = {
+                "role": doc.get('role', 'player'),
+                "is_active": doc.get('is_active', True),
+                "token_version": doc.get('token_version', 0)
+            } if doc else {}
+            self.auth_state_cache.set(user_id, state)
+
+        return state or None
+
+    # Campaign operations
+    async def create_campaign(self, campaign: Campaign) -> ObjectId:
+        """Create a new campaign."""
+        campaign_dict = asdict(campaign)
+        campaign_dict.pop('_id', None)
+        result = await self.campaigns.insert_one(campaign_dict)
+        await self._increment_stat('total_campaigns', 1)
+        return result.inserted_id
+
+    async def iter_user_campaigns(self, user_id: ObjectId, after: Optional[ObjectId] = None,
+                                  limit: Optional[int] = None) -> AsyncIterator[Campaign]:
+        """Iterate a user's campaigns in _id order, resuming after a keyset cursor."""
+        query = {
+            "$or": [
+                {"game_master_id": user_id},
+                {"players": user_id}
+            ],
+            "is_active": True
+        }
+        if after:
+            query["_id"] = {"$gt": after}
+
+        cursor = self.campaigns.find(query).sort("_id", 1)
+        if limit:
+            cursor = cursor.limit(limit)
+        async for doc in cursor:
+            yield Campaign(**doc)
+
+    # Character operations
+    async def get_character_by_id(self, character_id: ObjectId) -> Optional[Character]:
+        """Get character by ID."""
+        doc = await self.characters.find_one({"_id": character_id})
+        return Character(**doc) if doc else None
+
+    async def iter_user_character_summaries(self, user_id: ObjectId, after: Optional[ObjectId] = None,
+                                            limit: Optional[int] = None) -> AsyncIterator[CharacterSummary]:
+        """Iterate a user's character summaries in _id order, resuming after a keyset cursor."""
+        query = {"user_id": user_id, "is_active": True}
+        if after:
+            query["_id"] = {"$gt": after}
+
+        cursor = self.characters.find(query, CHARACTER_SUMMARY_PROJECTION).sort("_id", 1)
+        if limit:
+            cursor = cursor.limit(limit)
+        async for doc in cursor:
+            yield CharacterSummary(**doc)
+
+    async def update_character(self, character_id: ObjectId, updates: Dict) -> bool:
+        """Update character document."""
+        updates['updated_at'] = datetime.now(timezone.utc)
+        previous = await self.characters.find_one_and_update(
+            {"_id": character_id}, {"$set": updates}, projection={"campaign_id": 1}
+        )
+        if previous is None:
+            return False
+        self._invalidate_character_dashboard(previous)
+        if updates.get("campaign_id"):
+            self.dashboard_cache.invalidate(updates["campaign_id"])
+        return True
+
+    async def deactivate_character(self, character_id: ObjectId) -> bool:
+        """Soft-delete a character (characters are never removed outright)."""
+        previous = await self.characters.find_one_and_update(
+            {"_id": character_id, "is_active": True},
+            {"$set": {"is_active": False, "updated_at": datetime.now(timezone.utc)}},
+            projection={"campaign_id": 1}
+        )
+        if previous is None:
+            return False
+        await self._increment_stat('total_characters', -1)
+        self._invalidate_character_dashboard(previous)
+        return True
+
+    async def award_character_xp(self, character_id: ObjectId, amount: int,
+                                 user_id: Optional[ObjectId] = None) -> Optional[Dict]:
+        """Atomically add XP to a character, optionally only if owned by user_id."""
+        query = {"_id": character_id}
+        if user_id:
+            query["user_id"] = user_id
+
+        return self._invalidate_character_dashboard(await self.characters.find_one_and_update(
+            query,
+            {
+                "$inc": {"total_xp": amount, "available_xp": amount},
+                "$set": {"updated_at": datetime.now(timezone.utc)}
+            },
+            projection={"total_xp": 1, "available_xp": 1, "campaign_id": 1},
+            return_document=ReturnDocument.AFTER
+        ))
+
+    def _invalidate_character_dashboard(self, doc: Optional[Dict]) -> Optional[Dict]:
+        """Drop the cached dashboard of a written character's campaign (see MongoDBManager)."""
+        if doc is not None:
+            campaign_id = doc.pop("campaign_id", None)
+            if campaign_id:
+                self.dashboard_cache.invalidate(campaign_id)
+        return doc
+
+
+    # Admin statistics (see MongoDBManager.get_admin_stats)
+    async def _increment_stat(self, field: str, amount: int):
+        try:
+            await self.stats_counters.update_one({"_id": STATS_COUNTERS_ID}, {"$inc": {field: amount}}, upsert=True)
+        except Exception as e:
+            # Counters are advisory; the next reconciliation repairs them
+            print(f"⚠️  Failed to update {field} counter: {e}")
+
+
+# Global async database manager instance (used by asgi.py)
+async_db_manager = AsyncMongoDBManager()
@@ -0,0 +1,257 @@
+"""Buffered, asynchronous delivery of security audit events.
+
+Request threads only append events to an in-memory ring buffer (a bounded
+deque, whose append is atomic), so logging never waits on I/O. A daemon
+thread drains the buffer in batches and hands each batch to the configured
+sinks. When the buffer is full the oldest events are dropped and counted,
+so a slow sink shows up in the metrics instead of as request latency.
+
+Configuration (environment):
+    AUDIT_SINKS            comma-separated: stdout, file, mongo (default: stdout)
+    AUDIT_LOG_FILE         JSONL path for the file sink (default: logs/audit.jsonl)
+    AUDIT_LOG_MAX_BYTES    rotate the file at this size (default: 10 MB)
+    AUDIT_LOG_BACKUPS      rotated files to keep (default: 5)
+    AUDIT_MONGO_COLLECTION capped collection for the mongo sink (default: audit_log)
+    AUDIT_MONGO_CAP_BYTES  capped collection size (default: 64 MB)
+    AUDIT_BUFFER_SIZE      ring buffer capacity (default: 10000)
+    AUDIT_BATCH_SIZE       events per sink write (default: 500)
+    AUDIT_FLUSH_INTERVAL   seconds between drains (default: 1.0)
+    AUDIT_SAMPLE_RATES     e.g. "email_decryption=0.01,get_user_by_id=0.1";
+                           only successful events are sampled, failures are always kept
+"""
+
+import atexit
+import json
+import logging
+import os
+import random
+import sys
+import threading
+from abc import ABC, abstractmethod
+from collections import deque
+from logging.handlers import RotatingFileHandler
+from typing import Dict, List, Optional
+
+
+class AuditSink(ABC):
+    """Destination for batches of audit events."""
+
+    @abstractmethod
+    def write_batch(self, events: List[Dict]):
+        """Deliver one batch; an exception is counted as a sink error."""
+
+    def close(self):
+        pass
+
+
+class StdoutSink(AuditSink):
+    """One line per event on stdout ("AUDIT LOG: {...}"), written with a single call per batch."""
+
+    def write_batch(self, events: List[Dict]):
+        sys.stdout.write("".join(
+            f"{event.get('log', 'audit').upper()} LOG: {json.dumps(event, default=str)}\n" for event in events
+        ))
+        sys.stdout.flush()
+
+
+class RotatingJSONLSink(AuditSink):
+    """Events appended to a JSONL file that rotates by size."""
+
+    def __init__(self, path: str, max_bytes: int = 10 * 1024 * 1024, backup_count: int = 5):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.handler = RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backup_count, encoding='utf-8')
+        self.handler.setFormatter(logging.Formatter('%(message)s'))
+
+    def write_batch(self, events: List[Dict]):
+        for event in events:
+            self.handler.emit(logging.makeLogRecord({"msg": json.dumps(event, default=str)}))
+        self.handler.flush()
+
+    def close(self):
+        self.handler.close()
+
+
+class MongoAuditSink(AuditSink):
+    """Events inserted into a capped MongoDB collection.
+
+    The collection is resolved through the shared db_manager on every write
+    (so forked workers use their own client) and created as capped on the
+    first write if it does not exist yet.
+    """
+
+    def __init__(self, collection_name: str = "audit_log", cap_bytes: int = 64 * 1024 * 1024):
+        self.collection_name = collection_name
+        self.cap_bytes = cap_bytes
+        self._created = False
+
+    def _get_collection(self):
+        from .database import db_manager
+
+        if db_manager.db is None:
+            raise RuntimeError("database not connected")
+        if not self._created:
+            if self.collection_name not in db_manager.db.list_collection_names():
+                db_manager.db.create_collection(self.collection_name, capped=True, size=self.cap_bytes)
+            self._created = True
+        return db_manager.db[self.collection_name]
+
+    def write_batch(self, events: List[Dict]):
+        # insert_many adds _id to the dicts; give it copies
+        self._get_collection().insert_many([dict(event) for event in events], ordered=False)
+
+
+class AuditPipeline:
+    """Ring buffer of audit events drained to sinks by a background thread.
+
+    emit() runs on every request thread, so the counters (and the
+    full-buffer check that decides whether an event is counted as dropped)
+    are updated under a lock.
+    """
+
+    def __init__(self, sinks: List[AuditSink], capacity: int = 10000, batch_size: int = 500,
+                 flush_interval: float = 1.0, sample_rates: Optional[Dict[str, float]] = None):
+        self.sinks = sinks
+        self.capacity = capacity
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.sample_rates = sample_rates or {}
+
+        self.enqueued = 0
+        self.written = 0
+        self.dropped = 0
+        self.sampled_out = 0
+        self.sink_errors = 0
+
+        self._buffer = deque(maxlen=capacity)
+        self._wakeup = threading.Event()
+        self._counters_lock = threading.Lock()
+        self._drain_lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._pid = None
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self._after_fork)
+
+    def _after_fork(self):
+        # Threads do not survive fork (gunicorn workers) and locks may have been
+        # copied while held; events still buffered belong to the parent.
+        self._buffer = deque(maxlen=self.capacity)
+        self._wakeup = threading.Event()
+        self._counters_lock = threading.Lock()
+        self._drain_lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._pid = None
+        self.enqueued = self.written = self.dropped = self.sampled_out = self.sink_errors = 0
+
+    def emit(self, key: str, event: Dict):
+        """Queue an event; never blocks. key selects the sampling rate."""
+        rate = self.sample_rates.get(key)
+        if rate is not None and event.get("success", True) and random.random() >= rate:
+            with self._counters_lock:
+                self.sampled_out += 1
+            return
+
+        with self._counters_lock:
+            if len(self._buffer) >= self.capacity:
+                self.dropped += 1  # deque(maxlen) discards the oldest event
+            self._buffer.append(event)
+            self.enqueued += 1
+
+        self._ensure_worker()
+        if len(self._buffer) >= self.batch_size:
+            self._wakeup.set()
+
+    def _ensure_worker(self):
+        if self._pid == os.getpid():
+            return
+        with self._start_lock:
+            if self._pid != os.getpid():
+                threading.Thread(target=self._run, name="audit-log-writer", daemon=True).start()
+                self._pid = os.getpid()
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+
+    def flush(self):
+        """Drain the buffer to every sink, one batch at a time."""
+        with self._drain_lock:
+            while self._buffer:
+                batch = []
+                while self._buffer and len(batch) < self.batch_size:
+                    batch.append(self._buffer.popleft())
+
+                errors = 0
+                for sink in self.sinks:
+                    try:
+                        sink.write_batch(batch)
+                    except Exception as e:
+                        errors += 1
+                        print(f"⚠️  Audit sink {type(sink).__name__} failed: {e}", file=sys.stderr)
+                with self._counters_lock:
+                    self.sink_errors += errors
+                    self.written += len(batch)
+
+    def metrics(self) -> Dict:
+        """Throughput and back-pressure counters for this process."""
+        with self._counters_lock:
+            return {
+                "enqueued": self.enqueued,
+                "written": self.written,
+                "dropped": self.dropped,
+                "sampled_out": self.sampled_out,
+                "sink_errors": self.sink_errors,
+                "buffered": len(self._buffer),
+                "capacity": self.capacity,
+                "sinks": [type(sink).__name__ for sink in self.sinks]
+            }
+
+    def close(self):
+        self.flush()
+        for sink in self.sinks:
+            sink.close()
+
+
+def _parse_sample_rates(value: str) -> Dict[str, float]:
+    rates = {}
+    for item in filter(None, (part.strip() for part in value.split(','))):
+        key, _, rate = item.partition('=')
+        try:
+            rates[key.strip()] = min(1.0, max(0.0, float(rate)))
+        except ValueError:
+            print(f"⚠️  Ignoring invalid audit sample rate: {item}")
+    return rates
+
+
+def create_audit_pipeline_from_env() -> AuditPipeline:
+    """Build the audit pipeline described by the AUDIT_* environment variables."""
+    sinks: List[AuditSink] = []
+    for name in (part.strip().lower() for part in os.getenv('AUDIT_SINKS', 'stdout').split(',')):
+        if name == 'stdout':
+            sinks.append(StdoutSink())
+        elif name == 'file':
+            sinks.append(RotatingJSONLSink(
+                os.getenv('AUDIT_LOG_FILE', 'logs/audit.jsonl'),
+                max_bytes=int(os.getenv('AUDIT_LOG_MAX_BYTES', str(10 * 1024 * 1024))),
+                backup_count=int(os.getenv('AUDIT_LOG_BACKUPS', '5'))
+            ))
+        elif name == 'mongo':
+            sinks.append(MongoAuditSink(
+                os.getenv('AUDIT_MONGO_COLLECTION', 'audit_log'),
+                cap_bytes=int(os.getenv('AUDIT_MONGO_CAP_BYTES', str(64 * 1024 * 1024)))
+            ))
+        elif name:
+            print(f"⚠️  Unknown audit sink: {name}")
+
+    pipeline = AuditPipeline(
+        sinks,
+        capacity=int(os.getenv('AUDIT_BUFFER_SIZE', '10000')),
+        batch_size=int(os.getenv('AUDIT_BATCH_SIZE', '500')),
+        flush_interval=float(os.getenv('AUDIT_FLUSH_INTERVAL', '1.0')),
+        sample_rates=_parse_sample_rates(os.getenv('AUDIT_SAMPLE_RATES', ''))
+    )
+    atexit.register(pipeline.close)
+    return pipeline
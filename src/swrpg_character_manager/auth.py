@@ -3,17 +3,36 @@
 import secrets
 import string
 import os
+import time
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from typing import Optional, Dict, List, Tuple, Any
 from functools import wraps
-from flask import request, jsonify, current_app, redirect, url_for
-from flask_bcrypt import Bcrypt
-from flask_jwt_extended import JWTManager, create_access_token, get_jwt_identity, verify_jwt_in_request
+from flask import request, jsonify, current_app, redirect, url_for, g
+from flask_jwt_extended import JWTManager, create_access_token, get_jwt, get_jwt_identity, verify_jwt_in_request
 from bson import ObjectId
 
+from .api_common import token_version_current
 from .database import db_manager, User, InviteCode
+from .password_hashing import PasswordHashingBusy, create_password_hasher_from_env
+
+password_hasher = create_password_hasher_from_env()
+
+
+@dataclass
+class AuthResult:
+    """Outcome of a password authentication, with per-step timings in milliseconds."""
+    success: bool
+    message: str
+    user: Optional[User]
+    lookup_ms: float = 0.0
+    verify_ms: float = 0.0
+    rehash_ms: float = 0.0
+    
+    @property
+    def total_ms(self) -> float:
+        return self.lookup_ms + self.verify_ms + self.rehash_ms
 
-bcrypt = Bcrypt()
 
 class AuthManager:
     """Authentication and authorization manager."""
@@ -26,17 +45,24 @@ class AuthManager:
     def init_app(self, app):
         """Initialize with Flask app."""
         self.app = app
-        bcrypt.init_app(app)
         self.jwt = JWTManager(app)
+        if os.getenv('PASSWORD_HASH_AUTOTUNE', 'true').lower() != 'false':
+            password_hasher.autotune()
     
     # Password management
     def hash_password(self, password: str) -> str:
-        """Hash a password using bcrypt."""
-        return bcrypt.generate_password_hash(password).decode('utf-8')
+        """Hash a password using bcrypt (on the bounded KDF pool).
+        
+        Raises PasswordHashingBusy when the pool is saturated.
+        """
+        return password_hasher.hash(password)
     
     def verify_password(self, password: str, password_hash: str) -> bool:
-        """Verify a password against its hash."""
-        return bcrypt.check_password_hash(password_hash, password)
+        """Verify a password against its hash (on the bounded KDF pool).
+        
+        Raises PasswordHashingBusy when the pool is saturated.
+        """
+        return password_hasher.verify(password, password_hash)
     
     def generate_secure_password(self, length: int = 20) -> str:
         """Generate a secure random password."""
@@ -131,19 +157,52 @@ class AuthManager:
         except Exception as e:
             return False, f"User creation failed: {str(e)}", None
     
-    def authenticate_user(self, email: str, password: str) -> Tuple[bool, str, Optional[User]]:
-        """Authenticate user with email and password."""
+    def authenticate(self, email: str, password: str) -> "AuthResult":
+        """Authenticate user with email and password in a single pass.
+        
+        One user lookup and at most one password verification; the result
+        carries the user together with how long each step took.
+        """
+        started = time.perf_counter()
         user = db_manager.get_user_by_email(email)
+        lookup_ms = (time.perf_counter() - started) * 1000
+        
         if not user:
-            return False, "Invalid email or password", None
+            return AuthResult(False, "Invalid email or password", None, lookup_ms)
         
         if not user.is_active:
-            return False, "Account is disabled", None
+            return AuthResult(False, "Account is disabled", None, lookup_ms)
+        
+        started = time.perf_counter()
+        is_valid = self.verify_password(password, user.password_hash)
+        verify_ms = (time.perf_counter() - started) * 1000
         
-        if not self.verify_password(password, user.password_hash):
-            return False, "Invalid email or password", None
+        if not is_valid:
+            return AuthResult(False, "Invalid email or password", None, lookup_ms, verify_ms)
         
-        return True, "Authentication successful", user
+        started = time.perf_counter()
+        self._upgrade_password_hash(user, password)
+        rehash_ms = (time.perf_counter() - started) * 1000
+        
+        return AuthResult(True, "Authentication successful", user, lookup_ms, verify_ms, rehash_ms)
+    
+    def authenticate_user(self, email: str, password: str) -> Tuple[bool, str, Optional[User]]:
+        """Authenticate user with email and password."""
+        result = self.authenticate(email, password)
+        return result.success, result.message, result.user
+    
+    def _upgrade_password_hash(self, user: User, password: str):
+        """Re-hash a verified password whose bcrypt cost is below the current one."""
+        if not password_hasher.needs_rehash(user.password_hash):
+            return
+        
+        try:
+            new_hash = self.hash_password(password)
+        except PasswordHashingBusy:
+            return  # Try again on a later login
+        
+        if db_manager.replace_password_hash(user._id, user.password_hash, new_hash):
+            user.password_hash = new_hash
     
     def create_access_token(self, user: User) -> str:
         """Create JWT access token for user."""
@@ -151,7 +210,9 @@ class AuthManager:
             "user_id": str(user._id),
             "username": user.username,
             "role": user.role,
-            "email": user.email
+            "email": user.email,
+            "is_active": user.is_active,
+            "ver": user.token_version
         }
         return create_access_token(
             identity=str(user._id),
@@ -181,25 +242,69 @@ class AuthManager:
         db_manager.create_campaign_invite(code, campaign_id, created_by, expires_in_days)
         return code
     
+    # Current user resolution
+    def _get_request_user_id(self) -> Optional[str]:
+        """Get the authenticated user ID from the JWT or, failing that, the session."""
+        try:
+            # Try JWT authentication first
+            verify_jwt_in_request()
+            return get_jwt_identity()
+        except Exception:
+            # Fall back to session-based authentication
+            from flask import session
+            session_user_id = session.get('user_id')
+            if session_user_id and session.get('authenticated'):
+                return session_user_id
+            return None
+    
+    def _get_stateless_claims(self, user_id: str) -> Optional[Dict[str, Any]]:
+        """Get role/active claims from the request JWT so authorization can skip the user read.
+        
+        Returns None when the request is session-authenticated or the token predates
+        these claims. Raises if the token's version no longer matches the user's.
+        """
+        try:
+            claims = get_jwt()
+        except RuntimeError:
+            return None
+        
+        if 'ver' not in claims or claims.get('user_id') != user_id:
+            return None
+        
+        current_version = db_manager.get_user_token_version(ObjectId(user_id))
+        if not token_version_current(claims, current_version):
+            raise Exception("Token has been revoked")
+        
+        return claims
+    
+    def load_user(self, user_id) -> Optional[User]:
+        """Load a user through the user cache, memoized on flask.g for the request."""
+        user_id = ObjectId(user_id)
+        user = g.get('_auth_user')
+        if user is not None and user._id == user_id:
+            return user
+        
+        user = db_manager.get_cached_user(user_id)
+        g._auth_user = user
+        return user
+    
+    def get_current_user(self) -> Optional[User]:
+        """Get the user authenticated for the current request."""
+        user = g.get('_auth_user')
+        if user is not None:
+            return user
+        
+        current_user_id = self._get_request_user_id()
+        if not current_user_id:
+            return None
+        return self.load_user(current_user_id)
+    
     # Authorization decorators
     def require_auth(self, f):
         """Decorator to require authentication."""
         @wraps(f)
         def decorated_function(*args, **kwargs):
-            current_user_id = None
-            
-            try:
-                # Try JWT authentication first
-                verify_jwt_in_request()
-                current_user_id = get_jwt_identity()
-            except Exception:
-                # Fall back to session-based authentication
-                from flask import session
-                session_user_id = session.get('user_id')
-                if session_user_id and session.get('authenticated'):
-                    current_user_id = session_user_id
-                else:
-                    current_user_id = None
+            current_user_id = self._get_request_user_id()
             
             # If no authentication method worked, deny access
             if not current_user_id:
@@ -209,9 +314,15 @@ class AuthManager:
                     return redirect(url_for('login_page'))
             
             try:
-                # Verify user exists and is active
-                user = db_manager.get_user_by_id(ObjectId(current_user_id))
-                if not user or not user.is_active:
+                # Verify user exists and is active, from token claims when possible
+                claims = self._get_stateless_claims(current_user_id)
+                if claims is not None:
+                    is_active = claims.get('is_active', False)
+                else:
+                    user = self.load_user(current_user_id)
+                    is_active = bool(user and user.is_active)
+                
+                if not is_active:
                     raise Exception("User not found or inactive")
                 
                 return f(*args, **kwargs)
@@ -229,20 +340,7 @@ class AuthManager:
         def decorator(f):
             @wraps(f)
             def decorated_function(*args, **kwargs):
-                current_user_id = None
-                
-                try:
-                    # Try JWT authentication first
-                    verify_jwt_in_request()
-                    current_user_id = get_jwt_identity()
-                except Exception:
-                    # Fall back to session-based authentication
-                    from flask import session
-                    session_user_id = session.get('user_id')
-                    if session_user_id and session.get('authenticated'):
-                        current_user_id = session_user_id
-                    else:
-                        current_user_id = None
+                current_user_id = self._get_request_user_id()
                 
                 # If no authentication method worked, deny access
                 if not current_user_id:
@@ -252,8 +350,14 @@ class AuthManager:
                         return redirect(url_for('login_page'))
                 
                 try:
-                    user = db_manager.get_user_by_id(ObjectId(current_user_id))
-                    if not user or user.role not in allowed_roles:
+                    claims = self._get_stateless_claims(current_user_id)
+                    if claims is not None:
+                        role = claims.get('role') if claims.get('is_active') else None
+                    else:
+                        user = self.load_user(current_user_id)
+                        role = user.role if user else None
+                    
+                    if role not in allowed_roles:
                         if request.path.startswith('/api/'):
                             return jsonify({"error": "Insufficient permissions"}), 403
                         else:
@@ -272,20 +376,7 @@ class AuthManager:
         """Decorator to require access to specific campaign."""
         @wraps(f)
         def decorated_function(*args, **kwargs):
-            current_user_id = None
-            
-            try:
-                # Try JWT authentication first
-                verify_jwt_in_request()
-                current_user_id = get_jwt_identity()
-            except Exception:
-                # Fall back to session-based authentication
-                from flask import session
-                session_user_id = session.get('user_id')
-                if session_user_id and session.get('authenticated'):
-                    current_user_id = session_user_id
-                else:
-                    current_user_id = None
+            current_user_id = self._get_request_user_id()
             
             # If no authentication method worked, deny access
             if not current_user_id:
@@ -2,16 +2,26 @@
 
 import json
 import os
+import threading
+from types import MappingProxyType
 from typing import Dict, List, Any
 from .models import Character, Career, Specialization, GameLine, Characteristic
+from .reference_data import load_compiled_reference_data
 
 
 class CharacterCreator:
     """Handles character creation process."""
     
-    def __init__(self):
-        self.careers = self._initialize_careers()
-        self.species_data = self._load_extracted_species_data()
+    def __init__(self, use_compiled: bool = True):
+        # Prefer the pre-normalized artifact built by reference_data.compile_reference_data
+        compiled = load_compiled_reference_data() if use_compiled else None
+        if compiled:
+            self.careers = compiled["careers"]
+            self.species_data = compiled["species"]
+            print(f"✅ Loaded {len(self.species_data)} species from compiled reference data")
+        else:
+            self.careers = self._initialize_careers()
+            self.species_data = self._load_extracted_species_data()
     
     def _initialize_careers(self) -> Dict[str, Career]:
         """Initialize available careers for each game line."""
@@ -878,4 +888,27 @@ class CharacterCreator:
     
     def get_species_info(self, species_name: str) -> Dict:
         """Get detailed information about a species."""
-        return self.species_data.get(species_name)
\ No newline at end of file
+        return self.species_data.get(species_name)
+
+
+# Process-wide creator shared by the web app, CLI and persistence layer
+_shared_creator = None
+_shared_creator_lock = threading.Lock()
+
+
+def get_character_creator() -> CharacterCreator:
+    """Get the process-wide CharacterCreator, loading reference data on first use.
+    
+    Its species and careers are read-only mappings shared by every consumer.
+    Calling this before gunicorn forks (--preload) lets all workers share the
+    loaded data copy-on-write instead of each loading its own copy.
+    """
+    global _shared_creator
+    if _shared_creator is None:
+        with _shared_creator_lock:
+            if _shared_creator is None:
+                creator = CharacterCreator()
+                creator.careers = MappingProxyType(creator.careers)
+                creator.species_data = MappingProxyType(creator.species_data)
+                _shared_creator = creator
+    return _shared_creator
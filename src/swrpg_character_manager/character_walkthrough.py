@@ -2,7 +2,7 @@
 
 from typing import Dict, List, Optional, Tuple, Any
 from dataclasses import dataclass
-from .character_creator import CharacterCreator
+from .character_creator import get_character_creator
 
 
 @dataclass
@@ -20,7 +20,7 @@ class CharacterCreationWalkthrough:
     def __init__(self):
         self.obligations_data = self._initialize_obligations()
         self.creation_rules = self._initialize_creation_rules()
-        self.character_creator = CharacterCreator()
+        self.character_creator = get_character_creator()
     
     def _initialize_obligations(self) -> Dict[str, Dict]:
         """Initialize obligation types with their details."""
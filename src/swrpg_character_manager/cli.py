@@ -3,7 +3,7 @@
 import argparse
 import sys
 from typing import Optional
-from .character_creator import CharacterCreator
+from .character_creator import get_character_creator
 from .advancement import AdvancementManager
 from .character_sheet import CharacterSheetDisplay
 from .persistence import CharacterDatabase
@@ -14,7 +14,7 @@ class CharacterManagerCLI:
     """Command-line interface for character management."""
     
     def __init__(self):
-        self.creator = CharacterCreator()
+        self.creator = get_character_creator()
         self.advancement = AdvancementManager()
         self.display = CharacterSheetDisplay()
         self.database = CharacterDatabase()
@@ -108,6 +108,20 @@ class CharacterManagerCLI:
         import_parser.add_argument('filename', help='Input filename')
         import_parser.set_defaults(func=self.import_character)
         
+        export_all_parser = subparsers.add_parser('export-all', help='Export every character to an NDJSON archive')
+        export_all_parser.add_argument('filename', help='Output filename (.ndjson, or .ndjson.gz for gzip)')
+        export_all_parser.add_argument('--gzip', action='store_true', default=None,
+                                       help='Gzip-compress the archive regardless of extension')
+        export_all_parser.set_defaults(func=self.export_all_characters)
+        
+        import_all_parser = subparsers.add_parser('import-all', help='Import characters from an NDJSON archive')
+        import_all_parser.add_argument('filename', help='Input filename (plain or gzip NDJSON)')
+        import_all_parser.add_argument('--batch-size', type=int, default=1000,
+                                       help='Characters written per storage batch')
+        import_all_parser.add_argument('--workers', type=int, default=None,
+                                       help='Validation worker processes (0 validates in-process)')
+        import_all_parser.set_defaults(func=self.import_all_characters)
+        
         stats_parser = subparsers.add_parser('stats', help='Show database statistics')
         stats_parser.set_defaults(func=self.show_stats)
         
@@ -287,6 +301,32 @@ class CharacterManagerCLI:
         else:
             print(f"Failed to import from {args.filename}")
     
+    def export_all_characters(self, args):
+        """Export every character to an NDJSON archive."""
+        try:
+            report = self.database.export_all(args.filename, compress=args.gzip)
+        except Exception as e:
+            print(f"Failed to export characters: {e}")
+            return
+        
+        print(f"Exported {report['exported']} characters to {args.filename} "
+              f"({report['bytes']} bytes, {report['seconds']}s, {report['per_second']}/s)")
+    
+    def import_all_characters(self, args):
+        """Import characters from an NDJSON archive."""
+        try:
+            report = self.database.import_all(args.filename, batch_size=args.batch_size, workers=args.workers)
+        except Exception as e:
+            print(f"Failed to import from {args.filename}: {e}")
+            return
+        
+        print(f"Imported {report['imported']} characters from {args.filename} "
+              f"({report['seconds']}s, {report['per_second']}/s)")
+        if report['skipped']:
+            print(f"Skipped {report['skipped']} invalid records:")
+            for error in report['errors']:
+                print(f"  line {error['line']} ({error['name'] or 'unnamed'}): {error['error']}")
+    
     def show_stats(self, args):
         """Show database statistics."""
         stats = self.database.get_database_stats()
@@ -1,18 +1,59 @@
 """MongoDB database models and operations for Star Wars RPG Character Manager."""
 
 from datetime import datetime, timezone, timedelta
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterator, List, Optional, Any
 from dataclasses import dataclass, asdict
+from itertools import islice
 from bson import ObjectId
-from pymongo import MongoClient
+from pymongo import MongoClient, ReturnDocument, UpdateOne
 from pymongo.database import Database
 from pymongo.collection import Collection
 import os
+import threading
 from dotenv import load_dotenv
 from .security import data_encryption, audit_log
+from .cache import TTLCache
+from .mongo_pool import PoolMetricsListener, mongo_client_options
+from .indexes import IndexManager, manifest_version
 
 load_dotenv()
 
+# Advancement limits enforced by the atomic update guards
+MAX_SKILL_RANK = 5
+MAX_CHARACTERISTIC_VALUE = 6
+
+# User fields whose change must invalidate previously issued access tokens
+TOKEN_VERSION_FIELDS = ('role', 'is_active', 'password_hash')
+
+# Character fields shown on the campaign dashboard; wounds and strain are
+# included once a sheet records them
+CAMPAIGN_DASHBOARD_CHARACTER_FIELDS = (
+    "_id", "user_id", "name", "player_name", "species", "career",
+    "total_xp", "available_xp", "spent_xp", "wounds", "strain",
+    "brawn", "agility", "intellect", "cunning", "willpower", "presence"
+)
+
+# User fields returned by admin listings (never the password hash)
+USER_LISTING_PROJECTION = {
+    "username": 1, "email": 1, "role": 1, "is_active": 1,
+    "created_at": 1, "updated_at": 1, "google_id": 1, "discord_id": 1
+}
+
+# Social login providers and the user field that links each one
+SOCIAL_PROVIDER_FIELDS = {"google": "google_id", "discord": "discord_id"}
+
+# Users fetched and decrypted per round trip when listing users
+USER_LISTING_BATCH_SIZE = 200
+
+# Document in stats_counters holding the materialized admin dashboard totals
+STATS_COUNTERS_ID = 'totals'
+
+# Lower bounds of the character total XP buckets on the admin dashboard
+XP_BUCKET_BOUNDARIES = [0, 150, 250, 400, 600, 900, 1200]
+
+# Time limit for the live active-sessions count on the admin dashboard
+ACTIVE_SESSIONS_COUNT_MAX_MS = 500
+
 @dataclass
 class User:
     """User model for authentication and authorization."""
@@ -26,6 +67,9 @@ class User:
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
     
+    # Bumped whenever role, active state or password change; revokes older JWTs
+    token_version: int = 0
+    
     # Social login
     google_id: Optional[str] = None
     discord_id: Optional[str] = None
@@ -132,6 +176,27 @@ class Character:
         if self.obligations is None:
             self.obligations = []
 
+@dataclass
+class CharacterSummary:
+    """Lightweight character record for list views (no skills, talents or equipment)."""
+    _id: Optional[ObjectId] = None
+    user_id: ObjectId = None
+    campaign_id: Optional[ObjectId] = None
+    name: str = ""
+    player_name: str = ""
+    species: str = ""
+    career: str = ""
+    background: str = ""
+    total_xp: int = 0
+    available_xp: int = 0
+    created_at: Optional[datetime] = None
+
+# Mongo projection matching the CharacterSummary fields
+CHARACTER_SUMMARY_PROJECTION = {
+    "user_id": 1, "campaign_id": 1, "name": 1, "player_name": 1, "species": 1,
+    "career": 1, "background": 1, "total_xp": 1, "available_xp": 1, "created_at": 1
+}
+
 @dataclass
 class InviteCode:
     """Invite code model for user registration."""
@@ -148,38 +213,86 @@ class InviteCode:
         if self.created_at is None:
             self.created_at = datetime.now(timezone.utc)
 
+class _ClientHandle:
+    """Client, database or collection attribute of MongoDBManager.
+    
+    A MongoClient must not be used across fork: the child shares the
+    parent's sockets. Reading a handle in a process other than the one that
+    connected (a gunicorn worker forked after connect) opens a fresh client
+    first, so each worker lazily gets its own pool.
+    """
+    
+    def __set_name__(self, owner, name):
+        self.name = name
+    
+    def __get__(self, manager, owner=None):
+        if manager is None:
+            return self
+        if manager._client_pid is not None and manager._client_pid != os.getpid():
+            manager._reopen_after_fork()
+        return manager._handles.get(self.name)
+    
+    def __set__(self, manager, value):
+        manager._handles[self.name] = value
+
+
 class MongoDBManager:
     """MongoDB database manager for Star Wars RPG Character Manager."""
     
+    COLLECTIONS = ('users', 'campaigns', 'characters', 'invite_codes', 'campaign_invites', 'sessions',
+                   'stats_counters')
+    
+    client: MongoClient = _ClientHandle()
+    db: Database = _ClientHandle()
+    users: Collection = _ClientHandle()
+    campaigns: Collection = _ClientHandle()
+    characters: Collection = _ClientHandle()
+    invite_codes: Collection = _ClientHandle()
+    campaign_invites: Collection = _ClientHandle()
+    sessions: Collection = _ClientHandle()
+    stats_counters: Collection = _ClientHandle()
+    
     def __init__(self):
-        self.client: MongoClient = None
-        self.db: Database = None
-        self.users: Collection = None
-        self.campaigns: Collection = None
-        self.characters: Collection = None
-        self.invite_codes: Collection = None
-        self.campaign_invites: Collection = None
-        self.sessions: Collection = None
+        self._handles: Dict[str, Any] = {}
+        self._client_pid: Optional[int] = None
+        self._client_lock = threading.Lock()
+        self.pool_listener: Optional[PoolMetricsListener] = None
+        if hasattr(os, 'register_at_fork'):
+            # The lock may have been copied while held by another thread
+            os.register_at_fork(after_in_child=self._reset_client_lock)
+        
+        # Per-process cache of authenticated users (see get_cached_user)
+        self.user_cache = TTLCache(
+            maxsize=int(os.getenv('USER_CACHE_SIZE', '1024')),
+            ttl=float(os.getenv('USER_CACHE_TTL', '60'))
+        )
+        # Per-process cache of token versions (see get_user_token_version)
+        self.token_version_cache = TTLCache(
+            maxsize=int(os.getenv('USER_CACHE_SIZE', '1024')),
+            ttl=float(os.getenv('TOKEN_VERSION_CACHE_TTL', '30'))
+        )
+        # Per-process cache of role/active/token version for the async routes
+        # (AsyncMongoDBManager.get_user_auth_state); kept here so user writes drop it
+        self.auth_state_cache = TTLCache(
+            maxsize=int(os.getenv('USER_CACHE_SIZE', '1024')),
+            ttl=float(os.getenv('TOKEN_VERSION_CACHE_TTL', '30'))
+        )
+        # Per-process cache of campaign dashboards (see get_campaign_dashboard)
+        self.dashboard_cache = TTLCache(
+            maxsize=int(os.getenv('CAMPAIGN_DASHBOARD_CACHE_SIZE', '256')),
+            ttl=float(os.getenv('CAMPAIGN_DASHBOARD_CACHE_TTL', '5'))
+        )
+        # Admin dashboard stats (see get_admin_stats)
+        self.stats_cache = TTLCache(maxsize=1, ttl=float(os.getenv('ADMIN_STATS_CACHE_TTL', '15')))
+        self.stats_reconcile_interval = float(os.getenv('STATS_RECONCILE_INTERVAL', '3600'))
         
     def connect(self):
         """Connect to MongoDB database."""
         try:
-            mongodb_uri = os.getenv('MONGO_URI', os.getenv('MONGODB_URI', 'mongodb://localhost:27017/'))
-            db_name = os.getenv('MONGODB_DB', 'swrpg_manager')
-            
-            self.client = MongoClient(mongodb_uri)
-            self.db = self.client[db_name]
+            self._open_client()
             
-            # Initialize collections
-            self.users = self.db.users
-            self.campaigns = self.db.campaigns
-            self.characters = self.db.characters
-            self.invite_codes = self.db.invite_codes
-            self.campaign_invites = self.db.campaign_invites
-            self.sessions = self.db.sessions
-            
-            # Create indexes
-            self._create_indexes()
+            # Create indexes when the manifest changed
+            self._ensure_indexes()
             
             # Test connection
             self.client.admin.command('ping')
@@ -189,47 +302,70 @@ class MongoDBManager:
             print(f"❌ Failed to connect to MongoDB: {e}")
             raise
     
-    def _create_indexes(self):
-        """Create database indexes for performance."""
-        # User indexes
-        try:
-            # Create unique email_hash index with sparse option to handle null values
-            self.users.create_index("email_hash", unique=True, sparse=True)
-        except Exception as e:
-            print(f"⚠️  Email hash index creation failed (may need migration): {e}")
-            # Continue without failing - migration script will fix this
-        
-        self.users.create_index("username", unique=True)
-        self.users.create_index("google_id", sparse=True)
-        self.users.create_index("discord_id", sparse=True)
+    def _ensure_indexes(self):
+        """Build indexes if the manifest changed since the last build (see indexes.py).
         
+        INDEX_BUILD_MODE: "background" (default) builds in a thread so startup
+        doesn't wait, "sync" builds before returning, "off" leaves it to
+        tools/admin_tools/manage_indexes.py. A database that has never
+        recorded a build is always built synchronously.
+        """
+        mode = os.getenv('INDEX_BUILD_MODE', 'background').lower()
+        if mode == 'off':
+            return
         
-        # Campaign indexes
-        self.campaigns.create_index("game_master_id")
-        self.campaigns.create_index("players")
+        index_manager = IndexManager(self.db)
+        stored_version = index_manager.stored_version()
+        if stored_version == manifest_version():
+            return
         
-        # Character indexes
-        self.characters.create_index("user_id")
-        self.characters.create_index("campaign_id")
-        self.characters.create_index([("user_id", 1), ("campaign_id", 1)])
+        if mode == 'sync' or stored_version is None:
+            index_manager.ensure_indexes()
+        else:
+            threading.Thread(target=index_manager.ensure_indexes, name="index-build", daemon=True).start()
+    
+    def _open_client(self):
+        """Create this process's client and bind the database and collections."""
+        mongodb_uri = os.getenv('MONGO_URI', os.getenv('MONGODB_URI', 'mongodb://localhost:27017/'))
+        db_name = os.getenv('MONGODB_DB', 'swrpg_manager')
         
-        # Invite code indexes
-        self.invite_codes.create_index("code", unique=True)
-        self.invite_codes.create_index("expires_at")
+        listener = PoolMetricsListener()
+        client = MongoClient(mongodb_uri, event_listeners=[listener], **mongo_client_options(mongodb_uri))
+        listener.max_pool_size = client.options.pool_options.max_pool_size
         
-        # Campaign invite indexes
-        self.campaign_invites.create_index("code", unique=True)
-        self.campaign_invites.create_index("campaign_id")
-        self.campaign_invites.create_index("expires_at")
+        self._client_pid = os.getpid()
+        self.pool_listener = listener
+        self.client = client
+        self.db = client[db_name]
         
-        # Session indexes
-        self.sessions.create_index("expires_at", expireAfterSeconds=0)
+        # Initialize collections
+        for name in self.COLLECTIONS:
+            setattr(self, name, self.db[name])
+    
+    def _reopen_after_fork(self):
+        with self._client_lock:
+            if self._client_pid != os.getpid():
+                # Drop (don't close) the parent's client; its sockets belong to the parent
+                print(f"🔄 Opening MongoDB connection pool for worker {os.getpid()}")
+                self._open_client()
+    
+    def _reset_client_lock(self):
+        self._client_lock = threading.Lock()
     
     def disconnect(self):
         """Disconnect from MongoDB."""
         if self.client:
             self.client.close()
     
+    def pool_metrics(self) -> Dict[str, Any]:
+        """Connection pool utilization for this process."""
+        if self._client_pid != os.getpid() or self.pool_listener is None:
+            return {'pid': os.getpid(), 'connected': False}
+        
+        metrics = self.pool_listener.snapshot()
+        metrics['connected'] = True
+        return metrics
+    
     # User operations
     def create_user(self, user: User) -> ObjectId:
         """Create a new user with encrypted email."""
@@ -246,6 +382,7 @@ class MongoDBManager:
             audit_log.log_encryption_event("email_encryption", True)
         
         result = self.users.insert_one(user_dict)
+        self._increment_stat('total_users', 1)
         audit_log.log_data_access("system", "create_user", "user_data", True)
         return result.inserted_id
     
@@ -277,6 +414,36 @@ class MongoDBManager:
             return User(**doc)
         return None
     
+    def get_cached_user(self, user_id: ObjectId) -> Optional[User]:
+        """Get user by ID through the per-process user cache.
+        
+        Cached users are shared between requests and must be treated as read-only.
+        """
+        user = self.user_cache.get(user_id)
+        if user is None:
+            user = self.get_user_by_id(user_id)
+            if user:
+                self.user_cache.set(user_id, user)
+        return user
+    
+    def get_user_token_version(self, user_id: ObjectId) -> Optional[int]:
+        """Get the current token version for an active user, or None if the user is gone or disabled.
+        
+        Only token_version_cache (TOKEN_VERSION_CACHE_TTL) is consulted, never
+        the longer-lived user cache, so a revocation in another worker is seen
+        within that TTL. The read is projected and skips email decryption.
+        """
+        version = self.token_version_cache.get(user_id)
+        if version is None:
+            doc = self.users.find_one({"_id": user_id}, {"token_version": 1, "is_active": 1})
+            if doc and doc.get('is_active', True):
+                version = doc.get('token_version', 0)
+            else:
+                version = -1
+            self.token_version_cache.set(user_id, version)
+        
+        return version if version >= 0 else None
+    
     def get_user_by_email(self, email: str) -> Optional[User]:
         """Get user by email using email hash for secure lookup."""
         # Use email hash for lookup instead of plaintext email
@@ -328,20 +495,105 @@ class MongoDBManager:
     def update_user(self, user_id: ObjectId, updates: Dict) -> bool:
         """Update user document."""
         updates['updated_at'] = datetime.now(timezone.utc)
-        result = self.users.update_one({"_id": user_id}, {"$set": updates})
+        update_doc = {"$set": updates}
+        if any(field in updates for field in TOKEN_VERSION_FIELDS):
+            update_doc["$inc"] = {"token_version": 1}
+        
+        result = self.users.update_one({"_id": user_id}, update_doc)
+        self._invalidate_user(user_id)
+        return result.modified_count > 0
+    
+    def replace_password_hash(self, user_id: ObjectId, old_hash: str, new_hash: str) -> bool:
+        """Swap in a re-hashed (stronger) hash of the same password.
+        
+        Unlike update_user this keeps token_version, so existing sessions stay
+        valid, and it only applies if the password was not changed meanwhile.
+        """
+        result = self.users.update_one(
+            {"_id": user_id, "password_hash": old_hash},
+            {"$set": {"password_hash": new_hash}}
+        )
+        self._invalidate_user(user_id)
         return result.modified_count > 0
     
     def delete_user(self, user_id: ObjectId) -> bool:
         """Delete user document."""
         result = self.users.delete_one({"_id": user_id})
+        self._invalidate_user(user_id)
+        if result.deleted_count:
+            self._increment_stat('total_users', -1)
         return result.deleted_count > 0
     
+    def iter_users(self, role: Optional[str] = None, is_active: Optional[bool] = None,
+                   provider: Optional[str] = None, created_after: Optional[datetime] = None,
+                   created_before: Optional[datetime] = None, after: Optional[ObjectId] = None,
+                   limit: Optional[int] = None) -> Iterator[User]:
+        """Iterate users for admin listings in _id order, resuming after a keyset cursor.
+        
+        Every filter combination is served by an index that returns rows in
+        _id order, so nothing is sorted in memory: role by (role, is_active, _id)
+        or (role, _id), is_active by (is_active, _id), provider=google/discord by
+        partial indexes over linked users and provider=local ("neither is set")
+        by (google_id, discord_id, _id). The created range is applied to _id,
+        whose timestamp is the account creation time, so it narrows the same
+        index scan as the cursor. Rows are fetched and their emails decrypted
+        in batches of USER_LISTING_BATCH_SIZE, so a full export streams.
+        """
+        query: Dict[str, Any] = {}
+        if role:
+            query["role"] = role
+        if is_active is not None:
+            query["is_active"] = is_active
+        if provider == "local":
+            for field in SOCIAL_PROVIDER_FIELDS.values():
+                query[field] = None
+        elif provider:
+            # Must match the partial index filter for the planner to use it
+            query[SOCIAL_PROVIDER_FIELDS[provider]] = {"$type": "string"}
+        
+        id_range = {}
+        if after:
+            id_range["$gt"] = after
+        if created_after:
+            id_range["$gte"] = ObjectId.from_datetime(created_after)
+        if created_before:
+            id_range["$lt"] = ObjectId.from_datetime(created_before)
+        if id_range:
+            query["_id"] = id_range
+        
+        cursor = self.users.find(query, USER_LISTING_PROJECTION).sort("_id", 1)
+        if limit:
+            cursor = cursor.limit(limit)
+        cursor = cursor.batch_size(USER_LISTING_BATCH_SIZE)
+        
+        logged = False
+        while True:
+            docs = list(islice(cursor, USER_LISTING_BATCH_SIZE))
+            if not docs:
+                break
+            if not logged:
+                audit_log.log_encryption_event("email_decryption", True)
+                audit_log.log_data_access("system", "list_users", "user_data", True)
+                logged = True
+            
+            emails = data_encryption.decrypt_many(doc.get("email", "") for doc in docs)
+            for doc, email in zip(docs, emails):
+                doc["email"] = email
+                yield User(**doc)
+    
+    def _invalidate_user(self, user_id: ObjectId):
+        """Drop a user from the per-process caches after a write."""
+        self.user_cache.invalidate(user_id)
+        self.token_version_cache.invalidate(user_id)
+        self.auth_state_cache.invalidate(user_id)
+    
     # Campaign operations
     def create_campaign(self, campaign: Campaign) -> ObjectId:
         """Create a new campaign."""
         campaign_dict = asdict(campaign)
         campaign_dict.pop('_id', None)
         result = self.campaigns.insert_one(campaign_dict)
+        self._increment_stat('total_campaigns', 1)
         return result.inserted_id
     
     def get_campaign_by_id(self, campaign_id: ObjectId) -> Optional[Campaign]:
@@ -360,6 +612,25 @@ class MongoDBManager:
         })
         return [Campaign(**doc) for doc in docs]
     
+    def iter_user_campaigns(self, user_id: ObjectId, after: Optional[ObjectId] = None,
+                            limit: Optional[int] = None) -> Iterator[Campaign]:
+        """Iterate a user's campaigns in _id order, resuming after a keyset cursor."""
+        query = {
+            "$or": [
+                {"game_master_id": user_id},
+                {"players": user_id}
+            ],
+            "is_active": True
+        }
+        if after:
+            query["_id"] = {"$gt": after}
+        
+        cursor = self.campaigns.find(query).sort("_id", 1)
+        if limit:
+            cursor = cursor.limit(limit)
+        for doc in cursor:
+            yield Campaign(**doc)
+    
     def get_campaigns_as_gm(self, user_id: ObjectId) -> List[Campaign]:
         """Get campaigns where user is game master."""
         docs = self.campaigns.find({"game_master_id": user_id, "is_active": True})
@@ -371,14 +642,66 @@ class MongoDBManager:
             {"_id": campaign_id},
             {"$addToSet": {"players": user_id}, "$set": {"updated_at": datetime.now(timezone.utc)}}
         )
+        self.dashboard_cache.invalidate(campaign_id)
         return result.modified_count > 0
     
+    def get_campaign_dashboard(self, campaign_id: ObjectId) -> Optional[Dict]:
+        """Get a campaign with its members and character summaries in one aggregation.
+        
+        Members (game master and players) are looked up by _id and characters
+        by the campaign_id index, then trimmed to the dashboard fields on the
+        server. Results are cached per process for a few seconds. Writes made
+        in this process to the campaign or any of its characters (including
+        those made through async_db_manager) drop the entry; writes made by
+        other processes show up once it expires (CAMPAIGN_DASHBOARD_CACHE_TTL).
+        """
+        cached = self.dashboard_cache.get(campaign_id)
+        if cached is not None:
+            return cached
+        
+        pipeline = [
+            {"$match": {"_id": campaign_id, "is_active": True}},
+            {"$project": {
+                "name": 1, "description": 1, "game_master_id": 1, "players": 1,
+                "settings": 1, "created_at": 1, "updated_at": 1,
+                "member_ids": {"$concatArrays": [["$game_master_id"], {"$ifNull": ["$players", []]}]}
+            }},
+            {"$lookup": {"from": "users", "localField": "member_ids", "foreignField": "_id", "as": "members"}},
+            {"$lookup": {"from": "characters", "localField": "_id", "foreignField": "campaign_id", "as": "characters"}},
+            {"$project": {
+                "name": 1, "description": 1, "game_master_id": 1, "players": 1,
+                "settings": 1, "created_at": 1, "updated_at": 1,
+                "members": {"$map": {
+                    "input": "$members",
+                    "as": "member",
+                    "in": {"_id": "$$member._id", "username": "$$member.username", "role": "$$member.role"}
+                }},
+                "characters": {"$map": {
+                    "input": {"$filter": {
+                        "input": "$characters",
+                        "as": "character",
+                        "cond": {"$ne": ["$$character.is_active", False]}
+                    }},
+                    "as": "character",
+                    "in": {field: f"$$character.{field}" for field in CAMPAIGN_DASHBOARD_CHARACTER_FIELDS}
+                }}
+            }}
+        ]
+        dashboard = next(self.campaigns.aggregate(pipeline), None)
+        
+        if dashboard is not None:
+            self.dashboard_cache.set(campaign_id, dashboard)
+        return dashboard
+    
     # Character operations
     def create_character(self, character: Character) -> ObjectId:
         """Create a new character."""
         character_dict = asdict(character)
         character_dict.pop('_id', None)
         result = self.characters.insert_one(character_dict)
+        self._increment_stat('total_characters', 1)
+        if character_dict.get('campaign_id'):
+            self.dashboard_cache.invalidate(character_dict['campaign_id'])
         return result.inserted_id
     
     def get_character_by_id(self, character_id: ObjectId) -> Optional[Character]:
@@ -400,26 +723,199 @@ class MongoDBManager:
         docs = self.characters.find({"campaign_id": campaign_id, "is_active": True})
         return [Character(**doc) for doc in docs]
     
+    def get_user_character_summaries(self, user_id: ObjectId, campaign_id: Optional[ObjectId] = None) -> List[CharacterSummary]:
+        """Get summary records for a user's characters, optionally filtered by campaign."""
+        query = {"user_id": user_id, "is_active": True}
+        if campaign_id:
+            query["campaign_id"] = campaign_id
+        
+        docs = self.characters.find(query, CHARACTER_SUMMARY_PROJECTION)
+        return [CharacterSummary(**doc) for doc in docs]
+    
+    def iter_user_character_summaries(self, user_id: ObjectId, after: Optional[ObjectId] = None,
+                                      limit: Optional[int] = None) -> Iterator[CharacterSummary]:
+        """Iterate a user's character summaries in _id order, resuming after a keyset cursor.
+        
+        Documents are decoded as the pymongo cursor yields them, so callers can
+        stream arbitrarily large listings without materializing them.
+        """
+        query = {"user_id": user_id, "is_active": True}
+        if after:
+            query["_id"] = {"$gt": after}
+        
+        cursor = self.characters.find(query, CHARACTER_SUMMARY_PROJECTION).sort("_id", 1)
+        if limit:
+            cursor = cursor.limit(limit)
+        for doc in cursor:
+            yield CharacterSummary(**doc)
+    
+    def get_campaign_character_summaries(self, campaign_id: ObjectId) -> List[CharacterSummary]:
+        """Get summary records for all characters in a campaign."""
+        docs = self.characters.find({"campaign_id": campaign_id, "is_active": True}, CHARACTER_SUMMARY_PROJECTION)
+        return [CharacterSummary(**doc) for doc in docs]
+    
     def update_character(self, character_id: ObjectId, updates: Dict) -> bool:
         """Update character document."""
         updates['updated_at'] = datetime.now(timezone.utc)
-        result = self.characters.update_one({"_id": character_id}, {"$set": updates})
-        return result.modified_count > 0
+        previous = self.characters.find_one_and_update(
+            {"_id": character_id}, {"$set": updates}, projection={"campaign_id": 1}
+        )
+        if previous is None:
+            return False
+        self._invalidate_character_dashboard(previous)
+        if updates.get("campaign_id"):
+            self.dashboard_cache.invalidate(updates["campaign_id"])
+        return True
+    
+    def deactivate_character(self, character_id: ObjectId) -> bool:
+        """Soft-delete a character (characters are never removed outright)."""
+        previous = self.characters.find_one_and_update(
+            {"_id": character_id, "is_active": True},
+            {"$set": {"is_active": False, "updated_at": datetime.now(timezone.utc)}},
+            projection={"campaign_id": 1}
+        )
+        if previous is None:
+            return False
+        self._increment_stat('total_characters', -1)
+        self._invalidate_character_dashboard(previous)
+        return True
+    
+    def _invalidate_character_dashboard(self, doc: Optional[Dict]) -> Optional[Dict]:
+        """Drop the cached dashboard of a written character's campaign.
+        
+        doc is the document a character write returned, projected with
+        campaign_id; it is returned without that field.
+        """
+        if doc is not None:
+            campaign_id = doc.pop("campaign_id", None)
+            if campaign_id:
+                self.dashboard_cache.invalidate(campaign_id)
+        return doc
+    
+    # Atomic advancement operations
+    #
+    # Each of these is a single guarded find_one_and_update: the filter carries the
+    # ownership and XP/rank conditions, so concurrent awards and spends cannot
+    # interleave, and only the touched fields are written. They return the
+    # updated fields, or None when no document matched the guard.
+    def award_character_xp(self, character_id: ObjectId, amount: int,
+                           user_id: Optional[ObjectId] = None) -> Optional[Dict]:
+        """Atomically add XP to a character, optionally only if owned by user_id."""
+        query = {"_id": character_id}
+        if user_id:
+            query["user_id"] = user_id
+        
+        return self._invalidate_character_dashboard(self.characters.find_one_and_update(
+            query,
+            {
+                "$inc": {"total_xp": amount, "available_xp": amount},
+                "$set": {"updated_at": datetime.now(timezone.utc)}
+            },
+            projection={"total_xp": 1, "available_xp": 1, "campaign_id": 1},
+            return_document=ReturnDocument.AFTER
+        ))
+    
+    def award_campaign_xp(self, campaign_id: ObjectId, awards: Dict[ObjectId, int]) -> Dict[ObjectId, Dict]:
+        """Award XP to many campaign characters with one unordered bulk write.
+        
+        Returns the updated XP totals keyed by character ID; characters that are
+        not active members of the campaign are absent from the result.
+        """
+        if not awards:
+            return {}
+        
+        now = datetime.now(timezone.utc)
+        operations = [
+            UpdateOne(
+                {"_id": character_id, "campaign_id": campaign_id, "is_active": True},
+                {"$inc": {"total_xp": amount, "available_xp": amount}, "$set": {"updated_at": now}}
+            )
+            for character_id, amount in awards.items()
+        ]
+        self.characters.bulk_write(operations, ordered=False)
+        self.dashboard_cache.invalidate(campaign_id)
+        
+        docs = self.characters.find(
+            {"_id": {"$in": list(awards)}, "campaign_id": campaign_id, "is_active": True},
+            {"total_xp": 1, "available_xp": 1}
+        )
+        return {doc["_id"]: doc for doc in docs}
+    
+    def advance_character_skill(self, character_id: ObjectId, skill_name: str,
+                                user_id: ObjectId) -> Optional[Dict]:
+        """Atomically raise a skill one rank, paying 5 XP x the new rank."""
+        if not skill_name or '.' in skill_name or skill_name.startswith('$'):
+            raise ValueError(f"Invalid skill name: {skill_name}")
+        
+        rank_path = f"skills.{skill_name}.rank"
+        rank = {"$ifNull": [f"${rank_path}", 0]}
+        new_rank = {"$add": [rank, 1]}
+        cost = {"$multiply": [5, new_rank]}
+        
+        return self._spend_xp_atomically(
+            {"_id": character_id, "user_id": user_id, f"skills.{skill_name}": {"$exists": True}},
+            guard={"$lt": [rank, MAX_SKILL_RANK]},
+            cost=cost,
+            changes={rank_path: new_rank},
+            projection={rank_path: 1}
+        )
+    
+    def advance_character_characteristic(self, character_id: ObjectId, characteristic: str,
+                                         user_id: ObjectId) -> Optional[Dict]:
+        """Atomically raise a characteristic by one, paying 10 XP x the new value (10 XP below 3)."""
+        value = f"${characteristic}"
+        new_value = {"$add": [value, 1]}
+        cost = {"$cond": [{"$gte": [new_value, 3]}, {"$multiply": [10, new_value]}, 10]}
+        
+        return self._spend_xp_atomically(
+            {"_id": character_id, "user_id": user_id},
+            guard={"$lt": [value, MAX_CHARACTERISTIC_VALUE]},
+            cost=cost,
+            changes={characteristic: new_value},
+            projection={characteristic: 1}
+        )
+    
+    def _spend_xp_atomically(self, query: Dict, guard: Dict, cost: Dict, changes: Dict,
+                             projection: Dict) -> Optional[Dict]:
+        """Apply changes and deduct cost in one pipeline update, if guard holds and XP suffices."""
+        available = {"$ifNull": ["$available_xp", 0]}
+        query = dict(query)
+        query["$expr"] = {"$and": [guard, {"$gte": [available, cost]}]}
+        
+        # All expressions in a single $set stage see the pre-update document,
+        # so cost is computed from the old rank/value.
+        update = [{"$set": {
+            "available_xp": {"$subtract": [available, cost]},
+            "spent_xp": {"$add": [{"$ifNull": ["$spent_xp", 0]}, cost]},
+            **changes,
+            "updated_at": datetime.now(timezone.utc)
+        }}]
+        
+        return self._invalidate_character_dashboard(self.characters.find_one_and_update(
+            query,
+            update,
+            projection={**projection, "available_xp": 1, "spent_xp": 1, "campaign_id": 1},
+            return_document=ReturnDocument.AFTER
+        ))
     
     def assign_character_to_campaign(self, character_id: ObjectId, campaign_id: ObjectId) -> bool:
         """Assign character to a campaign."""
-        result = self.characters.update_one(
+        previous = self.characters.find_one_and_update(
             {"_id": character_id},
-            {"$set": {"campaign_id": campaign_id, "updated_at": datetime.now(timezone.utc)}}
+            {"$set": {"campaign_id": campaign_id, "updated_at": datetime.now(timezone.utc)}},
+            projection={"campaign_id": 1}
         )
+        # Drops the dashboard of the campaign the character left, if any
+        self._invalidate_character_dashboard(previous)
         
         # Also add character to campaign's character list
         self.campaigns.update_one(
             {"_id": campaign_id},
             {"$addToSet": {"characters": character_id}, "$set": {"updated_at": datetime.now(timezone.utc)}}
         )
+        self.dashboard_cache.invalidate(campaign_id)
         
-        return result.modified_count > 0
+        return previous is not None
     
     # Invite code operations
     def create_invite_code(self, invite: InviteCode) -> ObjectId:
@@ -504,5 +1000,133 @@ class MongoDBManager:
             print(f"Error joining campaign by invite: {e}")
             return False, "An error occurred while joining the campaign"
 
+    # Session operations
+    def record_session(self, user_id: ObjectId, expires_at: datetime) -> ObjectId:
+        """Record a login session; the TTL index removes it once expired."""
+        result = self.sessions.insert_one({
+            "user_id": user_id,
+            "created_at": datetime.now(timezone.utc),
+            "expires_at": expires_at
+        })
+        return result.inserted_id
+    
+    def end_session(self, session_id: ObjectId) -> bool:
+        """Remove a session record at logout."""
+        return self.sessions.delete_one({"_id": session_id}).deleted_count > 0
+    
+    # Admin statistics
+    #
+    # Totals live in one stats_counters document, $inc'ed by the create and
+    # delete operations above, so the dashboard never scans the collections.
+    # reconcile_stats recomputes them (plus the XP distribution, which can't
+    # be maintained incrementally) with aggregations, correcting drift from
+    # writes that bypass the manager such as migrations. Active sessions
+    # expire by time rather than by writes, so they are counted live instead.
+    def _increment_stat(self, field: str, amount: int):
+        try:
+            self.stats_counters.update_one({"_id": STATS_COUNTERS_ID}, {"$inc": {field: amount}}, upsert=True)
+        except Exception as e:
+            # Counters are advisory; the next reconciliation repairs them
+            print(f"⚠️  Failed to update {field} counter: {e}")
+    
+    def _count_active_sessions(self, now: datetime) -> Optional[int]:
+        """Unexpired sessions, counted on the expires_at index; None if the count fails."""
+        try:
+            return self.sessions.count_documents({"expires_at": {"$gt": now}},
+                                                 maxTimeMS=ACTIVE_SESSIONS_COUNT_MAX_MS)
+        except Exception as e:
+            print(f"⚠️  Failed to count active sessions: {e}")
+            return None
+    
+    def reconcile_stats(self) -> Dict[str, Any]:
+        """Recompute the dashboard stats from the collections and store them."""
+        now = datetime.now(timezone.utc)
+        
+        character_stats = next(self.characters.aggregate([
+            {"$match": {"is_active": True}},
+            {"$facet": {
+                "total": [{"$count": "count"}],
+                "xp": [{"$bucket": {
+                    "groupBy": "$total_xp",
+                    "boundaries": XP_BUCKET_BOUNDARIES + [float('inf')],
+                    "default": "other",
+                    "output": {"count": {"$sum": 1}}
+                }}]
+            }}
+        ]), {"total": [], "xp": []})
+        
+        bucket_counts = {bucket["_id"]: bucket["count"] for bucket in character_stats["xp"]}
+        xp_distribution = [
+            {"min_xp": low, "max_xp": high, "count": bucket_counts.get(low, 0)}
+            for low, high in zip(XP_BUCKET_BOUNDARIES, XP_BUCKET_BOUNDARIES[1:] + [None])
+        ]
+        
+        stats = {
+            "total_users": self.users.count_documents({}),
+            "total_characters": character_stats["total"][0]["count"] if character_stats["total"] else 0,
+            "total_campaigns": self.campaigns.count_documents({"is_active": True}),
+            "active_sessions": self.sessions.count_documents({"expires_at": {"$gt": now}}),
+            "xp_distribution": xp_distribution,
+            "reconciled_at": now
+        }
+        self.stats_counters.update_one({"_id": STATS_COUNTERS_ID}, {"$set": stats}, upsert=True)
+        return stats
+    
+    def get_admin_stats(self, force_reconcile: bool = False) -> Dict[str, Any]:
+        """Dashboard stats from the materialized counters, reconciled when stale.
+        
+        Results are cached per process for ADMIN_STATS_CACHE_TTL seconds; a
+        reconciliation runs when the last one is older than
+        STATS_RECONCILE_INTERVAL seconds (claimed by one process at a time).
+        active_sessions is counted live on every cache miss, falling back to
+        the last reconciled count if that query fails.
+        """
+        if not force_reconcile:
+            cached = self.stats_cache.get(STATS_COUNTERS_ID)
+            if cached is not None:
+                return cached
+        
+        now = datetime.now(timezone.utc)
+        stale_before = now - timedelta(seconds=self.stats_reconcile_interval)
+        doc = self.stats_counters.find_one({"_id": STATS_COUNTERS_ID}) or {}
+        reconciled_at = doc.get("reconciled_at")
+        if reconciled_at is not None and reconciled_at.tzinfo is None:
+            reconciled_at = reconciled_at.replace(tzinfo=timezone.utc)
+        
+        if force_reconcile or reconciled_at is None:
+            doc = self.reconcile_stats()
+        elif reconciled_at < stale_before:
+            # Claim the reconciliation so concurrent workers don't all run it
+            claimed = self.stats_counters.update_one(
+                {"_id": STATS_COUNTERS_ID, "reconciled_at": doc["reconciled_at"]},
+                {"$set": {"reconciled_at": now}}
+            )
+            if claimed.modified_count:
+                try:
+                    doc = self.reconcile_stats()
+                except Exception as e:
+                    # Release the claim so the next request retries instead of
+                    # waiting out another interval; serve the stale counters
+                    print(f"⚠️  Stats reconciliation failed: {e}")
+                    self.stats_counters.update_one(
+                        {"_id": STATS_COUNTERS_ID, "reconciled_at": now},
+                        {"$set": {"reconciled_at": doc["reconciled_at"]}}
+                    )
+        
+        active_sessions = self._count_active_sessions(now)
+        if active_sessions is None:
+            active_sessions = doc.get("active_sessions", 0)
+        
+        stats = {
+            "total_users": max(doc.get("total_users", 0), 0),
+            "total_characters": max(doc.get("total_characters", 0), 0),
+            "total_campaigns": max(doc.get("total_campaigns", 0), 0),
+            "active_sessions": active_sessions,
+            "xp_distribution": doc.get("xp_distribution", []),
+            "reconciled_at": doc["reconciled_at"].isoformat() if doc.get("reconciled_at") else None
+        }
+        self.stats_cache.set(STATS_COUNTERS_ID, stats)
+        return stats
+
 # Global database manager instance
 db_manager = MongoDBManager()
\ No newline at end of file
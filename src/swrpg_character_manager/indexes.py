@@ -0,0 +1,199 @@
+"""Versioned index manifest for the MongoDB collections.
+
+INDEX_MANIFEST is the single source of truth for the indexes the app
+needs. Its hash is stored in the schema_meta collection once a build
+succeeds, so connecting processes (every gunicorn worker, CLI tool and
+admin script) only pay one read to learn the indexes are current. When
+the manifest changes, the first process to take the build lease creates
+the new indexes and drops retired ones; the others carry on.
+
+Use tools/admin_tools/manage_indexes.py to check status, force a build
+or report missing and unused indexes from $indexStats.
+"""
+
+import hashlib
+import os
+import socket
+from datetime import datetime, timezone, timedelta
+from typing import Dict, List, Optional
+
+from bson import json_util
+from pymongo import ASCENDING, IndexModel
+from pymongo.errors import DuplicateKeyError, OperationFailure
+
+META_COLLECTION = 'schema_meta'
+VERSION_ID = 'indexes'
+BUILD_LEASE_ID = 'indexes_build_lease'
+
+INDEX_MANIFEST: Dict[str, List[IndexModel]] = {
+    'users': [
+        # Sparse so users without an email hash (pre-migration) don't collide
+        IndexModel('email_hash', unique=True, sparse=True),
+        IndexModel('username', unique=True),
+        IndexModel('google_id', sparse=True),
+        IndexModel('discord_id', sparse=True),
+        # Admin user listing filters, keyset-paginated on _id
+        IndexModel([('role', ASCENDING), ('is_active', ASCENDING), ('_id', ASCENDING)]),
+        IndexModel([('role', ASCENDING), ('_id', ASCENDING)]),
+        IndexModel([('is_active', ASCENDING), ('_id', ASCENDING)]),
+        # provider=google/discord: only linked users, already in _id order
+        IndexModel([('_id', ASCENDING), ('google_id', ASCENDING)], name='google_users_by_id',
+                   partialFilterExpression={'google_id': {'$type': 'string'}}),
+        IndexModel([('_id', ASCENDING), ('discord_id', ASCENDING)], name='discord_users_by_id',
+                   partialFilterExpression={'discord_id': {'$type': 'string'}}),
+        # provider=local: equality on null for both ids, then _id order
+        IndexModel([('google_id', ASCENDING), ('discord_id', ASCENDING), ('_id', ASCENDING)]),
+    ],
+    'campaigns': [
+        # Prefixes also serve lookups on game_master_id / players alone
+        IndexModel([('game_master_id', ASCENDING), ('is_active', ASCENDING), ('_id', ASCENDING)]),
+        IndexModel([('players', ASCENDING), ('is_active', ASCENDING), ('_id', ASCENDING)]),
+    ],
+    'characters': [
+        # Prefixes also serve lookups on user_id / campaign_id alone
+        IndexModel([('user_id', ASCENDING), ('campaign_id', ASCENDING)]),
+        IndexModel([('user_id', ASCENDING), ('is_active', ASCENDING), ('_id', ASCENDING)]),
+        IndexModel([('campaign_id', ASCENDING), ('is_active', ASCENDING)]),
+    ],
+    'invite_codes': [
+        IndexModel('code', unique=True),
+        IndexModel('expires_at'),
+    ],
+    'campaign_invites': [
+        IndexModel('code', unique=True),
+        IndexModel('campaign_id'),
+        IndexModel('expires_at'),
+    ],
+    'sessions': [
+        IndexModel('expires_at', expireAfterSeconds=0),
+    ],
+}
+
+# Indexes earlier releases created that the manifest now covers with a compound prefix
+RETIRED_INDEXES: Dict[str, List[str]] = {
+    'campaigns': ['game_master_id_1', 'players_1'],
+    'characters': ['user_id_1', 'campaign_id_1'],
+}
+
+
+def manifest_version() -> str:
+    """Hash of the manifest; changes whenever an index is added, removed or altered."""
+    manifest = {
+        'indexes': {name: [model.document for model in models] for name, models in INDEX_MANIFEST.items()},
+        'retired': RETIRED_INDEXES
+    }
+    return hashlib.sha256(json_util.dumps(manifest).encode('utf-8')).hexdigest()[:16]
+
+
+class IndexManager:
+    """Compares, builds and reports on the indexes in INDEX_MANIFEST."""
+
+    def __init__(self, db, lease_seconds: int = 600):
+        self.db = db
+        self.meta = db[META_COLLECTION]
+        self.lease_seconds = lease_seconds
+        self.owner = f"{socket.gethostname()}:{os.getpid()}"
+
+    def stored_version(self) -> Optional[str]:
+        """Manifest version of the last successful build, or None."""
+        doc = self.meta.find_one({'_id': VERSION_ID}, {'version': 1})
+        return doc.get('version') if doc else None
+
+    def is_current(self) -> bool:
+        return self.stored_version() == manifest_version()
+
+    def _acquire_lease(self) -> bool:
+        now = datetime.now(timezone.utc)
+        try:
+            # Matches only an expired lease; otherwise the upsert collides on _id
+            self.meta.update_one(
+                {'_id': BUILD_LEASE_ID, 'expires_at': {'$lt': now}},
+                {'$set': {'owner': self.owner, 'expires_at': now + timedelta(seconds=self.lease_seconds)}},
+                upsert=True
+            )
+            return True
+        except DuplicateKeyError:
+            return False
+
+    def _release_lease(self):
+        self.meta.delete_one({'_id': BUILD_LEASE_ID, 'owner': self.owner})
+
+    def ensure_indexes(self, force: bool = False) -> str:
+        """Build the manifest if it changed since the last build.
+
+        Returns 'current', 'built', 'busy' (another process holds the build
+        lease) or 'failed' (some index could not be built; retried next time).
+        """
+        version = manifest_version()
+        if not force and self.stored_version() == version:
+            return 'current'
+        if not self._acquire_lease():
+            return 'busy'
+
+        try:
+            print(f"🔧 Building MongoDB indexes (manifest {version})...")
+            failures = 0
+            for name, models in INDEX_MANIFEST.items():
+                collection = self.db[name]
+                for model in models:
+                    try:
+                        collection.create_indexes([model])
+                    except Exception as e:
+                        failures += 1
+                        print(f"⚠️  Index {name}.{model.document['name']} creation failed (may need migration): {e}")
+
+            if failures:
+                # Keep the retired indexes: queries may still depend on them
+                # until their replacements exist
+                return 'failed'
+
+            for name, index_names in RETIRED_INDEXES.items():
+                for index_name in index_names:
+                    try:
+                        self.db[name].drop_index(index_name)
+                        print(f"🗑️  Dropped retired index {name}.{index_name}")
+                    except OperationFailure:
+                        pass  # Never created or already dropped
+
+            self.meta.update_one(
+                {'_id': VERSION_ID},
+                {'$set': {
+                    'version': version,
+                    'built_at': datetime.now(timezone.utc),
+                    'built_by': self.owner,
+                    'indexes': {name: [model.document['name'] for model in models]
+                                for name, models in INDEX_MANIFEST.items()}
+                }},
+                upsert=True
+            )
+            print(f"✅ MongoDB indexes up to date (manifest {version})")
+            return 'built'
+        finally:
+            self._release_lease()
+
+    def report(self) -> Dict[str, Dict]:
+        """Missing, unexpected and unused indexes per collection.
+
+        Usage comes from $indexStats, whose counters start at the last server
+        restart (see 'since'); stats are None where the server doesn't support it.
+        """
+        report = {}
+        for name, models in INDEX_MANIFEST.items():
+            collection = self.db[name]
+            expected = [model.document['name'] for model in models]
+            existing = [index['name'] for index in collection.list_indexes()]
+
+            try:
+                stats = {entry['name']: entry['accesses'] for entry in collection.aggregate([{'$indexStats': {}}])}
+            except OperationFailure:
+                stats = None
+
+            report[name] = {
+                'missing': [index for index in expected if index not in existing],
+                'unexpected': [index for index in existing if index not in expected and index != '_id_'],
+                'unused': sorted(index for index, accesses in (stats or {}).items()
+                                 if accesses['ops'] == 0 and index != '_id_'),
+                'usage': {index: {'ops': accesses['ops'], 'since': accesses['since']}
+                          for index, accesses in stats.items()} if stats is not None else None
+            }
+        return report
@@ -0,0 +1,236 @@
+"""Batched, resumable bulk migration engine for MongoDB collections.
+
+A migration reads documents in _id order one batch at a time, transforms
+them in a process pool and writes the results back with unordered
+bulk_write. Progress is checkpointed to a file after every batch, so an
+interrupted run resumes after the last written _id instead of starting over.
+Dry runs neither read nor write the checkpoint.
+
+Transforms must be module-level functions (they are pickled to worker
+processes). For in-place migrations a transform receives a document and
+returns an update document (e.g. {"$set": {...}}) or None to leave it
+unchanged. For imports it receives a source record and returns a
+(filter, update) pair that is applied as an upsert, or None to skip it.
+
+Writes go straight to the collection and bypass MongoDBManager's admin
+stats counters; a real run that adds or removes counted documents must be
+followed by db_manager.reconcile_stats().
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from itertools import islice
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from bson import json_util
+from pymongo import UpdateOne
+
+from .storage import atomic_write_bytes
+
+
+def _apply_transform(task: Tuple[Callable, Any]) -> Tuple[Any, Optional[str]]:
+    """Run a transform, capturing its error instead of failing the whole batch."""
+    transform, item = task
+    try:
+        return transform(item), None
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}"
+
+
+@dataclass
+class MigrationStats:
+    """Counters for one migration run."""
+    name: str
+    read: int = 0
+    matched: int = 0
+    modified: int = 0
+    upserted: int = 0
+    skipped: int = 0
+    failed: int = 0
+    batches: int = 0
+    errors: List[Dict[str, str]] = field(default_factory=list)
+    started_at: float = field(default_factory=time.perf_counter)
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started_at
+
+    @property
+    def per_second(self) -> float:
+        elapsed = self.elapsed
+        return self.read / elapsed if elapsed > 0 else float(self.read)
+
+    def as_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data.pop('started_at')
+        data['seconds'] = round(self.elapsed, 3)
+        data['per_second'] = round(self.per_second)
+        return data
+
+
+class MigrationCheckpoint:
+    """Position of a migration stored in a small JSON file (Extended JSON, so ObjectIds survive)."""
+
+    def __init__(self, path: Optional[str]):
+        self.path = Path(path) if path else None
+
+    def load(self) -> Dict[str, Any]:
+        if not self.path or not self.path.exists():
+            return {}
+        return json_util.loads(self.path.read_text())
+
+    def save(self, state: Dict[str, Any]):
+        if self.path:
+            atomic_write_bytes(self.path, json_util.dumps(state).encode('utf-8'))
+
+    def clear(self):
+        if self.path and self.path.exists():
+            self.path.unlink()
+
+
+class MigrationRunner:
+    """Runs transforms over a collection (or a stream of records) in parallel batches."""
+
+    def __init__(self, collection, name: str = "migration", batch_size: int = 1000,
+                 workers: Optional[int] = None, dry_run: bool = False,
+                 checkpoint_path: Optional[str] = None, progress_interval: float = 5.0,
+                 max_errors: int = 50):
+        self.collection = collection
+        self.name = name
+        self.batch_size = batch_size
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        self.dry_run = dry_run
+        # Dry runs write nothing, so a real run must never resume from their position
+        self.checkpoint = MigrationCheckpoint(None if dry_run else checkpoint_path)
+        self.progress_interval = progress_interval
+        self.max_errors = max_errors
+        self._last_progress = 0.0
+
+    def migrate_collection(self, transform: Callable[[Dict], Optional[Dict]],
+                           query: Optional[Dict] = None, projection: Optional[Dict] = None) -> MigrationStats:
+        """Apply transform to every document matching query, resuming from the checkpoint."""
+        stats = MigrationStats(name=self.name)
+        state = self.checkpoint.load()
+        last_id = state.get("last_id")
+        if last_id is not None:
+            print(f"   ↪️  Resuming {self.name} after _id {last_id}")
+
+        with self._pool() as pool:
+            batch = self._read_batch(query, projection, last_id)
+            while batch:
+                results = self._transform(pool, transform, batch)
+                # Read ahead while the workers transform the current batch
+                next_batch = self._read_batch(query, projection, batch[-1]["_id"])
+
+                operations = []
+                for doc, (update, error) in zip(batch, results):
+                    if error:
+                        self._record_error(stats, doc["_id"], error)
+                    elif update:
+                        operations.append(UpdateOne({"_id": doc["_id"]}, update))
+                    else:
+                        stats.skipped += 1
+
+                stats.read += len(batch)
+                self._write(stats, operations)
+                self.checkpoint.save({"last_id": batch[-1]["_id"], "stats": stats.as_dict()})
+                self._report_progress(stats)
+                batch = next_batch
+
+        self._report_progress(stats, final=True)
+        self.checkpoint.clear()
+        return stats
+
+    def import_records(self, records: Iterable[Any],
+                       transform: Callable[[Any], Optional[Tuple[Dict, Dict]]]) -> MigrationStats:
+        """Upsert records from any iterable, resuming from the checkpointed position."""
+        stats = MigrationStats(name=self.name)
+        position = self.checkpoint.load().get("position", 0)
+        if position:
+            print(f"   ↪️  Resuming {self.name} at record {position}")
+
+        iterator = islice(iter(records), position, None)
+        with self._pool() as pool:
+            while True:
+                batch = list(islice(iterator, self.batch_size))
+                if not batch:
+                    break
+
+                operations = []
+                for offset, (result, error) in enumerate(self._transform(pool, transform, batch)):
+                    if error:
+                        self._record_error(stats, position + offset, error)
+                    elif result:
+                        record_filter, update = result
+                        operations.append(UpdateOne(record_filter, update, upsert=True))
+                    else:
+                        stats.skipped += 1
+
+                stats.read += len(batch)
+                position += len(batch)
+                self._write(stats, operations)
+                self.checkpoint.save({"position": position, "stats": stats.as_dict()})
+                self._report_progress(stats)
+
+        self._report_progress(stats, final=True)
+        self.checkpoint.clear()
+        return stats
+
+    def _pool(self):
+        if self.workers > 1:
+            return ProcessPoolExecutor(max_workers=self.workers)
+        return _InlineExecutor()
+
+    def _read_batch(self, query: Optional[Dict], projection: Optional[Dict], after) -> List[Dict]:
+        conditions = dict(query or {})
+        if after is not None:
+            conditions = {"$and": [conditions, {"_id": {"$gt": after}}]} if conditions else {"_id": {"$gt": after}}
+        return list(self.collection.find(conditions, projection).sort("_id", 1).limit(self.batch_size))
+
+    def _transform(self, pool, transform: Callable, batch: List[Any]):
+        tasks = [(transform, item) for item in batch]
+        chunksize = max(1, len(tasks) // (self.workers * 4))
+        return pool.map(_apply_transform, tasks, chunksize=chunksize)
+
+    def _write(self, stats: MigrationStats, operations: List[UpdateOne]):
+        stats.batches += 1
+        if not operations or self.dry_run:
+            return
+
+        result = self.collection.bulk_write(operations, ordered=False)
+        stats.matched += result.matched_count
+        stats.modified += result.modified_count
+        stats.upserted += result.upserted_count
+
+    def _record_error(self, stats: MigrationStats, key, error: str):
+        stats.failed += 1
+        if len(stats.errors) < self.max_errors:
+            stats.errors.append({"key": str(key), "error": error})
+
+    def _report_progress(self, stats: MigrationStats, final: bool = False):
+        now = time.perf_counter()
+        if not final and now - self._last_progress < self.progress_interval:
+            return
+        self._last_progress = now
+
+        prefix = "✅" if final else "⏳"
+        dry_run = " (dry run)" if self.dry_run else ""
+        print(f"   {prefix} {self.name}{dry_run}: {stats.read} read, {stats.modified} modified, "
+              f"{stats.upserted} upserted, {stats.skipped} skipped, {stats.failed} failed "
+              f"({stats.per_second:.0f} docs/s, {stats.elapsed:.1f}s)")
+
+
+class _InlineExecutor:
+    """Stand-in for ProcessPoolExecutor when running with a single worker."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def map(self, fn, iterable, chunksize=1):
+        return map(fn, iterable)
@@ -0,0 +1,170 @@
+"""MongoDB client options and connection pool metrics.
+
+Both MongoDBManager and AsyncMongoDBManager build their clients from
+mongo_client_options(), so the sync and async serving modes are tuned by
+the same environment variables. Options already present in the connection
+URI are left to the URI.
+
+Configuration (environment):
+    MONGO_MAX_POOL_SIZE                connections per server per process (default: 100)
+    MONGO_MIN_POOL_SIZE                connections kept open when idle (default: 0)
+    MONGO_MAX_IDLE_TIME_MS             close connections idle this long (default: never)
+    MONGO_WAIT_QUEUE_TIMEOUT_MS        fail a checkout after waiting this long for a
+                                       free connection (default: 10000)
+    MONGO_SERVER_SELECTION_TIMEOUT_MS  fail an operation when no server is reachable
+                                       within this time (default: 10000)
+    MONGO_CONNECT_TIMEOUT_MS           TCP connect timeout (default: driver default)
+    MONGO_SOCKET_TIMEOUT_MS            socket read timeout (default: none)
+    MONGO_COMPRESSORS                  wire compression in order of preference
+                                       (default: zstd,snappy); entries whose Python
+                                       package is missing are skipped
+    MONGO_RETRY_READS                  retry reads once on transient errors (default: true)
+    MONGO_RETRY_WRITES                 retry writes once on transient errors (default: true)
+"""
+
+import os
+import threading
+from typing import Any, Dict, List
+from urllib.parse import parse_qs, urlsplit
+
+from pymongo import monitoring
+
+# Python package each wire compressor needs (zlib ships with Python)
+COMPRESSOR_MODULES = {'zstd': 'zstandard', 'snappy': 'snappy', 'zlib': 'zlib'}
+
+
+def _available_compressors(value: str) -> List[str]:
+    compressors = []
+    for name in filter(None, (part.strip().lower() for part in value.split(','))):
+        module = COMPRESSOR_MODULES.get(name)
+        if module is None:
+            print(f"⚠️  Ignoring unknown MongoDB compressor: {name}")
+            continue
+        try:
+            __import__(module)
+        except ImportError:
+            continue
+        compressors.append(name)
+    return compressors
+
+
+def _uri_option_names(uri: str) -> set:
+    return {name.lower() for name in parse_qs(urlsplit(uri).query)}
+
+
+def mongo_client_options(uri: str) -> Dict[str, Any]:
+    """Client keyword options from the MONGO_* environment, minus those set in the URI."""
+    options = {
+        'maxPoolSize': int(os.getenv('MONGO_MAX_POOL_SIZE', '100')),
+        'minPoolSize': int(os.getenv('MONGO_MIN_POOL_SIZE', '0')),
+        'waitQueueTimeoutMS': int(os.getenv('MONGO_WAIT_QUEUE_TIMEOUT_MS', '10000')),
+        'serverSelectionTimeoutMS': int(os.getenv('MONGO_SERVER_SELECTION_TIMEOUT_MS', '10000')),
+        'retryReads': os.getenv('MONGO_RETRY_READS', 'true').lower() != 'false',
+        'retryWrites': os.getenv('MONGO_RETRY_WRITES', 'true').lower() != 'false',
+        'appname': 'swrpg-character-manager',
+    }
+    for option, variable in (('maxIdleTimeMS', 'MONGO_MAX_IDLE_TIME_MS'),
+                             ('connectTimeoutMS', 'MONGO_CONNECT_TIMEOUT_MS'),
+                             ('socketTimeoutMS', 'MONGO_SOCKET_TIMEOUT_MS')):
+        if os.getenv(variable):
+            options[option] = int(os.getenv(variable))
+
+    compressors = _available_compressors(os.getenv('MONGO_COMPRESSORS', 'zstd,snappy'))
+    if compressors:
+        options['compressors'] = ','.join(compressors)
+
+    in_uri = _uri_option_names(uri)
+    return {option: value for option, value in options.items() if option.lower() not in in_uri}
+
+
+class PoolMetricsListener(monitoring.ConnectionPoolListener):
+    """Connection pool counters for one client (and so one process).
+
+    Listener callbacks run on whichever thread touched the pool, so counters
+    are updated under a lock.
+    """
+
+    def __init__(self, max_pool_size: int = 100):
+        self.max_pool_size = max_pool_size
+        self.pools = 0
+        self.connections_open = 0
+        self.connections_created = 0
+        self.connections_closed = 0
+        self.checked_out = 0
+        self.max_checked_out = 0
+        self.checkouts = 0
+        self.checkout_wait_ms = 0.0
+        self.max_checkout_wait_ms = 0.0
+        self.checkout_failures: Dict[str, int] = {}
+        self.pool_clears = 0
+        self._lock = threading.Lock()
+
+    def pool_created(self, event):
+        with self._lock:
+            self.pools += 1
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        with self._lock:
+            self.pool_clears += 1
+
+    def pool_closed(self, event):
+        with self._lock:
+            self.pools -= 1
+
+    def connection_created(self, event):
+        with self._lock:
+            self.connections_created += 1
+            self.connections_open += 1
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        with self._lock:
+            self.connections_closed += 1
+            self.connections_open -= 1
+
+    def connection_check_out_started(self, event):
+        pass
+
+    def connection_check_out_failed(self, event):
+        with self._lock:
+            self.checkout_failures[event.reason] = self.checkout_failures.get(event.reason, 0) + 1
+
+    def connection_checked_out(self, event):
+        # duration (seconds, pymongo >= 4.7) includes waiting for a free connection
+        wait_ms = (getattr(event, 'duration', None) or 0) * 1000
+        with self._lock:
+            self.checkouts += 1
+            self.checked_out += 1
+            self.max_checked_out = max(self.max_checked_out, self.checked_out)
+            self.checkout_wait_ms += wait_ms
+            self.max_checkout_wait_ms = max(self.max_checkout_wait_ms, wait_ms)
+
+    def connection_checked_in(self, event):
+        with self._lock:
+            self.checked_out -= 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current pool utilization and lifetime counters."""
+        with self._lock:
+            capacity = self.max_pool_size * max(self.pools, 1)
+            return {
+                'pid': os.getpid(),
+                'pools': self.pools,
+                'max_pool_size': self.max_pool_size,
+                'checked_out': self.checked_out,
+                'max_checked_out': self.max_checked_out,
+                'utilization': round(self.checked_out / capacity, 3) if capacity else 0.0,
+                'connections_open': self.connections_open,
+                'connections_created': self.connections_created,
+                'connections_closed': self.connections_closed,
+                'checkouts': self.checkouts,
+                'avg_checkout_wait_ms': round(self.checkout_wait_ms / self.checkouts, 3) if self.checkouts else 0.0,
+                'max_checkout_wait_ms': round(self.max_checkout_wait_ms, 3),
+                'checkout_failures': dict(self.checkout_failures),
+                'pool_clears': self.pool_clears
+            }
@@ -0,0 +1,162 @@
+"""Bounded bcrypt hashing and verification for Star Wars RPG Character Manager.
+
+KDF work runs on a small thread pool (one thread per CPU by default). The
+calling request thread still waits for its result, so the pool does not
+free request threads; what it does is bound concurrency. bcrypt releases
+the GIL, so at most `workers` hashes compete for the CPUs at once, and at
+most workers + queue_size KDF jobs may be in flight per process. Beyond
+that callers get PasswordHashingBusy immediately (the routes answer 503)
+instead of piling up behind a login storm and starving the other routes
+of CPU and worker threads.
+
+Configuration (environment):
+    BCRYPT_LOG_ROUNDS         minimum bcrypt cost (default and floor: 12)
+    BCRYPT_MAX_ROUNDS         upper bound for auto-tuning (default: 15)
+    PASSWORD_HASH_TARGET_MS   auto-tune to the highest cost under this latency (default: 250)
+    PASSWORD_HASH_AUTOTUNE    set to "false" to always use BCRYPT_LOG_ROUNDS
+    PASSWORD_HASH_WORKERS     KDF threads (default: CPU count)
+    PASSWORD_HASH_QUEUE       KDF jobs allowed to wait for a thread (default: 4 per worker)
+"""
+
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+import bcrypt
+
+MIN_BCRYPT_ROUNDS = 12
+_BCRYPT_COST = re.compile(r'^\$2[abxy]?\$(\d{2})\$')
+
+
+class PasswordHashingBusy(Exception):
+    """Raised when the password hashing queue is full."""
+
+
+class PasswordHasher:
+    """bcrypt hashing on a bounded thread pool with queue-depth limits.
+
+    hash() and verify() are called from every request thread, so the
+    completed/rejected counters are updated under a lock.
+    """
+
+    def __init__(self, workers: int = None, queue_size: int = None,
+                 min_rounds: int = MIN_BCRYPT_ROUNDS, max_rounds: int = 15, target_ms: float = 250):
+        self.workers = workers or os.cpu_count() or 1
+        self.queue_size = self.workers * 4 if queue_size is None else queue_size
+        self.min_rounds = max(MIN_BCRYPT_ROUNDS, min_rounds)
+        self.max_rounds = max(self.min_rounds, max_rounds)
+        self.target_ms = target_ms
+        self.rounds = self.min_rounds
+
+        self.completed = 0
+        self.rejected = 0
+
+        self._slots = threading.BoundedSemaphore(self.workers + self.queue_size)
+        self._executor = None
+        self._executor_pid = None
+        self._executor_lock = threading.Lock()
+        self._counters_lock = threading.Lock()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        # Pool threads do not survive fork, so each worker process gets its own pool
+        if self._executor_pid != os.getpid():
+            with self._executor_lock:
+                if self._executor_pid != os.getpid():
+                    self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="kdf")
+                    self._slots = threading.BoundedSemaphore(self.workers + self.queue_size)
+                    self._counters_lock = threading.Lock()
+                    self._executor_pid = os.getpid()
+        return self._executor
+
+    def _run(self, fn: Callable, *args) -> Any:
+        executor = self._get_executor()
+        slots = self._slots
+        if not slots.acquire(blocking=False):
+            with self._counters_lock:
+                self.rejected += 1
+            raise PasswordHashingBusy("Too many password operations in progress")
+
+        try:
+            future = executor.submit(fn, *args)
+        except Exception:
+            slots.release()
+            raise
+        future.add_done_callback(lambda _: slots.release())
+
+        result = future.result()
+        with self._counters_lock:
+            self.completed += 1
+        return result
+
+    def hash(self, password: str) -> str:
+        """Hash a password at the current cost."""
+        return self._run(self._hash, password.encode('utf-8'), self.rounds)
+
+    def verify(self, password: str, password_hash: str) -> bool:
+        """Check a password against a bcrypt hash."""
+        if not password_hash:
+            return False
+        return self._run(self._verify, password.encode('utf-8'), password_hash.encode('utf-8'))
+
+    def needs_rehash(self, password_hash: str) -> bool:
+        """True when a hash was made with a lower cost than the current one."""
+        match = _BCRYPT_COST.match(password_hash or '')
+        return bool(match) and int(match.group(1)) < self.rounds
+
+    def autotune(self) -> int:
+        """Raise the cost while a hash still fits the target latency; never below the floor."""
+        rounds = self.min_rounds
+        elapsed_ms = self._time_hash(rounds)
+        # Each extra round doubles the work
+        while rounds < self.max_rounds and elapsed_ms * 2 <= self.target_ms:
+            rounds += 1
+            elapsed_ms *= 2
+
+        self.rounds = rounds
+        print(f"🔐 Password hashing: bcrypt cost {rounds} (~{elapsed_ms:.0f}ms per hash, "
+              f"{self.workers} workers, queue {self.queue_size})")
+        return rounds
+
+    def stats(self) -> Dict[str, Any]:
+        with self._counters_lock:
+            completed, rejected = self.completed, self.rejected
+        return {
+            "rounds": self.rounds,
+            "workers": self.workers,
+            "queue_size": self.queue_size,
+            "completed": completed,
+            "rejected": rejected
+        }
+
+    @staticmethod
+    def _hash(password: bytes, rounds: int) -> str:
+        return bcrypt.hashpw(password, bcrypt.gensalt(rounds)).decode('utf-8')
+
+    @staticmethod
+    def _verify(password: bytes, password_hash: bytes) -> bool:
+        try:
+            return bcrypt.checkpw(password, password_hash)
+        except ValueError:
+            return False  # Malformed hash
+
+    @staticmethod
+    def _time_hash(rounds: int) -> float:
+        started = time.perf_counter()
+        bcrypt.hashpw(b"autotune-sample-password", bcrypt.gensalt(rounds))
+        return (time.perf_counter() - started) * 1000
+
+
+def create_password_hasher_from_env() -> PasswordHasher:
+    """Build the password hasher described by the environment."""
+    workers = os.getenv('PASSWORD_HASH_WORKERS')
+    queue_size = os.getenv('PASSWORD_HASH_QUEUE')
+    return PasswordHasher(
+        workers=int(workers) if workers else None,
+        queue_size=int(queue_size) if queue_size else None,
+        min_rounds=int(os.getenv('BCRYPT_LOG_ROUNDS', str(MIN_BCRYPT_ROUNDS))),
+        max_rounds=int(os.getenv('BCRYPT_MAX_ROUNDS', '15')),
+        target_ms=float(os.getenv('PASSWORD_HASH_TARGET_MS', '250'))
+    )
@@ -1,39 +1,106 @@
 """Character data persistence (save/load functionality)."""
 
+import gzip
 import json
 import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
 from dataclasses import asdict
 from .models import Character, Career, Specialization, Skill, Talent, GameLine, Characteristic
-from .character_creator import CharacterCreator
+from .character_creator import get_character_creator
+from .storage import open_storage
+
+GZIP_MAGIC = b"\x1f\x8b"
+
+# Top-level fields every serialized character must have, with their JSON types
+REQUIRED_RECORD_FIELDS = {
+    "name": str,
+    "player_name": str,
+    "species": str,
+    "career": dict,
+    "characteristics": dict,
+    "experience": dict,
+    "skills": dict,
+    "equipment": dict,
+    "background": dict,
+}
+CHARACTERISTIC_KEYS = ("brawn", "agility", "intellect", "cunning", "willpower", "presence")
+EXPERIENCE_KEYS = ("total_xp", "available_xp", "spent_xp")
+
+
+def validate_character_record(line: str) -> Tuple[Optional[str], Optional[Dict], Optional[str]]:
+    """Parse and check one NDJSON character record.
+
+    Returns (name, record, None) for a valid record and (name, None, error)
+    otherwise. Kept at module level so it can run in worker processes.
+    """
+    try:
+        record = json.loads(line)
+    except ValueError as e:
+        return None, None, f"invalid JSON: {e}"
+
+    if not isinstance(record, dict):
+        return None, None, "record is not a JSON object"
+
+    name = record.get("name") if isinstance(record.get("name"), str) else None
+    for field, expected_type in REQUIRED_RECORD_FIELDS.items():
+        if not isinstance(record.get(field), expected_type):
+            return name, None, f"missing or invalid '{field}'"
+
+    try:
+        GameLine(record["career"].get("game_line"))
+    except ValueError:
+        return name, None, f"unknown game line '{record['career'].get('game_line')}'"
+
+    for key in CHARACTERISTIC_KEYS:
+        if not isinstance(record["characteristics"].get(key), int):
+            return name, None, f"missing or invalid characteristic '{key}'"
+
+    for key in EXPERIENCE_KEYS:
+        if not isinstance(record["experience"].get(key), int):
+            return name, None, f"missing or invalid experience '{key}'"
+
+    for skill_name, skill in record["skills"].items():
+        if not isinstance(skill, dict) or not isinstance(skill.get("ranks"), int):
+            return name, None, f"invalid ranks for skill '{skill_name}'"
+
+    return name, record, None
+
+
+def _open_ndjson(path: str, mode: str, compress: Optional[bool] = None):
+    """Open an NDJSON file, transparently handling gzip.
+
+    For reading, compression is detected from the file's magic bytes; for
+    writing it is used when requested or when the path ends in .gz.
+    """
+    if 'r' in mode:
+        with open(path, 'rb') as f:
+            compress = f.read(2) == GZIP_MAGIC
+    elif compress is None:
+        compress = str(path).endswith('.gz')
+
+    if compress:
+        return gzip.open(path, mode + 't', encoding='utf-8')
+    return open(path, mode, encoding='utf-8')
 
 
 class CharacterDatabase:
     """Handles saving and loading character data."""
     
-    def __init__(self, data_dir: str = "character_data"):
+    def __init__(self, data_dir: str = "character_data", backend: Optional[str] = None):
         self.data_dir = Path(data_dir)
         self.data_dir.mkdir(exist_ok=True)
         self.characters_file = self.data_dir / "characters.json"
-        self.character_creator = CharacterCreator()
+        self.storage = open_storage(self.data_dir, backend)
+        self.character_creator = get_character_creator()
     
     def save_character(self, character: Character) -> bool:
         """Save a character to the database."""
         try:
-            # Load existing characters
-            characters_data = self._load_characters_data()
-            
-            # Convert character to dictionary
-            char_dict = self._character_to_dict(character)
-            
-            # Update or add character
-            characters_data[character.name] = char_dict
-            
-            # Save back to file
-            with open(self.characters_file, 'w') as f:
-                json.dump(characters_data, f, indent=2)
-            
+            self.storage.put(character.name, self._character_to_dict(character))
             return True
         except Exception as e:
             print(f"Error saving character: {e}")
@@ -42,12 +109,10 @@ class CharacterDatabase:
     def load_character(self, character_name: str) -> Optional[Character]:
         """Load a character from the database."""
         try:
-            characters_data = self._load_characters_data()
-            
-            if character_name not in characters_data:
+            char_dict = self.storage.get(character_name)
+            if char_dict is None:
                 return None
             
-            char_dict = characters_data[character_name]
             return self._dict_to_character(char_dict)
         
         except Exception as e:
@@ -57,25 +122,14 @@ class CharacterDatabase:
     def list_characters(self) -> List[str]:
         """List all saved character names."""
         try:
-            characters_data = self._load_characters_data()
-            return list(characters_data.keys())
+            return self.storage.names()
         except Exception:
             return []
     
     def delete_character(self, character_name: str) -> bool:
         """Delete a character from the database."""
         try:
-            characters_data = self._load_characters_data()
-            
-            if character_name not in characters_data:
-                return False
-            
-            del characters_data[character_name]
-            
-            with open(self.characters_file, 'w') as f:
-                json.dump(characters_data, f, indent=2)
-            
-            return True
+            return self.storage.delete(character_name)
         except Exception as e:
             print(f"Error deleting character: {e}")
             return False
@@ -114,14 +168,82 @@ class CharacterDatabase:
             print(f"Error importing character: {e}")
             return None
     
-    def _load_characters_data(self) -> Dict:
-        """Load the characters database file."""
-        if not self.characters_file.exists():
-            return {}
+    def export_all(self, export_path: str, compress: Optional[bool] = None) -> Dict:
+        """Stream every character to an NDJSON file (gzip when compress is set or the path ends in .gz)."""
+        started = time.perf_counter()
+        exported = 0
         
+        with _open_ndjson(export_path, 'w', compress) as f:
+            for _, char_dict in self.storage.items():
+                f.write(json.dumps(char_dict, separators=(',', ':')))
+                f.write("\n")
+                exported += 1
+        
+        elapsed = time.perf_counter() - started
+        return {
+            "exported": exported,
+            "bytes": os.path.getsize(export_path),
+            "seconds": round(elapsed, 3),
+            "per_second": round(exported / elapsed) if elapsed > 0 else exported
+        }
+    
+    def import_all(self, import_path: str, batch_size: int = 1000,
+                   workers: Optional[int] = None, max_errors: int = 20) -> Dict:
+        """Stream characters from an NDJSON file (plain or gzip) into the database.
+        
+        Records are parsed and validated in a process pool, then written to
+        the storage backend one batch at a time, so memory stays bounded by
+        batch_size regardless of the archive size. Invalid records are
+        skipped and the first max_errors of them reported by line number.
+        Use workers=0 to validate in-process.
+        """
+        started = time.perf_counter()
+        if workers is None:
+            workers = os.cpu_count() or 1
+        result = {"imported": 0, "skipped": 0, "errors": []}
+        
+        def record_batches(lines: Iterable[str]):
+            numbered = ((number, line) for number, line in enumerate(lines, 1) if line.strip())
+            while True:
+                batch = list(islice(numbered, batch_size))
+                if not batch:
+                    return
+                yield batch
+        
+        pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+        try:
+            with _open_ndjson(import_path, 'r') as f:
+                for batch in record_batches(f):
+                    lines = [line for _, line in batch]
+                    if pool:
+                        chunksize = max(1, len(lines) // (workers * 4))
+                        validated = pool.map(validate_character_record, lines, chunksize=chunksize)
+                    else:
+                        validated = map(validate_character_record, lines)
+                    
+                    valid = []
+                    for (line_number, _), (name, record, error) in zip(batch, validated):
+                        if error:
+                            result["skipped"] += 1
+                            if len(result["errors"]) < max_errors:
+                                result["errors"].append({"line": line_number, "name": name, "error": error})
+                        else:
+                            valid.append((name, record))
+                    
+                    result["imported"] += self.storage.put_many(valid)
+        finally:
+            if pool:
+                pool.shutdown()
+        
+        elapsed = time.perf_counter() - started
+        result["seconds"] = round(elapsed, 3)
+        result["per_second"] = round(result["imported"] / elapsed) if elapsed > 0 else result["imported"]
+        return result
+    
+    def _load_characters_data(self) -> Dict:
+        """Load every stored character record, keyed by name."""
         try:
-            with open(self.characters_file, 'r') as f:
-                return json.load(f)
+            return dict(self.storage.items())
         except Exception:
             return {}
     
@@ -263,8 +385,7 @@ class CharacterDatabase:
     def backup_database(self, backup_path: str) -> bool:
         """Create a backup of the entire character database."""
         try:
-            import shutil
-            shutil.copy2(self.characters_file, backup_path)
+            self.storage.backup(backup_path)
             return True
         except Exception as e:
             print(f"Error creating backup: {e}")
@@ -272,6 +393,10 @@ class CharacterDatabase:
     
     def get_database_stats(self) -> Dict:
         """Get statistics about the character database."""
+        stats = self.storage.stats()
+        if stats is not None:
+            return stats
+        
         characters_data = self._load_characters_data()
         
         stats = {
@@ -0,0 +1,117 @@
+"""Compiled reference data (species and careers) for fast process startup.
+
+`python -m swrpg_character_manager.reference_data` compiles the verified
+species database and the career definitions into a single pre-normalized
+artifact. CharacterCreator loads it with one read instead of parsing and
+normalizing the JSON sources in every process.
+
+Artifact layout: MAGIC | format version (uint16) | SHA-256 of payload | pickled payload.
+The payload records the size and mtime of each source file, and the artifact
+is ignored (falling back to the JSON sources) when any of them changed.
+"""
+
+import hashlib
+import os
+import pickle
+import struct
+import sys
+from typing import Any, Dict, Optional
+
+MAGIC = b"SWRPGREF"
+FORMAT_VERSION = 1
+_HEADER = struct.Struct(f">{len(MAGIC)}sH32s")
+
+_PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(_PACKAGE_DIR))
+
+DEFAULT_ARTIFACT_PATH = os.getenv(
+    'SWRPG_REFERENCE_DATA',
+    os.path.join(_PROJECT_ROOT, 'swrpg_extracted_data', 'compiled', 'reference_data.bin')
+)
+
+# Files whose content ends up in the artifact
+SOURCE_FILES = [
+    os.path.join(_PROJECT_ROOT, 'swrpg_extracted_data', 'OFFICIAL_SPECIES_DATABASE.json'),
+    os.path.join(_PROJECT_ROOT, 'swrpg_extracted_data', 'json', 'official_109_species_database.json'),
+    os.path.join(_PACKAGE_DIR, 'character_creator.py'),  # career definitions live in code
+    os.path.join(_PACKAGE_DIR, 'models.py'),  # Career/GameLine classes the payload is pickled with
+]
+
+
+def _source_fingerprint() -> Dict[str, Optional[tuple]]:
+    """Size and mtime of every source file (None for missing files)."""
+    fingerprint = {}
+    for path in SOURCE_FILES:
+        try:
+            stat = os.stat(path)
+            fingerprint[os.path.relpath(path, _PROJECT_ROOT)] = (stat.st_size, stat.st_mtime_ns)
+        except OSError:
+            fingerprint[os.path.relpath(path, _PROJECT_ROOT)] = None
+    return fingerprint
+
+
+def compile_reference_data(output_path: str = DEFAULT_ARTIFACT_PATH) -> Dict[str, Any]:
+    """Load and normalize the JSON sources, then write the compiled artifact atomically."""
+    from .character_creator import CharacterCreator
+
+    creator = CharacterCreator(use_compiled=False)
+    payload = {
+        "sources": _source_fingerprint(),
+        "species": creator.species_data,
+        "careers": creator.careers,
+    }
+    data = pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL)
+    header = _HEADER.pack(MAGIC, FORMAT_VERSION, hashlib.sha256(data).digest())
+
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    tmp_path = f"{output_path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(header)
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, output_path)
+
+    return payload
+
+
+def load_compiled_reference_data(path: str = DEFAULT_ARTIFACT_PATH) -> Optional[Dict[str, Any]]:
+    """Load the compiled artifact, or return None if it is missing, corrupt or stale."""
+    try:
+        with open(path, 'rb') as f:
+            raw = f.read()
+    except OSError:
+        return None
+
+    if len(raw) < _HEADER.size:
+        return None
+
+    magic, version, digest = _HEADER.unpack_from(raw)
+    data = memoryview(raw)[_HEADER.size:]
+    if magic != MAGIC or version != FORMAT_VERSION:
+        return None
+    if hashlib.sha256(data).digest() != digest:
+        print(f"⚠️  Compiled reference data failed checksum validation: {path}")
+        return None
+
+    try:
+        payload = pickle.loads(data)
+    except Exception as e:
+        print(f"⚠️  Could not load compiled reference data: {e}")
+        return None
+
+    if payload.get("sources") != _source_fingerprint():
+        return None
+
+    return payload
+
+
+def main():
+    """Compile reference data to the path given on the command line (or the default)."""
+    output_path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_ARTIFACT_PATH
+    payload = compile_reference_data(output_path)
+    print(f"✅ Compiled {len(payload['species'])} species and {len(payload['careers'])} careers to {output_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,11 +2,15 @@
 
 import os
 import base64
+import datetime
+import hashlib
 import secrets
-from typing import Optional, Tuple
+from typing import Iterable, List, Optional, Tuple
 from cryptography.fernet import Fernet
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+from .audit import create_audit_pipeline_from_env
+from .cache import TTLCache
 
 
 class DataEncryption:
@@ -15,6 +19,13 @@ class DataEncryption:
     def __init__(self):
         self.master_key = self._get_or_create_master_key()
         self.cipher = Fernet(self.master_key)
+        # Plaintexts of recently decrypted values, keyed by SHA-256 of the ciphertext.
+        # Fernet tokens are never reused, so entries can't go stale; size and TTL
+        # bound how long plaintext stays in memory.
+        self.decrypt_cache = TTLCache(
+            maxsize=int(os.getenv('DECRYPT_CACHE_SIZE', '4096')),
+            ttl=float(os.getenv('DECRYPT_CACHE_TTL', '3600'))
+        )
     
     def _get_or_create_master_key(self) -> bytes:
         """Get or create master encryption key using PBKDF2 with 256-bit key."""
@@ -84,13 +95,34 @@ class DataEncryption:
         if not encrypted_email:
             return ""
         
+        cache_key = hashlib.sha256(encrypted_email.encode('utf-8')).digest()
+        cached = self.decrypt_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
         try:
             encrypted_data = base64.b64decode(encrypted_email.encode('utf-8'))
             decrypted_data = self.cipher.decrypt(encrypted_data)
-            return decrypted_data.decode('utf-8')
+            email = decrypted_data.decode('utf-8')
         except Exception as e:
             print(f"Error decrypting email: {e}")
             return encrypted_email  # Fallback to encrypted string (may be plaintext from migration)
+        
+        self.decrypt_cache.set(cache_key, email)
+        return email
+    
+    def decrypt_many(self, encrypted_emails: Iterable[str]) -> List[str]:
+        """Decrypt a batch of email addresses, preserving order.
+        
+        Each distinct ciphertext is decrypted at most once, and values already
+        in the decrypt cache are not decrypted again.
+        """
+        encrypted_emails = list(encrypted_emails)
+        decrypted = {}
+        for encrypted_email in encrypted_emails:
+            if encrypted_email not in decrypted:
+                decrypted[encrypted_email] = self.decrypt_email(encrypted_email)
+        return [decrypted[encrypted_email] for encrypted_email in encrypted_emails]
     
     def encrypt_pii(self, data: str) -> str:
         """Encrypt any personally identifiable information."""
@@ -106,7 +138,6 @@ class DataEncryption:
             return ""
         
         # Use SHA256 for consistent hashing (for database indexes)
-        import hashlib
         return hashlib.sha256(email.lower().encode('utf-8')).hexdigest()
     
     def is_email_encrypted(self, email_data: str) -> bool:
@@ -124,16 +155,18 @@ class DataEncryption:
 
 
 class SecurityAuditLog:
-    """Security audit logging for compliance."""
+    """Security audit logging for compliance.
+    
+    Events are queued on the process-wide audit pipeline and written to the
+    configured sinks by a background thread (see audit.py).
+    """
     
     @staticmethod
     def log_data_access(user_id: str, action: str, data_type: str, success: bool = True):
         """Log data access for audit trails."""
-        import datetime
-        timestamp = datetime.datetime.now(datetime.timezone.utc).isoformat()
-        
         log_entry = {
-            "timestamp": timestamp,
+            "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "log": "audit",
             "user_id": user_id,
             "action": action,
             "data_type": data_type,
@@ -141,25 +174,28 @@ class SecurityAuditLog:
             "ip_address": "system"  # Would be replaced with actual IP in production
         }
         
-        # In production, this would go to a secure audit log system
-        print(f"AUDIT LOG: {log_entry}")
+        audit_pipeline.emit(action, log_entry)
     
     @staticmethod
     def log_encryption_event(event_type: str, success: bool = True):
         """Log encryption/decryption events."""
-        import datetime
-        timestamp = datetime.datetime.now(datetime.timezone.utc).isoformat()
-        
         log_entry = {
-            "timestamp": timestamp,
+            "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "log": "encryption",
             "event_type": event_type,
             "success": success,
             "component": "data_encryption"
         }
         
-        print(f"ENCRYPTION LOG: {log_entry}")
+        audit_pipeline.emit(event_type, log_entry)
+    
+    @staticmethod
+    def metrics() -> dict:
+        """Return audit pipeline counters (written, dropped, sampled out, ...)."""
+        return audit_pipeline.metrics()
 
 
 # Global encryption instance
 data_encryption = DataEncryption()
-audit_log = SecurityAuditLog()
\ No newline at end of file
+audit_pipeline = create_audit_pipeline_from_env()
+audit_log = SecurityAuditLog()
@@ -0,0 +1,520 @@
+"""Storage backends for the offline CharacterDatabase.
+
+A backend stores serialized character records (plain dicts, as produced by
+CharacterDatabase._character_to_dict) keyed by character name.
+"""
+
+import copy
+import json
+import os
+import shutil
+import sqlite3
+import sys
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks, so a journal there is single-writer
+    fcntl = None
+
+
+def _fsync_directory(path: Path):
+    """Flush a directory entry so a rename survives a crash (no-op where unsupported)."""
+    try:
+        fd = os.open(str(path), os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def atomic_write_bytes(path: Path, data: bytes):
+    """Write a file via a temporary sibling, fsync and rename, so readers never see a partial file."""
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    _fsync_directory(path.parent)
+
+
+class CharacterStorage(ABC):
+    """Interface implemented by every character storage backend."""
+
+    @abstractmethod
+    def get(self, name: str) -> Optional[Dict]:
+        """Return the record for a character, or None."""
+
+    @abstractmethod
+    def put(self, name: str, record: Dict):
+        """Insert or replace a character record."""
+
+    def put_many(self, records: Iterable[Tuple[str, Dict]]) -> int:
+        """Insert or replace many records; returns how many were written."""
+        count = 0
+        for name, record in records:
+            self.put(name, record)
+            count += 1
+        return count
+
+    @abstractmethod
+    def delete(self, name: str) -> bool:
+        """Remove a character; returns False if it did not exist."""
+
+    @abstractmethod
+    def names(self) -> List[str]:
+        """Return all stored character names."""
+
+    def items(self) -> Iterator[Tuple[str, Dict]]:
+        """Iterate over (name, record) pairs."""
+        for name in self.names():
+            record = self.get(name)
+            if record is not None:
+                yield name, record
+
+    def stats(self) -> Optional[Dict]:
+        """Return database statistics computed by the backend, or None if it has no fast path."""
+        return None
+
+    @abstractmethod
+    def backup(self, backup_path: str):
+        """Copy the stored data to backup_path."""
+
+
+class JSONFileStorage(CharacterStorage):
+    """All characters in one JSON document (the original characters.json format).
+
+    The parsed document is kept in memory and reused for as long as the
+    file's (mtime_ns, inode, size) signature is unchanged, so a session
+    that lists, loads and shows characters parses the file once. Every
+    write rewrites the whole file, atomically, and refreshes the cache.
+    Records are copied on the way in and out, so callers never share
+    (and cannot corrupt) the cached dicts.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._data: Dict[str, Dict] = {}
+        self._signature = None
+
+    def _stat_signature(self) -> Optional[Tuple[int, int, int]]:
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_ino, stat.st_size)
+
+    def _load(self) -> Dict[str, Dict]:
+        signature = self._stat_signature()
+        if signature is None:
+            self._data, self._signature = {}, None
+        elif signature != self._signature:
+            try:
+                with open(self.path, 'r') as f:
+                    self._data = json.load(f)
+            except Exception:
+                self._data = {}
+            self._signature = signature
+        return self._data
+
+    def _save(self, data: Dict[str, Dict]):
+        atomic_write_bytes(self.path, json.dumps(data, indent=2).encode('utf-8'))
+        self._data, self._signature = data, self._stat_signature()
+
+    def get(self, name: str) -> Optional[Dict]:
+        record = self._load().get(name)
+        # Callers may mutate what they get back; never hand out the cached record
+        return copy.deepcopy(record) if record is not None else None
+
+    def put(self, name: str, record: Dict):
+        self.put_many([(name, record)])
+
+    def put_many(self, records: Iterable[Tuple[str, Dict]]) -> int:
+        data = dict(self._load())
+        count = 0
+        for name, record in records:
+            data[name] = copy.deepcopy(record)
+            count += 1
+        if count:
+            self._save(data)
+        return count
+
+    def delete(self, name: str) -> bool:
+        data = dict(self._load())
+        if name not in data:
+            return False
+        del data[name]
+        self._save(data)
+        return True
+
+    def names(self) -> List[str]:
+        return list(self._load().keys())
+
+    def items(self) -> Iterator[Tuple[str, Dict]]:
+        for name, record in list(self._load().items()):
+            yield name, copy.deepcopy(record)
+
+    def backup(self, backup_path: str):
+        shutil.copy2(self.path, backup_path)
+
+
+class JournalStorage(CharacterStorage):
+    """Append-only record log with an in-memory offset index.
+
+    Each line of the journal is a JSON record, {"op": "put", "name": ..., "data": ...}
+    or {"op": "del", "name": ...}; the latest record for a name wins. A save
+    appends one line (O(record)) and fsyncs it. When superseded records
+    outnumber live ones the journal is compacted into a fresh file that
+    atomically replaces the old one.
+
+    Appends and compactions hold an exclusive flock on a sidecar lock file
+    (<journal>.lock), so several processes can write to one journal: each
+    writer re-reads the tail under the lock before appending, and compaction
+    re-scans it before rewriting, so no other process's append is lost.
+    Readers don't lock; they pick up new appends by re-reading the tail and
+    a compaction elsewhere by the inode change, which they check again on the
+    descriptor they read from (see _open_indexed). Without fcntl (Windows) there
+    is no lock and the journal must have a single writer.
+    """
+
+    def __init__(self, path: Path, legacy_json_path: Optional[Path] = None,
+                 sync: bool = True, compact_min_dead: int = 1000):
+        self.path = Path(path)
+        self.sync = sync
+        self.compact_min_dead = compact_min_dead
+        self.lock_path = self.path.with_name(self.path.name + ".lock")
+        self._index: Dict[str, Tuple[int, int]] = {}  # name -> (offset, length)
+        self._dead = 0
+        self._end = 0
+        self._inode = None
+
+        with self._locked():
+            if not self.path.exists():
+                self._bootstrap(legacy_json_path)
+        self._refresh()
+
+    @contextmanager
+    def _locked(self):
+        """Hold the cross-process writer lock for the duration of the block."""
+        if fcntl is None:
+            yield
+            return
+        with open(self.lock_path, 'ab') as lock_file:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    def _bootstrap(self, legacy_json_path: Optional[Path]):
+        """Create the journal, importing an existing characters.json once."""
+        records = []
+        if legacy_json_path and Path(legacy_json_path).exists():
+            records = list(JSONFileStorage(legacy_json_path).items())
+        atomic_write_bytes(self.path, b"".join(self._encode_put(name, record) for name, record in records))
+
+    @staticmethod
+    def _encode_put(name: str, record: Dict) -> bytes:
+        return (json.dumps({"op": "put", "name": name, "data": record}, separators=(',', ':')) + "\n").encode('utf-8')
+
+    @staticmethod
+    def _encode_delete(name: str) -> bytes:
+        return (json.dumps({"op": "del", "name": name}, separators=(',', ':')) + "\n").encode('utf-8')
+
+    def _refresh(self):
+        """Bring the index up to date with the file, reading only what changed."""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            self._index, self._dead, self._end, self._inode = {}, 0, 0, None
+            return
+
+        if stat.st_ino != self._inode or stat.st_size < self._end:
+            # New or compacted file: rebuild from scratch
+            self._index, self._dead, self._end, self._inode = {}, 0, 0, stat.st_ino
+
+        if stat.st_size > self._end:
+            with open(self.path, 'rb') as f:
+                f.seek(self._end)
+                self._scan(f, self._end)
+
+    def _scan(self, f, offset: int):
+        """Index records from the current position; stops at a torn trailing line."""
+        for line in f:
+            if not line.endswith(b"\n"):
+                break  # partially written record from an interrupted append
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                offset += len(line)
+                self._dead += 1
+                continue
+
+            name = entry.get("name")
+            if name in self._index:
+                self._dead += 1
+            if entry.get("op") == "put":
+                self._index[name] = (offset, len(line))
+            else:
+                self._index.pop(name, None)
+                self._dead += 1
+            offset += len(line)
+        self._end = offset
+
+    def _append(self, data: bytes):
+        with self._locked():
+            self._refresh()
+            with open(self.path, 'ab') as f:
+                f.seek(0, os.SEEK_END)
+                offset = f.tell()
+                if offset > self._end:
+                    # Terminate a torn record so it cannot swallow this one
+                    data = b"\n" + data
+                f.write(data)
+                f.flush()
+                if self.sync:
+                    os.fsync(f.fileno())
+
+            # Index what we just wrote (and anything appended before it)
+            with open(self.path, 'rb') as f:
+                f.seek(self._end)
+                self._scan(f, self._end)
+        return offset
+
+    def _open_indexed(self):
+        """Open the journal file the index describes.
+
+        A compaction in another process can swap the file between _refresh()
+        and open(), leaving offsets that point into the wrong file. The inode
+        of the opened descriptor tells; on a mismatch re-index and try again.
+        """
+        while True:
+            f = open(self.path, 'rb')
+            if os.fstat(f.fileno()).st_ino == self._inode:
+                return f
+            f.close()
+            self._refresh()
+
+    def get(self, name: str) -> Optional[Dict]:
+        self._refresh()
+        with self._open_indexed() as f:
+            location = self._index.get(name)
+            if location is None:
+                return None
+
+            offset, length = location
+            f.seek(offset)
+            return json.loads(f.read(length))["data"]
+
+    def put(self, name: str, record: Dict):
+        self.put_many([(name, record)])
+
+    def put_many(self, records: Iterable[Tuple[str, Dict]]) -> int:
+        chunks = [self._encode_put(name, record) for name, record in records]
+        if chunks:
+            self._append(b"".join(chunks))
+            self._maybe_compact()
+        return len(chunks)
+
+    def delete(self, name: str) -> bool:
+        self._refresh()
+        if name not in self._index:
+            return False
+        self._append(self._encode_delete(name))
+        self._maybe_compact()
+        return True
+
+    def names(self) -> List[str]:
+        self._refresh()
+        return list(self._index.keys())
+
+    def items(self) -> Iterator[Tuple[str, Dict]]:
+        self._refresh()
+        with self._open_indexed() as f:
+            locations = sorted(self._index.items(), key=lambda item: item[1][0])
+            for name, (offset, length) in locations:
+                f.seek(offset)
+                yield name, json.loads(f.read(length))["data"]
+
+    def _maybe_compact(self):
+        if self._dead >= self.compact_min_dead and self._dead > len(self._index):
+            self.compact()
+
+    def compact(self):
+        """Rewrite the journal with only live records and atomically swap it in."""
+        with self._locked():
+            # items() re-reads the tail, so appends made elsewhere are kept
+            live = list(self.items())
+            atomic_write_bytes(self.path, b"".join(self._encode_put(name, record) for name, record in live))
+            self._inode = None
+            self._refresh()
+
+    def backup(self, backup_path: str):
+        self._refresh()
+        shutil.copy2(self.path, backup_path)
+
+
+class SQLiteStorage(CharacterStorage):
+    """Characters in a SQLite database running in WAL mode.
+
+    The full sheet is kept as a JSON blob; name, species, career and total XP
+    are duplicated into indexed columns so listing and statistics never
+    decode a sheet. WAL lets any number of CLI processes read while one writes.
+    """
+
+    SCHEMA = [
+        """CREATE TABLE IF NOT EXISTS characters (
+            name TEXT PRIMARY KEY,
+            species TEXT,
+            career TEXT,
+            total_xp INTEGER NOT NULL DEFAULT 0,
+            data TEXT NOT NULL,
+            updated_at REAL NOT NULL
+        )""",
+        "CREATE INDEX IF NOT EXISTS idx_characters_species ON characters (species)",
+        "CREATE INDEX IF NOT EXISTS idx_characters_career ON characters (career)",
+        "CREATE INDEX IF NOT EXISTS idx_characters_total_xp ON characters (total_xp)",
+    ]
+
+    def __init__(self, path: Path, legacy_json_path: Optional[Path] = None, busy_timeout: float = 5.0):
+        self.path = Path(path)
+        is_new = not self.path.exists()
+
+        self._conn = sqlite3.connect(str(self.path), timeout=busy_timeout)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        with self._conn:
+            for statement in self.SCHEMA:
+                self._conn.execute(statement)
+
+        if is_new and legacy_json_path and Path(legacy_json_path).exists():
+            self.put_many(JSONFileStorage(legacy_json_path).items())
+
+    @staticmethod
+    def _row(name: str, record: Dict) -> Tuple:
+        career = record.get("career") or {}
+        experience = record.get("experience") or {}
+        return (
+            name,
+            record.get("species"),
+            career.get("name"),
+            experience.get("total_xp", 0),
+            json.dumps(record, separators=(',', ':')),
+            time.time(),
+        )
+
+    def get(self, name: str) -> Optional[Dict]:
+        row = self._conn.execute("SELECT data FROM characters WHERE name = ?", (name,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put(self, name: str, record: Dict):
+        self.put_many([(name, record)])
+
+    def put_many(self, records: Iterable[Tuple[str, Dict]]) -> int:
+        rows = [self._row(name, record) for name, record in records]
+        with self._conn:
+            self._conn.executemany(
+                """INSERT INTO characters (name, species, career, total_xp, data, updated_at)
+                   VALUES (?, ?, ?, ?, ?, ?)
+                   ON CONFLICT(name) DO UPDATE SET
+                       species = excluded.species,
+                       career = excluded.career,
+                       total_xp = excluded.total_xp,
+                       data = excluded.data,
+                       updated_at = excluded.updated_at""",
+                rows
+            )
+        return len(rows)
+
+    def delete(self, name: str) -> bool:
+        with self._conn:
+            cursor = self._conn.execute("DELETE FROM characters WHERE name = ?", (name,))
+        return cursor.rowcount > 0
+
+    def names(self) -> List[str]:
+        return [row[0] for row in self._conn.execute("SELECT name FROM characters ORDER BY rowid")]
+
+    def items(self) -> Iterator[Tuple[str, Dict]]:
+        for name, data in self._conn.execute("SELECT name, data FROM characters ORDER BY rowid"):
+            yield name, json.loads(data)
+
+    def stats(self) -> Optional[Dict]:
+        total, total_xp = self._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(total_xp), 0) FROM characters"
+        ).fetchone()
+        return {
+            "total_characters": total,
+            "characters_by_career": dict(self._conn.execute(
+                "SELECT career, COUNT(*) FROM characters GROUP BY career"
+            ).fetchall()),
+            "characters_by_species": dict(self._conn.execute(
+                "SELECT species, COUNT(*) FROM characters GROUP BY species"
+            ).fetchall()),
+            "average_xp": total_xp // total if total else 0
+        }
+
+    def backup(self, backup_path: str):
+        target = sqlite3.connect(backup_path)
+        try:
+            self._conn.backup(target)
+        finally:
+            target.close()
+
+    def close(self):
+        self._conn.close()
+
+
+def migrate_json_to_sqlite(json_path: Path, db_path: Path) -> int:
+    """Copy every character from a characters.json file into a SQLite database.
+
+    Existing rows with the same name are replaced, so the migration can be re-run.
+    """
+    storage = SQLiteStorage(db_path)
+    try:
+        return storage.put_many(JSONFileStorage(json_path).items())
+    finally:
+        storage.close()
+
+
+STORAGE_BACKENDS = ('json', 'journal', 'sqlite')
+DEFAULT_STORAGE_BACKEND = os.getenv('SWRPG_STORAGE_BACKEND', 'json')
+
+
+def open_storage(data_dir: Path, backend: Optional[str] = None) -> CharacterStorage:
+    """Open the named backend inside data_dir ('json', 'journal' or 'sqlite')."""
+    data_dir = Path(data_dir)
+    backend = (backend or DEFAULT_STORAGE_BACKEND).lower()
+    json_path = data_dir / "characters.json"
+
+    if backend == 'json':
+        return JSONFileStorage(json_path)
+    if backend == 'journal':
+        return JournalStorage(data_dir / "characters.journal", legacy_json_path=json_path)
+    if backend == 'sqlite':
+        return SQLiteStorage(data_dir / "characters.db", legacy_json_path=json_path)
+    raise ValueError(f"Unknown storage backend '{backend}'. Choose from: {', '.join(STORAGE_BACKENDS)}")
+
+
+def main():
+    """Migrate <data_dir>/characters.json into <data_dir>/characters.db."""
+    data_dir = Path(sys.argv[1] if len(sys.argv) > 1 else "character_data")
+    json_path = data_dir / "characters.json"
+    if not json_path.exists():
+        print(f"❌ No characters.json found in {data_dir}")
+        sys.exit(1)
+
+    count = migrate_json_to_sqlite(json_path, data_dir / "characters.db")
+    print(f"✅ Migrated {count} characters to {data_dir / 'characters.db'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 """Production startup script that sets up admin user and starts with Gunicorn."""
 
+import argparse
 import os
 import sys
 import time
@@ -121,10 +122,11 @@ def ensure_admin_user():
         existing_admin = db_manager.get_user_by_email(admin_email)
         if existing_admin:
             print(f"✅ Admin user {admin_email} already exists")
-            # Always update password to ensure it's current
-            updates = {"password_hash": auth_manager.hash_password(admin_password)}
-            db_manager.update_user(existing_admin._id, updates)
-            print(f"🔄 Updated admin password")
+            # Update password only when it changed, so restarts don't revoke admin tokens
+            if not auth_manager.verify_password(admin_password, existing_admin.password_hash):
+                updates = {"password_hash": auth_manager.hash_password(admin_password)}
+                db_manager.update_user(existing_admin._id, updates)
+                print(f"🔄 Updated admin password")
         else:
             # Create new admin user
             admin = User(
@@ -173,37 +175,186 @@ def ensure_admin_user():
         traceback.print_exc()
         return False
 
-def start_gunicorn():
-    """Start the application with Gunicorn."""
-    print("🚀 Starting Star Wars RPG Character Manager with Gunicorn...")
+# Worker classes start_gunicorn knows how to size, and the app each one serves
+WORKER_CLASSES = {
+    "sync": "wsgi:application",
+    "gthread": "wsgi:application",
+    "gevent": "wsgi:application",
+    "uvicorn": "asgi:application",
+}
+
+# Sizing per profile. "latency" favours more processes with few threads, so
+# CPU-bound requests don't queue behind each other on one GIL; "throughput"
+# favours fewer processes with more threads/connections, so each process
+# overlaps many MongoDB round-trips and fewer copies of the app sit in memory.
+WORKER_PROFILES = {
+    "latency": {"workers_per_cpu": 2, "threads": 2, "worker_connections": 100},
+    "throughput": {"workers_per_cpu": 1, "threads": 8, "worker_connections": 1000},
+}
+
+CGROUP_ROOT = "/sys/fs/cgroup"
+
+def _cgroup_cpu_quota():
+    """CPU quota as (quota, period) microseconds, or None when there is no limit."""
+    try:
+        # cgroup v2: "<quota> <period>" or "max <period>"
+        with open(os.path.join(CGROUP_ROOT, "cpu.max")) as f:
+            quota, period = f.read().split()
+        return None if quota == "max" else (int(quota), int(period))
+    except (OSError, ValueError):
+        pass
     
-    # Gunicorn configuration
-    workers = int(os.getenv("GUNICORN_WORKERS", "4"))
-    port = int(os.getenv("PORT", "8000"))
-    bind_address = f"0.0.0.0:{port}"
+    try:
+        # cgroup v1: cpu.cfs_quota_us is -1 when unlimited
+        with open(os.path.join(CGROUP_ROOT, "cpu", "cpu.cfs_quota_us")) as f:
+            quota = int(f.read())
+        with open(os.path.join(CGROUP_ROOT, "cpu", "cpu.cfs_period_us")) as f:
+            period = int(f.read())
+    except (OSError, ValueError):
+        return None
+    return (quota, period) if quota > 0 and period > 0 else None
+
+def detect_cpu_count():
+    """CPUs available to this process, honouring affinity and cgroup (v2 or v1) quotas."""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+    
+    quota = _cgroup_cpu_quota()
+    if quota:
+        cpus = min(cpus, max(1, quota[0] // quota[1]))
+    
+    return cpus
+
+def detect_memory_mb():
+    """Memory available to this process in MB (cgroup limit if lower than RAM)."""
+    memory = os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+    
+    for limit_path in ("memory.max", os.path.join("memory", "memory.limit_in_bytes")):
+        try:
+            with open(os.path.join(CGROUP_ROOT, limit_path)) as f:
+                limit = f.read().strip()
+            if limit != "max":
+                memory = min(memory, int(limit))
+            break
+        except (OSError, ValueError):
+            continue
+    
+    return memory // (1024 * 1024)
+
+def plan_gunicorn_config(worker_class=None, profile=None, workers=None, threads=None, preload=None):
+    """Work out worker class, process/thread counts and preload for this machine.
+    
+    Arguments override the GUNICORN_* environment variables, which override
+    the sizing derived from CPU count and memory.
+    """
+    worker_class = worker_class or os.getenv("GUNICORN_WORKER_CLASS", "gthread")
+    profile = profile or os.getenv("GUNICORN_PROFILE", "throughput")
+    if worker_class not in WORKER_CLASSES:
+        raise ValueError(f"Unknown worker class: {worker_class}")
+    if profile not in WORKER_PROFILES:
+        raise ValueError(f"Unknown profile: {profile}")
+    
+    if worker_class in ("gevent", "uvicorn"):
+        try:
+            __import__(worker_class)
+        except ImportError:
+            print(f"⚠️  {worker_class} is not installed, using gthread workers instead")
+            worker_class = "gthread"
+    
+    settings = WORKER_PROFILES[profile]
+    cpus = detect_cpu_count()
+    memory_mb = detect_memory_mb()
+    worker_memory_mb = int(os.getenv("GUNICORN_WORKER_MEMORY_MB", "200"))
     
-    # Gunicorn command
+    workers = workers or int(os.getenv("GUNICORN_WORKERS", "0"))
+    if not workers:
+        if worker_class == "sync":
+            workers = cpus * 2 + 1
+        else:
+            workers = cpus * settings["workers_per_cpu"] + 1
+        # Leave a quarter of memory for MongoDB clients, page cache and the master
+        workers = max(1, min(workers, int(memory_mb * 0.75) // worker_memory_mb))
+    
+    if worker_class == "gthread":
+        threads = threads or int(os.getenv("GUNICORN_THREADS", "0")) or settings["threads"]
+    else:
+        threads = 1
+    
+    if preload is None:
+        preload = os.getenv("GUNICORN_PRELOAD", "true").lower() != "false"
+    if preload and worker_class == "gevent":
+        # gevent patches the stdlib in each worker; modules imported by a
+        # preloading master would keep the unpatched versions
+        print("⚠️  --preload is not supported with gevent workers, disabling it")
+        preload = False
+    
+    return {
+        "worker_class": worker_class,
+        "profile": profile,
+        "workers": workers,
+        "threads": threads,
+        "worker_connections": settings["worker_connections"] if worker_class == "gevent" else None,
+        "preload": preload,
+        "app": WORKER_CLASSES[worker_class],
+        "cpus": cpus,
+        "memory_mb": memory_mb,
+    }
+
+def build_gunicorn_command(config, bind_address):
+    """Gunicorn command line for a plan from plan_gunicorn_config."""
+    worker_class = config["worker_class"]
     cmd = [
         "gunicorn",
         "--bind", bind_address,
-        "--workers", str(workers),
-        "--worker-class", "sync",
-        "--worker-connections", "1000",
+        "--workers", str(config["workers"]),
+        "--worker-class", "uvicorn.workers.UvicornWorker" if worker_class == "uvicorn" else worker_class,
+    ]
+    
+    # --threads only means something to gthread, --worker-connections only to async workers
+    if worker_class == "gthread":
+        cmd += ["--threads", str(config["threads"])]
+    if config["worker_connections"]:
+        cmd += ["--worker-connections", str(config["worker_connections"])]
+    if config["preload"]:
+        cmd.append("--preload")
+    
+    cmd += [
         "--max-requests", "1000",
         "--max-requests-jitter", "100",
-        "--timeout", "120",
-        "--keep-alive", "2",
+        "--timeout", os.getenv("GUNICORN_TIMEOUT", "120"),
+        "--keep-alive", os.getenv("GUNICORN_KEEPALIVE", "2"),
         "--access-logfile", "-",
         "--error-logfile", "-",
         "--log-level", "info",
-        "wsgi:application"
+        config["app"]
     ]
+    return cmd
+
+def start_gunicorn(config=None, dry_run=False):
+    """Start the application with Gunicorn."""
+    print("🚀 Starting Star Wars RPG Character Manager with Gunicorn...")
+    
+    config = config or plan_gunicorn_config()
+    port = int(os.getenv("PORT", "8000"))
+    bind_address = f"0.0.0.0:{port}"
+    cmd = build_gunicorn_command(config, bind_address)
+    
+    # Split bcrypt threads across worker processes instead of giving each one a thread per CPU
+    env = os.environ.copy()
+    env.setdefault("PASSWORD_HASH_WORKERS", str(max(1, config["cpus"] // config["workers"])))
     
-    print(f"🌐 Starting Gunicorn on {bind_address} with {workers} workers")
+    print(f"🖥️  Detected {config['cpus']} CPUs, {config['memory_mb']} MB memory")
+    print(f"🌐 Starting Gunicorn on {bind_address} with {config['workers']} {config['worker_class']} workers"
+          f" x {config['threads']} threads ({config['profile']} profile, preload {'on' if config['preload'] else 'off'})")
     print(f"📝 Command: {' '.join(cmd)}")
     
+    if dry_run:
+        return
+    
     try:
-        subprocess.run(cmd, check=True)
+        subprocess.run(cmd, check=True, env=env)
     except subprocess.CalledProcessError as e:
         print(f"❌ Gunicorn failed to start: {e}")
         sys.exit(1)
@@ -211,11 +362,38 @@ def start_gunicorn():
         print("🛑 Shutting down...")
         sys.exit(0)
 
+def parse_args():
+    """Command line overrides for the Gunicorn worker model."""
+    parser = argparse.ArgumentParser(description="Start the character manager in production mode")
+    parser.add_argument("--worker-class", choices=sorted(WORKER_CLASSES),
+                        help="Gunicorn worker class (default: $GUNICORN_WORKER_CLASS or gthread)")
+    parser.add_argument("--profile", choices=sorted(WORKER_PROFILES),
+                        help="Sizing profile (default: $GUNICORN_PROFILE or throughput)")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: sized from CPUs and memory)")
+    parser.add_argument("--threads", type=int, help="Threads per gthread worker (default: from profile)")
+    parser.add_argument("--preload", dest="preload", action="store_true", default=None,
+                        help="Load the app in the master so workers share reference data (default)")
+    parser.add_argument("--no-preload", dest="preload", action="store_false", help="Load the app in each worker")
+    parser.add_argument("--print-config", action="store_true",
+                        help="Print the Gunicorn command for this machine and exit")
+    return parser.parse_args()
+
 def main():
     """Main startup sequence."""
     print("🌟 Star Wars RPG Character Manager - Production Startup")
     print("=" * 60)
     
+    args = parse_args()
+    try:
+        config = plan_gunicorn_config(args.worker_class, args.profile, args.workers, args.threads, args.preload)
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    
+    if args.print_config:
+        start_gunicorn(config, dry_run=True)
+        return
+    
     # Step 1: Ensure encryption key exists BEFORE any imports that use security module
     if not ensure_encryption_key():
         print("❌ Encryption key setup failed")
@@ -236,7 +414,7 @@ def main():
     print("   Access at: http://localhost:8000")
     print("=" * 60)
     
-    start_gunicorn()
+    start_gunicorn(config)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,108 @@
+"""Shared fixtures for the unit tests: an in-memory MongoDB (mongomock)."""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+import mongomock
+import mongomock.collection
+import pytest
+from pymongo.results import BulkWriteResult
+
+
+def _apply_bulk_write(self, requests, ordered=True, **kwargs):
+    """bulk_write for mongomock, which can't take pymongo 4.9+ operation objects.
+
+    Applies each UpdateOne in turn and returns a result with the same counters.
+    """
+    matched = modified = upserted = 0
+    upserted_ids = []
+    for request in requests:
+        result = self.update_one(request._filter, request._doc, upsert=request._upsert)
+        matched += result.matched_count
+        modified += result.modified_count
+        if result.upserted_id is not None:
+            upserted += 1
+            upserted_ids.append({"index": len(upserted_ids), "_id": result.upserted_id})
+    return BulkWriteResult({
+        "nInserted": 0, "nUpserted": upserted, "nMatched": matched, "nModified": modified,
+        "nRemoved": 0, "upserted": upserted_ids
+    }, acknowledged=True)
+
+
+@pytest.fixture
+def mongo_db(monkeypatch):
+    """A fresh in-memory database."""
+    monkeypatch.setattr(mongomock.collection.Collection, "bulk_write", _apply_bulk_write)
+    return mongomock.MongoClient().swrpg_test
+
+
+@pytest.fixture
+def manager(mongo_db):
+    """A MongoDBManager bound to the in-memory database."""
+    from swrpg_character_manager.database import MongoDBManager
+
+    manager = MongoDBManager()
+    manager.db = mongo_db
+    for name in MongoDBManager.COLLECTIONS:
+        setattr(manager, name, mongo_db[name])
+    return manager
+
+
+@pytest.fixture
+def client(mongo_db, monkeypatch):
+    """A Flask test client for web/app_with_auth.py backed by the in-memory database.
+
+    login(user_id) signs the client in through the session.
+    """
+    monkeypatch.setenv('FLASK_SECRET_KEY', 'unit-test-flask-secret-0123456789abcdef')
+    monkeypatch.setenv('JWT_SECRET_KEY', 'unit-test-jwt-secret-0123456789abcdefghij')
+    sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'web'))
+    import app_with_auth
+    from swrpg_character_manager.database import db_manager
+
+    # Skip the first-request connect; the collections below stand in for it
+    monkeypatch.setattr(app_with_auth.initialize_database, '_called', True, raising=False)
+    for name in db_manager.COLLECTIONS:
+        monkeypatch.setattr(db_manager, name, mongo_db[name])
+    for cache in (db_manager.user_cache, db_manager.token_version_cache, db_manager.dashboard_cache):
+        cache.clear()
+
+    test_client = app_with_auth.app.test_client()
+
+    def login(user_id):
+        with test_client.session_transaction() as session:
+            session['user_id'] = str(user_id)
+            session['authenticated'] = True
+
+    test_client.login = login
+    return test_client
+
+
+@pytest.fixture
+def make_record():
+    """Build a serialized character record (CharacterDatabase._character_to_dict shape)."""
+    def make_record(name, total_xp=100, career="Smuggler", species="Human"):
+        return {
+            "name": name,
+            "player_name": "Tester",
+            "species": species,
+            "career": {
+                "name": career,
+                "game_line": "Edge of the Empire",
+                "career_skills": ["Piloting (Space)"],
+                "starting_wound_threshold": 10,
+                "starting_strain_threshold": 10
+            },
+            "specializations": [],
+            "characteristics": {"brawn": 2, "agility": 3, "intellect": 2,
+                                "cunning": 2, "willpower": 2, "presence": 2},
+            "derived_attributes": {"wound_threshold": 12, "strain_threshold": 12},
+            "experience": {"total_xp": total_xp, "available_xp": total_xp, "spent_xp": 0},
+            "skills": {"Piloting (Space)": {"name": "Piloting (Space)", "characteristic": "Agility",
+                                            "career_skill": True, "ranks": 1}},
+            "talents": [],
+            "equipment": {"credits": 500, "items": []},
+            "background": {"motivation": "", "background": ""}
+        }
+    return make_record
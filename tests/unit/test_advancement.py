@@ -0,0 +1,83 @@
+"""Tests for the guarded XP spends behind the advancement routes."""
+
+import pytest
+
+from swrpg_character_manager.database import Character, User, db_manager
+
+
+@pytest.fixture
+def player(client):
+    """A signed-in player's id."""
+    user_id = db_manager.create_user(User(email="kira@example.com", username="kira"))
+    client.login(user_id)
+    return user_id
+
+
+def _create_character(user_id, available_xp, **fields):
+    return db_manager.create_character(Character(
+        user_id=user_id, name="Kira", available_xp=available_xp, total_xp=available_xp,
+        brawn=2, skills={"Piloting (Space)": {"rank": 1}}, **fields
+    ))
+
+
+def test_advance_characteristic_spends_xp(client, player):
+    character_id = _create_character(player, available_xp=50)
+
+    response = client.post(f"/api/characters/{character_id}/advance-characteristic",
+                           json={"characteristic_name": "brawn"})
+
+    assert response.status_code == 200
+    assert response.get_json()["new_value"] == 3
+    character = db_manager.get_character_by_id(character_id)
+    assert (character.brawn, character.available_xp, character.spent_xp) == (3, 20, 30)
+
+
+def test_advance_skill_spends_xp(client, player):
+    character_id = _create_character(player, available_xp=10)
+
+    response = client.post(f"/api/characters/{character_id}/advance-skill",
+                           json={"skill_name": "Piloting (Space)"})
+
+    assert response.status_code == 200
+    assert response.get_json()["available_xp"] == 0
+    assert db_manager.get_character_by_id(character_id).skills["Piloting (Space)"]["rank"] == 2
+
+
+def test_insufficient_xp_leaves_character_untouched(client, player):
+    character_id = _create_character(player, available_xp=20)
+
+    response = client.post(f"/api/characters/{character_id}/advance-characteristic",
+                           json={"characteristic_name": "brawn"})
+
+    assert response.status_code == 400
+    assert "Insufficient XP" in response.get_json()["error"]
+    character = db_manager.get_character_by_id(character_id)
+    assert (character.brawn, character.available_xp) == (2, 20)
+
+
+def test_lost_race_returns_conflict(client, player, monkeypatch):
+    character_id = _create_character(player, available_xp=20)
+    spend = db_manager._spend_xp_atomically
+
+    def spend_then_concurrent_award(*args, **kwargs):
+        result = spend(*args, **kwargs)  # guard fails: 20 XP < 30
+        db_manager.award_character_xp(character_id, 100)  # another request lands in between
+        return result
+
+    monkeypatch.setattr(db_manager, "_spend_xp_atomically", spend_then_concurrent_award)
+    response = client.post(f"/api/characters/{character_id}/advance-characteristic",
+                           json={"characteristic_name": "brawn"})
+
+    assert response.status_code == 409
+    assert db_manager.get_character_by_id(character_id).brawn == 2
+
+
+def test_other_players_character_is_denied(client, player):
+    owner_id = db_manager.create_user(User(email="dash@example.com", username="dash"))
+    character_id = _create_character(owner_id, available_xp=100)
+
+    response = client.post(f"/api/characters/{character_id}/advance-characteristic",
+                           json={"characteristic_name": "brawn"})
+
+    assert response.status_code == 403
+    assert db_manager.get_character_by_id(character_id).available_xp == 100
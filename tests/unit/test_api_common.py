@@ -0,0 +1,71 @@
+"""Tests for the request-independent API helpers shared by Flask and ASGI."""
+
+import pytest
+from bson import ObjectId
+
+from swrpg_character_manager import api_common
+
+
+@pytest.mark.parametrize("limit, after, message", [
+    ("abc", None, "limit must be an integer"),
+    ("0", None, "limit must be between"),
+    (str(api_common.MAX_PAGE_SIZE + 1), None, "limit must be between"),
+    (None, "nope", "Invalid after cursor"),
+])
+def test_parse_page_args_rejects(limit, after, message):
+    with pytest.raises(ValueError, match=message):
+        api_common.parse_page_args(limit, after)
+
+
+def test_parse_page_args_defaults_and_cursor():
+    cursor = ObjectId()
+    assert api_common.parse_page_args(None, None, default_limit=50) == (50, None)
+    assert api_common.parse_page_args("10", str(cursor)) == (10, cursor)
+
+
+@pytest.mark.parametrize("format_param, accept, expected", [
+    ("ndjson", None, True),
+    (None, "application/x-ndjson", True),
+    (None, "application/json;q=0.9, application/x-ndjson", True),
+    (None, "application/json", False),
+    (None, None, False),
+])
+def test_wants_ndjson(format_param, accept, expected):
+    assert api_common.wants_ndjson(format_param, accept) is expected
+
+
+def test_build_page_sets_next_only_when_more_records_exist():
+    items = [{"id": str(n)} for n in range(3)]
+    assert api_common.build_page("things", items, 2) == {"things": items[:2], "total": 2, "next": "1"}
+    assert api_common.build_page("things", items, 3)["next"] is None
+    assert api_common.build_page("things", items, None)["total"] == 3
+
+
+@pytest.mark.parametrize("amount, valid", [(10, True), (0, False), (-1, False), (True, False), ("5", False), (1.5, False)])
+def test_is_positive_xp(amount, valid):
+    assert api_common.is_positive_xp(amount) is valid
+
+
+def test_character_updates_keeps_only_whitelisted_fields():
+    assert api_common.character_updates({"name": "Kira", "user_id": "x", "total_xp": 9000}) == {"name": "Kira"}
+    with pytest.raises(ValueError):
+        api_common.character_updates({"total_xp": 9000})
+    with pytest.raises(ValueError):
+        api_common.character_updates(None)
+
+
+def test_new_campaign_validates_and_defaults():
+    gm_id = ObjectId()
+    campaign = api_common.new_campaign({"name": "  Outer Rim ", "game_system": "Edge of the Empire"}, gm_id)
+    assert (campaign.name, campaign.game_master_id, campaign.settings["max_players"]) == ("Outer Rim", gm_id, 4)
+    with pytest.raises(ValueError, match="name"):
+        api_common.new_campaign({"name": " ", "game_system": "x"}, gm_id)
+    with pytest.raises(ValueError, match="Game system"):
+        api_common.new_campaign({"name": "Outer Rim"}, gm_id)
+
+
+def test_token_version_current():
+    assert api_common.token_version_current({"ver": 2}, 2)
+    assert not api_common.token_version_current({"ver": 1}, 2)
+    assert not api_common.token_version_current({"ver": 2}, None)
+    assert api_common.token_version_current({}, 0)  # issued before versioning
@@ -0,0 +1,36 @@
+"""Tests for the Flask API routes in web/app_with_auth.py."""
+
+import pytest
+
+from swrpg_character_manager.database import Campaign, User, db_manager
+
+
+@pytest.fixture
+def gm_campaign(client):
+    """A game master signed in to the client, and their campaign's id."""
+    gm_id = db_manager.create_user(User(email="gm@example.com", username="gm", role="player"))
+    campaign_id = db_manager.create_campaign(Campaign(name="Outer Rim", game_master_id=gm_id))
+    client.login(gm_id)
+    return campaign_id
+
+
+@pytest.mark.parametrize("kwargs", [
+    {},
+    {"data": "not json", "content_type": "text/plain"},
+    {"json": [10]},
+])
+def test_award_campaign_xp_rejects_missing_or_non_object_body(client, gm_campaign, kwargs):
+    response = client.post(f"/api/campaigns/{gm_campaign}/award-xp", **kwargs)
+    assert response.status_code == 400
+
+
+def test_award_campaign_xp_rejects_non_object_awards(client, gm_campaign):
+    response = client.post(f"/api/campaigns/{gm_campaign}/award-xp", json={"awards": [10, 20]})
+    assert response.status_code == 400
+    assert "awards" in response.get_json()["error"]
+
+
+@pytest.mark.parametrize("query, status", [("limit=abc", 400), ("limit=0", 400), ("limit=2", 200), ("", 200)])
+def test_listing_limit_must_be_a_valid_integer(client, gm_campaign, query, status):
+    response = client.get(f"/api/campaigns?{query}")
+    assert response.status_code == status
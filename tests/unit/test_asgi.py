@@ -0,0 +1,192 @@
+"""Tests for the native async routes in asgi.py."""
+
+import asyncio
+import json
+import os
+
+import pytest
+
+from swrpg_character_manager.async_database import async_db_manager
+from swrpg_character_manager.database import Character, User, db_manager
+
+ROOT = os.path.join(os.path.dirname(__file__), '..', '..')
+
+
+class AsyncCursor:
+    """Async-iterable facade over a mongomock cursor."""
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def sort(self, *args, **kwargs):
+        self._cursor = self._cursor.sort(*args, **kwargs)
+        return self
+
+    def limit(self, limit):
+        self._cursor = self._cursor.limit(limit)
+        return self
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self._cursor)
+        except StopIteration:
+            raise StopAsyncIteration
+
+
+class AsyncCollection:
+    """Awaitable facade over a mongomock collection, standing in for AsyncMongoClient's."""
+
+    def __init__(self, collection):
+        self._collection = collection
+
+    def find(self, *args, **kwargs):
+        return AsyncCursor(self._collection.find(*args, **kwargs))
+
+    def __getattr__(self, name):
+        method = getattr(self._collection, name)
+
+        async def call(*args, **kwargs):
+            return method(*args, **kwargs)
+        return call
+
+
+@pytest.fixture
+def asgi(client, mongo_db, monkeypatch):
+    """The asgi module, its async manager bound to the in-memory database.
+
+    Importing asgi changes into web/; the cwd is restored after.
+    """
+    monkeypatch.chdir(os.getcwd())
+    monkeypatch.syspath_prepend(ROOT)
+    import asgi
+
+    monkeypatch.setattr(async_db_manager, 'client', object())  # skip ensure_connected
+    for name in ('users', 'campaigns', 'characters', 'stats_counters'):
+        monkeypatch.setattr(async_db_manager, name, AsyncCollection(mongo_db[name]))
+    return asgi
+
+
+def call(asgi, method, path, headers=None, body=None, query_string=b''):
+    """Run one HTTP request through the ASGI app; returns (status, body bytes, sent messages)."""
+    payload = json.dumps(body).encode() if body is not None else b''
+    scope = {
+        'type': 'http', 'method': method, 'path': path, 'query_string': query_string,
+        'headers': [(name.lower().encode(), value.encode()) for name, value in (headers or {}).items()]
+    }
+    messages = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': payload, 'more_body': False}
+
+    async def send(message):
+        messages.append(message)
+
+    asyncio.run(asgi.application(scope, receive, send))
+    body = b''.join(message.get('body', b'') for message in messages if message['type'] == 'http.response.body')
+    return messages[0]['status'], body, messages
+
+
+def bearer(user_id):
+    """Authorization header with a fresh access token for the user."""
+    from app_with_auth import app
+    from swrpg_character_manager.auth import auth_manager
+
+    with app.app_context():
+        token = auth_manager.create_access_token(db_manager.get_user_by_id(user_id))
+    return {'Authorization': f'Bearer {token}'}
+
+
+@pytest.fixture
+def player():
+    return db_manager.create_user(User(email="kira@example.com", username="kira"))
+
+
+def test_sync_revocation_rejects_token_on_native_routes(asgi, player):
+    headers = bearer(player)
+    assert call(asgi, 'GET', '/api/characters', headers)[0] == 200  # caches the auth state
+
+    # Password change through the sync manager (a Flask route) bumps token_version
+    db_manager.update_user(player, {'password_hash': 'new-hash'})
+
+    assert call(asgi, 'GET', '/api/characters', headers)[0] == 401
+
+
+def _request(asgi, query_string):
+    return asgi.Request({'method': 'GET', 'path': '/api/characters', 'query_string': query_string}, None)
+
+
+@pytest.mark.parametrize("query_string", [b"limit=abc", b"limit=0", b"after=not-an-id"])
+def test_get_page_args_rejects_invalid_arguments(asgi, query_string):
+    with pytest.raises(asgi.HTTPError) as error:
+        asgi.get_page_args(_request(asgi, query_string))
+    assert error.value.status == 400
+
+
+def test_get_page_args_parses_limit_and_cursor(asgi):
+    after = "64b7f0c2a1b2c3d4e5f60718"
+    limit, cursor = asgi.get_page_args(_request(asgi, f"limit=25&after={after}".encode()))
+    assert limit == 25 and str(cursor) == after
+
+
+@pytest.mark.parametrize("xp_amount", [True, False, 0, -5, "10", 2.5])
+def test_award_xp_rejects_non_integer_amounts(asgi, player, xp_amount):
+    character_id = db_manager.create_character(Character(user_id=player, name="Kira"))
+    before = db_manager.get_character_by_id(character_id).total_xp
+
+    status, _, _ = call(asgi, 'POST', f'/api/characters/{character_id}/award-xp', bearer(player),
+                        body={'xp_amount': xp_amount})
+
+    assert status == 400
+    assert db_manager.get_character_by_id(character_id).total_xp == before
+
+
+def test_award_xp_awards_integer_amount(asgi, player):
+    character_id = db_manager.create_character(Character(user_id=player, name="Kira"))
+    before = db_manager.get_character_by_id(character_id).total_xp
+
+    status, body, _ = call(asgi, 'POST', f'/api/characters/{character_id}/award-xp', bearer(player),
+                           body={'xp_amount': 10})
+
+    assert status == 200
+    assert json.loads(body)['total_xp'] == before + 10
+
+
+def test_ndjson_failure_mid_stream_ends_body_without_second_response(asgi, player, monkeypatch):
+    for name in ("Kira", "Dash"):
+        db_manager.create_character(Character(user_id=player, name=name))
+
+    async def failing_summaries(user_id, after=None, limit=None):
+        async for summary in iter_summaries(user_id, after=after, limit=limit):
+            yield summary
+        raise RuntimeError("cursor killed")
+
+    iter_summaries = async_db_manager.iter_user_character_summaries
+    monkeypatch.setattr(async_db_manager, 'iter_user_character_summaries', failing_summaries)
+    status, body, messages = call(asgi, 'GET', '/api/characters', bearer(player), query_string=b'format=ndjson')
+
+    assert status == 200
+    assert [message['type'] for message in messages].count('http.response.start') == 1
+    assert messages[-1].get('more_body', False) is False
+    lines = [json.loads(line) for line in body.decode().splitlines()]
+    assert [line.get('name') for line in lines[:2]] == ["Kira", "Dash"]
+    assert lines[-1] == {'error': 'Stream interrupted'}
+
+
+@pytest.mark.parametrize("path", ["/api/characters?limit=1", "/api/campaigns"])
+def test_native_and_flask_listings_match(asgi, client, player, path):
+    from swrpg_character_manager.database import Campaign
+
+    for name in ("Kira", "Dash"):
+        db_manager.create_character(Character(user_id=player, name=name))
+    db_manager.create_campaign(Campaign(name="Outer Rim", game_master_id=player))
+    headers = bearer(player)
+    route, _, query = path.partition('?')
+
+    status, body, _ = call(asgi, 'GET', route, headers, query_string=query.encode())
+    flask_response = client.get(path, headers=headers)
+
+    assert status == flask_response.status_code == 200
+    assert json.loads(body) == flask_response.get_json()
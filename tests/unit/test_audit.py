@@ -0,0 +1,52 @@
+"""Tests for the buffered audit pipeline."""
+
+import threading
+
+import pytest
+
+from swrpg_character_manager.audit import AuditPipeline, AuditSink
+
+
+class ListSink(AuditSink):
+    def __init__(self):
+        self.events = []
+
+    def write_batch(self, events):
+        self.events.extend(events)
+
+
+def test_counters_add_up_under_concurrent_emit():
+    sink = ListSink()
+    pipeline = AuditPipeline([sink], capacity=100000, batch_size=1000, flush_interval=60,
+                             sample_rates={"sampled": 0.5})
+
+    def emit_many(n):
+        for i in range(2000):
+            pipeline.emit("sampled" if i % 2 else "kept", {"n": n, "i": i})
+
+    threads = [threading.Thread(target=emit_many, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    pipeline.flush()
+
+    metrics = pipeline.metrics()
+    assert metrics["enqueued"] + metrics["sampled_out"] == 16000
+    assert metrics["written"] == metrics["enqueued"] == len(sink.events)
+    assert metrics["dropped"] == 0
+
+
+def test_full_buffer_counts_dropped_events():
+    pipeline = AuditPipeline([ListSink()], capacity=10, flush_interval=60)
+    for i in range(15):
+        pipeline.emit("kept", {"i": i})
+    assert pipeline.metrics()["dropped"] == 5
+
+
+def test_sink_without_write_batch_cannot_be_instantiated():
+    class SilentSink(AuditSink):
+        pass
+
+    with pytest.raises(TypeError, match="write_batch"):
+        SilentSink()
@@ -0,0 +1,138 @@
+"""Tests for MongoDBManager against an in-memory MongoDB (mongomock)."""
+
+from datetime import datetime, timedelta, timezone
+
+from bson import ObjectId
+
+from swrpg_character_manager import database
+from swrpg_character_manager.database import Campaign, Character, User
+
+
+def _create_users(manager):
+    specs = [
+        ("luke", "player", True, {"google_id": "g-1"}),
+        ("leia", "admin", True, {}),
+        ("han", "player", False, {"discord_id": "d-1"}),
+        ("lando", "game_master", True, {}),
+        ("chewie", "player", True, {}),
+    ]
+    for username, role, is_active, social in specs:
+        manager.create_user(User(email=f"{username}@example.com", username=username,
+                                 role=role, is_active=is_active, **social))
+
+
+def _usernames(users):
+    return [user.username for user in users]
+
+
+def test_iter_users_filters(manager):
+    _create_users(manager)
+
+    assert _usernames(manager.iter_users(role="player")) == ["luke", "han", "chewie"]
+    assert _usernames(manager.iter_users(role="player", is_active=True)) == ["luke", "chewie"]
+    assert _usernames(manager.iter_users(provider="google")) == ["luke"]
+    assert _usernames(manager.iter_users(provider="discord")) == ["han"]
+    assert _usernames(manager.iter_users(provider="local")) == ["leia", "lando", "chewie"]
+
+
+def test_iter_users_decrypts_in_batches(manager, monkeypatch):
+    monkeypatch.setattr(database, "USER_LISTING_BATCH_SIZE", 2)
+    _create_users(manager)
+    batches = []
+    decrypt_many = database.data_encryption.decrypt_many
+    monkeypatch.setattr(database.data_encryption, "decrypt_many",
+                        lambda emails: batches.append(list(emails)) or decrypt_many(batches[-1]))
+
+    users = manager.iter_users()
+    first = next(users)
+    assert first.email == "luke@example.com"
+    assert len(batches) == 1  # only the first batch was fetched so far
+
+    rest = list(users)
+    assert [user.email for user in rest][-1] == "chewie@example.com"
+    assert [len(batch) for batch in batches] == [2, 2, 1]
+
+
+def test_iter_users_resumes_after_cursor(manager):
+    _create_users(manager)
+    first_page = list(manager.iter_users(limit=2))
+    second_page = list(manager.iter_users(after=first_page[-1]._id, limit=2))
+    assert _usernames(first_page + second_page) == ["luke", "leia", "han", "lando"]
+
+
+def _dashboard_character(manager, campaign_id):
+    characters = manager.get_campaign_dashboard(campaign_id)["characters"]
+    return characters[0] if characters else None
+
+
+def test_token_version_ignores_the_longer_lived_user_cache(manager):
+    user_id = manager.create_user(User(email="luke@example.com", username="luke"))
+    assert manager.get_cached_user(user_id).token_version == 0
+
+    # Revoked by another worker: only its own caches were invalidated
+    manager.users.update_one({"_id": user_id}, {"$inc": {"token_version": 1}})
+    assert manager.get_user_token_version(user_id) == 1
+
+    manager.users.update_one({"_id": user_id}, {"$set": {"is_active": False}})
+    manager.token_version_cache.clear()  # its TTL ran out
+    assert manager.get_user_token_version(user_id) is None
+
+
+def test_character_writes_invalidate_campaign_dashboard(manager):
+    gm_id = manager.create_user(User(email="gm@example.com", username="gm"))
+    campaign_id = manager.create_campaign(Campaign(name="Outer Rim", game_master_id=gm_id))
+    character_id = manager.create_character(Character(user_id=gm_id, campaign_id=campaign_id, name="Kira"))
+    assert _dashboard_character(manager, campaign_id)["name"] == "Kira"
+
+    manager.update_character(character_id, {"name": "Kira Vex"})
+    assert _dashboard_character(manager, campaign_id)["name"] == "Kira Vex"
+
+    starting_xp = _dashboard_character(manager, campaign_id)["available_xp"]
+    award = manager.award_character_xp(character_id, 25)
+    assert "campaign_id" not in award
+    assert _dashboard_character(manager, campaign_id)["available_xp"] == starting_xp + 25
+
+    manager.deactivate_character(character_id)
+    assert _dashboard_character(manager, campaign_id) is None
+
+
+def test_async_manager_shares_the_dashboard_cache():
+    from swrpg_character_manager.async_database import async_db_manager
+    from swrpg_character_manager.database import db_manager
+
+    assert async_db_manager.dashboard_cache is db_manager.dashboard_cache
+
+
+def test_admin_stats_count_active_sessions_between_reconciliations(manager):
+    manager.get_admin_stats()  # first call reconciles
+    reconciled_at = manager.stats_counters.find_one({"_id": database.STATS_COUNTERS_ID})["reconciled_at"]
+    now = datetime.now(timezone.utc)
+    manager.record_session(ObjectId(), now + timedelta(hours=1))
+    manager.record_session(ObjectId(), now - timedelta(minutes=1))  # expired, not yet removed by TTL
+    manager.stats_cache.clear()
+
+    stats = manager.get_admin_stats()
+
+    assert stats["active_sessions"] == 1
+    assert manager.stats_counters.find_one({"_id": database.STATS_COUNTERS_ID})["reconciled_at"] == reconciled_at
+
+
+def test_failed_reconciliation_releases_its_claim(manager, monkeypatch):
+    manager.create_user(User(email="luke@example.com", username="luke"))
+    manager.reconcile_stats()
+    stale = datetime.now(timezone.utc) - timedelta(seconds=manager.stats_reconcile_interval + 60)
+    manager.stats_counters.update_one({"_id": database.STATS_COUNTERS_ID}, {"$set": {"reconciled_at": stale}})
+    stored_stale = manager.stats_counters.find_one({"_id": database.STATS_COUNTERS_ID})["reconciled_at"]
+
+    def fail():
+        raise RuntimeError("aggregation timed out")
+
+    monkeypatch.setattr(manager, "reconcile_stats", fail)
+    stats = manager.get_admin_stats()
+
+    assert stats["total_users"] == 1  # stale counters are still served
+    assert manager.stats_counters.find_one({"_id": database.STATS_COUNTERS_ID})["reconciled_at"] == stored_stale
+
+    monkeypatch.undo()
+    manager.stats_cache.clear()
+    assert manager.get_admin_stats()["reconciled_at"] != stats["reconciled_at"]
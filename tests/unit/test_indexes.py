@@ -0,0 +1,65 @@
+"""Tests for the versioned index manifest and its build lease."""
+
+from datetime import datetime, timedelta, timezone
+
+from swrpg_character_manager.indexes import BUILD_LEASE_ID, META_COLLECTION, IndexManager, manifest_version
+
+
+def _hold_lease(mongo_db, expires_in):
+    mongo_db[META_COLLECTION].insert_one({
+        "_id": BUILD_LEASE_ID,
+        "owner": "other-host:1",
+        "expires_at": datetime.now(timezone.utc) + timedelta(seconds=expires_in)
+    })
+
+
+def test_build_records_version_then_is_current(mongo_db):
+    manager = IndexManager(mongo_db)
+
+    assert manager.ensure_indexes() == "built"
+    assert manager.stored_version() == manifest_version()
+    assert manager.ensure_indexes() == "current"
+    assert mongo_db[META_COLLECTION].find_one({"_id": BUILD_LEASE_ID}) is None
+
+
+def test_held_lease_makes_other_builders_busy(mongo_db):
+    _hold_lease(mongo_db, expires_in=600)
+    manager = IndexManager(mongo_db)
+
+    assert manager.ensure_indexes() == "busy"
+    assert manager.stored_version() is None
+    # The holder's lease is left alone
+    assert mongo_db[META_COLLECTION].find_one({"_id": BUILD_LEASE_ID})["owner"] == "other-host:1"
+
+
+def test_expired_lease_is_taken_over(mongo_db):
+    _hold_lease(mongo_db, expires_in=-1)
+
+    assert IndexManager(mongo_db).ensure_indexes() == "built"
+
+
+def test_failed_index_leaves_version_unset(mongo_db):
+    # Duplicate usernames make the unique username index impossible to build
+    mongo_db.users.insert_many([{"username": "kira"}, {"username": "kira"}])
+    manager = IndexManager(mongo_db)
+
+    assert manager.ensure_indexes() == "failed"
+    assert manager.stored_version() is None
+    assert mongo_db[META_COLLECTION].find_one({"_id": BUILD_LEASE_ID}) is None
+
+    # Fixed data: the next start retries and records the version
+    mongo_db.users.delete_one({"username": "kira"})
+    assert manager.ensure_indexes() == "built"
+
+
+def test_retired_indexes_are_dropped_only_after_a_successful_build(mongo_db):
+    mongo_db.characters.create_index("user_id", name="user_id_1")
+    mongo_db.users.insert_many([{"username": "kira"}, {"username": "kira"}])
+    manager = IndexManager(mongo_db)
+
+    assert manager.ensure_indexes() == "failed"
+    assert "user_id_1" in mongo_db.characters.index_information()
+
+    mongo_db.users.delete_one({"username": "kira"})
+    assert manager.ensure_indexes() == "built"
+    assert "user_id_1" not in mongo_db.characters.index_information()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""Unit tests for the bulk migration engine (run against mongomock)."""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+import pytest
+
+from swrpg_character_manager.migrations import MigrationCheckpoint, MigrationRunner
+
+
+def add_flag(doc):
+    return {"$set": {"migrated": True}}
+
+
+def interrupt_on_third(doc):
+    if doc["n"] == 2:
+        raise KeyboardInterrupt
+    return {"$set": {"migrated": True}}
+
+
+def record_to_upsert(record):
+    return {"name": record["name"]}, {"$set": record}
+
+
+@pytest.fixture
+def collection(mongo_db):
+    coll = mongo_db.things
+    coll.insert_many([{"n": i} for i in range(5)])
+    return coll
+
+
+def test_dry_run_leaves_no_checkpoint(collection, tmp_path):
+    checkpoint = tmp_path / "dry.checkpoint"
+    runner = MigrationRunner(collection, batch_size=2, workers=1, dry_run=True,
+                             checkpoint_path=str(checkpoint), progress_interval=0)
+
+    with pytest.raises(KeyboardInterrupt):
+        runner.migrate_collection(interrupt_on_third)
+
+    assert not checkpoint.exists()
+    assert collection.count_documents({"migrated": True}) == 0
+
+
+def test_dry_run_ignores_existing_checkpoint(collection, tmp_path):
+    checkpoint = tmp_path / "real.checkpoint"
+    MigrationCheckpoint(str(checkpoint)).save({"position": 3})
+    runner = MigrationRunner(collection, batch_size=2, workers=1, dry_run=True,
+                             checkpoint_path=str(checkpoint), progress_interval=0)
+
+    stats = runner.import_records([{"name": f"r{i}"} for i in range(5)], record_to_upsert)
+
+    assert stats.read == 5
+    assert checkpoint.exists()  # Left for the real run to resume from
+
+
+def test_interrupted_run_resumes_after_checkpoint(collection, tmp_path):
+    checkpoint = tmp_path / "run.checkpoint"
+    runner = MigrationRunner(collection, batch_size=2, workers=1,
+                             checkpoint_path=str(checkpoint), progress_interval=0)
+
+    with pytest.raises(KeyboardInterrupt):
+        runner.migrate_collection(interrupt_on_third)
+    assert MigrationCheckpoint(str(checkpoint)).load()["last_id"] == collection.find_one({"n": 1})["_id"]
+
+    stats = runner.migrate_collection(add_flag)
+
+    assert stats.read == 3
+    assert collection.count_documents({"migrated": True}) == 5
+    assert not checkpoint.exists()
+
+
+@pytest.fixture
+def migrate_characters(mongo_db, monkeypatch):
+    """tools/admin_tools/migrate_characters.py against the in-memory database."""
+    from swrpg_character_manager.database import db_manager
+
+    monkeypatch.syspath_prepend(os.path.join(os.path.dirname(__file__), '..', '..', 'tools', 'admin_tools'))
+    import migrate_characters
+
+    for name in db_manager.COLLECTIONS:
+        monkeypatch.setattr(db_manager, name, mongo_db[name])
+    monkeypatch.setattr(db_manager, "connect", lambda: True)
+    monkeypatch.setattr(db_manager, "disconnect", lambda: None)
+    db_manager.stats_cache.clear()
+    return migrate_characters
+
+
+@pytest.mark.parametrize("dry_run, expected_total", [(False, 3), (True, 0)])
+def test_character_file_import_reconciles_dashboard_stats(migrate_characters, make_record, mongo_db,
+                                                          tmp_path, monkeypatch, dry_run, expected_total):
+    import json
+    from swrpg_character_manager.database import User, db_manager
+
+    characters_file = tmp_path / "characters.json"
+    characters_file.write_text(json.dumps({name: make_record(name) for name in ("Kira", "Dash", "Lando")}))
+    monkeypatch.setattr(migrate_characters, "CHARACTER_FILES", [str(characters_file)])
+    db_manager.create_user(User(email="admin@example.com", username="admin", role="admin"))
+
+    assert migrate_characters.migrate_character_files(workers=1, dry_run=dry_run,
+                                                      checkpoint_path=str(tmp_path / "import.checkpoint"))
+
+    counters = mongo_db.stats_counters.find_one({"_id": "totals"})
+    assert counters.get("total_characters", 0) == expected_total
+    assert ("reconciled_at" in counters) is not dry_run
@@ -0,0 +1,38 @@
+"""Tests for the bounded password hashing pool."""
+
+import threading
+
+import pytest
+
+from swrpg_character_manager.password_hashing import PasswordHasher, PasswordHashingBusy
+
+
+def test_counters_are_exact_under_concurrent_calls(monkeypatch):
+    hasher = PasswordHasher(workers=4, queue_size=1000)
+    monkeypatch.setattr(hasher, "_hash", lambda password, rounds: "hashed")
+    threads = [threading.Thread(target=lambda: [hasher.hash("pw") for _ in range(200)]) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert hasher.stats()["completed"] == 1600
+
+
+def test_full_queue_rejects_and_counts(monkeypatch):
+    hasher = PasswordHasher(workers=1, queue_size=0)
+    release = threading.Event()
+    monkeypatch.setattr(hasher, "_hash", lambda password, rounds: release.wait(5) and "hashed")
+    busy = threading.Thread(target=hasher.hash, args=("pw",))
+    busy.start()
+    try:
+        while hasher._slots._value:  # wait until the only slot is taken
+            pass
+        with pytest.raises(PasswordHashingBusy):
+            hasher.hash("pw")
+    finally:
+        release.set()
+        busy.join()
+
+    assert hasher.stats()["rejected"] == 1
+    assert hasher.stats()["completed"] == 1
@@ -0,0 +1,56 @@
+"""Tests for CharacterDatabase bulk NDJSON export and import."""
+
+import gzip
+import json
+
+import pytest
+
+from swrpg_character_manager.persistence import GZIP_MAGIC, CharacterDatabase
+
+
+@pytest.fixture
+def database(tmp_path, make_record):
+    database = CharacterDatabase(str(tmp_path / "source"), backend="json")
+    database.storage.put_many((f"Pilot {i}", make_record(f"Pilot {i}", 100 + i)) for i in range(25))
+    return database
+
+
+@pytest.mark.parametrize("workers", [0, 2])
+def test_gzip_export_import_round_trip(tmp_path, database, workers):
+    export_path = tmp_path / "characters.ndjson.gz"
+
+    exported = database.export_all(str(export_path))
+    assert exported["exported"] == 25
+    with open(export_path, "rb") as f:
+        assert f.read(2) == GZIP_MAGIC
+
+    target = CharacterDatabase(str(tmp_path / "target"), backend="sqlite")
+    result = target.import_all(str(export_path), batch_size=10, workers=workers)
+
+    assert (result["imported"], result["skipped"], result["errors"]) == (25, 0, [])
+    assert dict(target.storage.items()) == dict(database.storage.items())
+
+
+def test_plain_export_is_detected_on_import(tmp_path, database):
+    export_path = tmp_path / "characters.ndjson"
+    database.export_all(str(export_path))
+
+    target = CharacterDatabase(str(tmp_path / "target"), backend="json")
+    assert target.import_all(str(export_path), workers=0)["imported"] == 25
+
+
+def test_import_skips_invalid_records_and_reports_lines(tmp_path, database, make_record):
+    export_path = tmp_path / "characters.ndjson.gz"
+    database.export_all(str(export_path), compress=True)
+    broken = make_record("Broken")
+    del broken["experience"]
+    with gzip.open(export_path, "at", encoding="utf-8") as f:
+        f.write("{not json\n")
+        f.write(json.dumps(broken) + "\n")
+
+    target = CharacterDatabase(str(tmp_path / "target"), backend="json")
+    result = target.import_all(str(export_path), workers=0)
+
+    assert (result["imported"], result["skipped"]) == (25, 2)
+    assert [error["line"] for error in result["errors"]] == [26, 27]
+    assert result["errors"][1]["name"] == "Broken"
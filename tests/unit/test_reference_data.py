@@ -0,0 +1,88 @@
+"""Tests for the compiled reference data artifact."""
+
+import os
+
+import pytest
+
+from swrpg_character_manager import character_creator, reference_data
+
+
+@pytest.fixture
+def artifact(tmp_path):
+    path = str(tmp_path / "reference_data.bin")
+    reference_data.compile_reference_data(path)
+    return path
+
+
+def _rewrite_header(path, **fields):
+    with open(path, "rb") as f:
+        raw = f.read()
+    header = dict(zip(("magic", "version", "digest"), reference_data._HEADER.unpack_from(raw)))
+    header.update(fields)
+    with open(path, "wb") as f:
+        f.write(reference_data._HEADER.pack(header["magic"], header["version"], header["digest"]))
+        f.write(raw[reference_data._HEADER.size:])
+
+
+def _flip_last_byte(path):
+    with open(path, "r+b") as f:
+        f.seek(-1, os.SEEK_END)
+        last = f.read(1)
+        f.seek(-1, os.SEEK_END)
+        f.write(bytes([last[0] ^ 0xFF]))
+
+
+def _truncate_header(path):
+    with open(path, "r+b") as f:
+        f.truncate(reference_data._HEADER.size - 1)
+
+
+def _creator_rebuilds(artifact, monkeypatch):
+    """Build a CharacterCreator from artifact; True if it had to parse the sources."""
+    rebuilt = []
+    initialize_careers = character_creator.CharacterCreator._initialize_careers
+    monkeypatch.setattr(character_creator, "load_compiled_reference_data",
+                        lambda: reference_data.load_compiled_reference_data(artifact))
+    monkeypatch.setattr(character_creator.CharacterCreator, "_initialize_careers",
+                        lambda self: rebuilt.append(True) or initialize_careers(self))
+    creator = character_creator.CharacterCreator()
+    assert set(creator.careers) >= {"Bounty Hunter", "Colonist"} and creator.species_data
+    return bool(rebuilt)
+
+
+def test_fresh_artifact_loads(artifact, monkeypatch):
+    payload = reference_data.load_compiled_reference_data(artifact)
+
+    assert payload["species"] == character_creator.CharacterCreator(use_compiled=False).species_data
+    assert set(payload["careers"]) >= {"Bounty Hunter", "Colonist"}
+    assert not _creator_rebuilds(artifact, monkeypatch)
+
+
+@pytest.mark.parametrize("corrupt", [
+    lambda path: _rewrite_header(path, magic=b"NOTSWRPG"),
+    lambda path: _rewrite_header(path, version=reference_data.FORMAT_VERSION + 1),
+    _flip_last_byte,  # checksum mismatch
+    _truncate_header,
+], ids=["bad-magic", "bad-version", "checksum-mismatch", "truncated"])
+def test_invalid_artifact_falls_back_to_a_rebuild(artifact, corrupt, monkeypatch):
+    corrupt(artifact)
+
+    assert reference_data.load_compiled_reference_data(artifact) is None
+    assert _creator_rebuilds(artifact, monkeypatch)
+
+
+def test_changed_source_file_makes_the_artifact_stale(tmp_path, monkeypatch):
+    source = tmp_path / "species.json"
+    source.write_text("{}")
+    monkeypatch.setattr(reference_data, "SOURCE_FILES", reference_data.SOURCE_FILES + [str(source)])
+    artifact = str(tmp_path / "reference_data.bin")
+    reference_data.compile_reference_data(artifact)
+    assert reference_data.load_compiled_reference_data(artifact) is not None
+
+    source.write_text('{"Human": {}}')
+    assert reference_data.load_compiled_reference_data(artifact) is None
+    assert _creator_rebuilds(artifact, monkeypatch)
+
+
+def test_models_module_is_part_of_the_fingerprint():
+    assert os.path.join("src", "swrpg_character_manager", "models.py") in reference_data._source_fingerprint()
@@ -0,0 +1,118 @@
+"""Tests for the precomputed species/careers reference snapshots."""
+
+import gzip
+import json
+from pathlib import Path
+
+import pytest
+from flask import Flask
+
+WEB = Path(__file__).resolve().parents[2] / "web"
+PAYLOAD = {"species": [{"name": "Human", "starting_xp": 110}, {"name": "Twi'lek", "starting_xp": 100}]}
+
+
+@pytest.fixture
+def snapshot_app(monkeypatch):
+    monkeypatch.syspath_prepend(str(WEB))
+    from reference_snapshots import ReferenceSnapshot
+
+    app = Flask(__name__)
+    snapshot = ReferenceSnapshot(PAYLOAD)
+    app.add_url_rule("/species", "species", snapshot.response)
+    return app.test_client(), snapshot
+
+
+def test_etag_is_stable_across_builds(snapshot_app):
+    client, snapshot = snapshot_app
+    first = client.get("/species")
+    second = client.get("/species")
+
+    assert first.headers["ETag"] == second.headers["ETag"]
+    rebuilt = type(snapshot)(json.loads(json.dumps(PAYLOAD)))
+    assert rebuilt.etags == snapshot.etags
+    assert type(snapshot)({"species": []}).etags != snapshot.etags
+
+
+@pytest.mark.parametrize("if_none_match", [
+    '"{etag}"',
+    'W/"{etag}"',
+    '"stale", "{etag}"',
+    '"stale", W/"{etag}"',
+    '*',
+])
+def test_matching_if_none_match_answers_304(snapshot_app, if_none_match):
+    client, _ = snapshot_app
+    etag = client.get("/species").get_etag()[0]
+
+    response = client.get("/species", headers={"If-None-Match": if_none_match.format(etag=etag)})
+
+    assert response.status_code == 304
+    assert response.data == b""
+    assert response.get_etag()[0] == etag
+    assert response.headers["Vary"] == "Accept-Encoding"
+
+
+def test_unknown_etag_gets_the_full_body(snapshot_app):
+    client, _ = snapshot_app
+    response = client.get("/species", headers={"If-None-Match": '"stale", W/"other"'})
+
+    assert response.status_code == 200
+    assert response.get_json() == PAYLOAD
+
+
+@pytest.mark.parametrize("accept_encoding, expected", [
+    (None, "identity"),
+    ("identity", "identity"),
+    ("gzip", "gzip"),
+    ("gzip;q=0, deflate", "identity"),
+    ("deflate, gzip;q=0.5", "gzip"),
+])
+def test_accept_encoding_selects_gzip_or_identity(snapshot_app, accept_encoding, expected):
+    client, snapshot = snapshot_app
+    headers = {"Accept-Encoding": accept_encoding} if accept_encoding else {}
+
+    response = client.get("/species", headers=headers)
+
+    assert response.headers.get("Content-Encoding", "identity") == expected
+    assert response.headers["Vary"] == "Accept-Encoding"
+    assert response.get_etag()[0] == snapshot.variants[expected][1]
+    body = gzip.decompress(response.data) if expected == "gzip" else response.data
+    assert json.loads(body) == PAYLOAD
+
+
+def test_accept_encoding_prefers_br_when_available(snapshot_app):
+    brotli = pytest.importorskip("brotli")
+    client, snapshot = snapshot_app
+
+    response = client.get("/species", headers={"Accept-Encoding": "gzip, br"})
+
+    assert response.headers["Content-Encoding"] == "br"
+    assert response.headers["Vary"] == "Accept-Encoding"
+    assert response.get_etag()[0] == snapshot.variants["br"][1]
+    assert json.loads(brotli.decompress(response.data)) == PAYLOAD
+
+
+def test_br_only_client_gets_identity_without_brotli(snapshot_app, monkeypatch):
+    client, snapshot = snapshot_app
+    monkeypatch.delitem(snapshot.variants, "br", raising=False)
+
+    response = client.get("/species", headers={"Accept-Encoding": "br"})
+
+    assert "Content-Encoding" not in response.headers
+    assert response.get_json() == PAYLOAD
+
+
+@pytest.mark.parametrize("path, build", [
+    ("/api/character-data/species", "build_species_payload"),
+    ("/api/character-data/careers", "build_careers_payload"),
+])
+def test_endpoints_serve_the_same_json_as_before(client, path, build):
+    import app_with_auth
+
+    expected = json.loads(app_with_auth.app.json.dumps(getattr(app_with_auth, build)()))
+    plain = client.get(path)
+    compressed = client.get(path, headers={"Accept-Encoding": "gzip"})
+
+    assert plain.status_code == compressed.status_code == 200
+    assert plain.get_json() == expected
+    assert json.loads(gzip.decompress(compressed.data)) == expected
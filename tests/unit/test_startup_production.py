@@ -0,0 +1,127 @@
+"""Tests for gunicorn sizing in startup_production.py."""
+
+import importlib
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.join(os.path.dirname(__file__), '..', '..')
+
+
+@pytest.fixture
+def startup(tmp_path, monkeypatch):
+    # Importing the module writes .encryption_key to the working directory
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.syspath_prepend(ROOT)
+    module = importlib.import_module("startup_production")
+    for name in list(os.environ):
+        if name.startswith("GUNICORN_"):
+            monkeypatch.delenv(name)
+    monkeypatch.setattr(module, "CGROUP_ROOT", str(tmp_path / "cgroup"))
+    monkeypatch.setattr(os, "sched_getaffinity", lambda pid: set(range(8)))
+    return module
+
+
+def _write_cgroup(startup, files):
+    for relative_path, content in files.items():
+        path = os.path.join(startup.CGROUP_ROOT, relative_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write(content)
+
+
+@pytest.mark.parametrize("files, expected", [
+    ({}, 8),
+    ({"cpu.max": "max 100000\n"}, 8),
+    ({"cpu.max": "200000 100000\n"}, 2),
+    ({"cpu.max": "50000 100000\n"}, 1),
+    ({"cpu/cpu.cfs_quota_us": "-1\n", "cpu/cpu.cfs_period_us": "100000\n"}, 8),
+    ({"cpu/cpu.cfs_quota_us": "300000\n", "cpu/cpu.cfs_period_us": "100000\n"}, 3),
+    ({"cpu/cpu.cfs_quota_us": "150000\n", "cpu/cpu.cfs_period_us": "100000\n"}, 1),
+    ({"cpu/cpu.cfs_quota_us": "1600000\n", "cpu/cpu.cfs_period_us": "100000\n"}, 8),
+    ({"cpu.max": "400000 100000\n", "cpu/cpu.cfs_quota_us": "100000\n",
+      "cpu/cpu.cfs_period_us": "100000\n"}, 4),
+], ids=["none", "v2-unlimited", "v2-2cpu", "v2-half-cpu", "v1-unlimited", "v1-3cpu", "v1-1.5cpu",
+        "v1-above-affinity", "v2-wins"])
+def test_detect_cpu_count_honours_cgroup_quotas(startup, files, expected):
+    _write_cgroup(startup, files)
+    assert startup.detect_cpu_count() == expected
+
+
+@pytest.mark.parametrize("files, expected", [
+    ({}, 4096),
+    ({"memory.max": "max\n"}, 4096),
+    ({"memory.max": "536870912\n"}, 512),
+    ({"memory/memory.limit_in_bytes": "1073741824\n"}, 1024),
+    ({"memory/memory.limit_in_bytes": "9223372036854771712\n"}, 4096),  # v1 "unlimited"
+], ids=["none", "v2-unlimited", "v2-512mb", "v1-1gb", "v1-unlimited"])
+def test_detect_memory_mb_honours_cgroup_limits(startup, monkeypatch, files, expected):
+    pages = {"SC_PAGE_SIZE": 4096, "SC_PHYS_PAGES": 1024 * 1024}
+    monkeypatch.setattr(os, "sysconf", lambda name: pages[name])
+    _write_cgroup(startup, files)
+    assert startup.detect_memory_mb() == expected
+
+
+@pytest.mark.parametrize("worker_class, profile, cpus, memory_mb, expected", [
+    ("sync", "throughput", 4, 16384, dict(workers=9, threads=1, worker_connections=None,
+                                          preload=True, app="wsgi:application")),
+    ("gthread", "throughput", 4, 16384, dict(workers=5, threads=8, worker_connections=None,
+                                             preload=True, app="wsgi:application")),
+    ("gthread", "latency", 4, 16384, dict(workers=9, threads=2, worker_connections=None,
+                                          preload=True, app="wsgi:application")),
+    ("gevent", "throughput", 4, 16384, dict(workers=5, threads=1, worker_connections=1000,
+                                            preload=False, app="wsgi:application")),
+    ("gevent", "latency", 2, 16384, dict(workers=5, threads=1, worker_connections=100,
+                                         preload=False, app="wsgi:application")),
+    ("uvicorn", "throughput", 4, 16384, dict(workers=5, threads=1, worker_connections=None,
+                                             preload=True, app="asgi:application")),
+    # Memory caps the process count at 75% of memory / 200 MB per worker
+    ("gthread", "latency", 16, 1024, dict(workers=3, threads=2)),
+    ("sync", "throughput", 1, 16384, dict(workers=3, threads=1)),
+    ("sync", "throughput", 8, 100, dict(workers=1, threads=1)),
+    ("uvicorn", "latency", 8, 2048, dict(workers=7, threads=1)),
+])
+def test_plan_gunicorn_config(startup, monkeypatch, worker_class, profile, cpus, memory_mb, expected):
+    if worker_class in ("gevent", "uvicorn"):
+        # Only the import check matters here; the package is never used
+        monkeypatch.setitem(sys.modules, worker_class, type(sys)(worker_class))
+    monkeypatch.setattr(startup, "detect_cpu_count", lambda: cpus)
+    monkeypatch.setattr(startup, "detect_memory_mb", lambda: memory_mb)
+
+    config = startup.plan_gunicorn_config(worker_class=worker_class, profile=profile)
+
+    assert config["worker_class"] == worker_class and config["profile"] == profile
+    assert {key: config[key] for key in expected} == expected
+    assert (config["cpus"], config["memory_mb"]) == (cpus, memory_mb)
+
+
+@pytest.mark.parametrize("worker_class", ["gevent", "uvicorn"])
+def test_missing_worker_package_falls_back_to_gthread(startup, monkeypatch, worker_class):
+    monkeypatch.setitem(sys.modules, worker_class, None)  # import raises ImportError
+    monkeypatch.setattr(startup, "detect_cpu_count", lambda: 2)
+    monkeypatch.setattr(startup, "detect_memory_mb", lambda: 16384)
+
+    config = startup.plan_gunicorn_config(worker_class=worker_class, profile="throughput")
+
+    assert (config["worker_class"], config["threads"], config["app"]) == ("gthread", 8, "wsgi:application")
+
+
+def test_environment_and_arguments_override_sizing(startup, monkeypatch):
+    monkeypatch.setattr(startup, "detect_cpu_count", lambda: 4)
+    monkeypatch.setattr(startup, "detect_memory_mb", lambda: 16384)
+    monkeypatch.setenv("GUNICORN_WORKERS", "3")
+    monkeypatch.setenv("GUNICORN_THREADS", "16")
+    monkeypatch.setenv("GUNICORN_PRELOAD", "false")
+
+    assert {key: value for key, value in startup.plan_gunicorn_config().items()
+            if key in ("worker_class", "workers", "threads", "preload")} == \
+        {"worker_class": "gthread", "workers": 3, "threads": 16, "preload": False}
+    assert startup.plan_gunicorn_config(workers=6, threads=4)["workers"] == 6
+
+
+def test_unknown_worker_class_or_profile_is_rejected(startup):
+    with pytest.raises(ValueError, match="worker class"):
+        startup.plan_gunicorn_config(worker_class="eventlet")
+    with pytest.raises(ValueError, match="profile"):
+        startup.plan_gunicorn_config(profile="balanced")
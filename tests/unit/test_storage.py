@@ -0,0 +1,156 @@
+"""Tests for the offline storage backends."""
+
+import multiprocessing
+import os
+
+import pytest
+
+from swrpg_character_manager import storage as storage_module
+from swrpg_character_manager.persistence import CharacterDatabase
+from swrpg_character_manager.storage import CharacterStorage, JSONFileStorage, JournalStorage, SQLiteStorage, migrate_json_to_sqlite
+
+
+def test_json_storage_parses_once_and_picks_up_external_rewrites(tmp_path, monkeypatch):
+    path = tmp_path / "characters.json"
+    storage = JSONFileStorage(path)
+    storage.put("Kira", {"xp": 1})
+    loads = []
+    json_load = storage_module.json.load
+    monkeypatch.setattr(storage_module.json, "load", lambda f: loads.append(1) or json_load(f))
+
+    assert storage.get("Kira") == {"xp": 1} and storage.names() == ["Kira"]
+    assert loads == []  # served from the cache refreshed by the write
+
+    JSONFileStorage(path).put("Dash", {"xp": 5})  # another process rewrites the file
+    loads.clear()
+    assert sorted(storage.names()) == ["Dash", "Kira"]
+    assert storage.get("Dash") == {"xp": 5}
+    assert len(loads) == 1
+
+    # Same size and mtime, but a new inode, as an atomic rewrite elsewhere produces
+    stat = os.stat(path)
+    replacement = tmp_path / "replacement.json"
+    replacement.write_text(path.read_text().replace('"xp": 5', '"xp": 6'))
+    os.utime(replacement, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    os.replace(replacement, path)
+    assert storage.get("Dash") == {"xp": 6}
+
+
+def test_json_storage_hands_out_copies(tmp_path):
+    storage = JSONFileStorage(tmp_path / "characters.json")
+    record = {"xp": 1, "skills": {"Brawl": {"ranks": 1}}}
+    storage.put("Kira", record)
+
+    record["skills"]["Brawl"]["ranks"] = 5
+    storage.get("Kira")["skills"]["Brawl"]["ranks"] = 5
+    for _, listed in storage.items():
+        listed["xp"] = 99
+
+    assert storage.get("Kira") == {"xp": 1, "skills": {"Brawl": {"ranks": 1}}}
+
+
+def _append_many(path, prefix, count):
+    journal = JournalStorage(path, compact_min_dead=5)
+    for i in range(count):
+        journal.put(f"{prefix}-{i}", {"xp": i})
+        journal.put(f"{prefix}-{i}", {"xp": i + 1})  # supersede to force compactions
+
+
+def test_compaction_keeps_appends_from_another_writer(tmp_path):
+    path = tmp_path / "characters.journal"
+    first = JournalStorage(path)
+    second = JournalStorage(path)
+
+    first.put("Kira", {"xp": 1})
+    first.put("Kira", {"xp": 2})
+    second.put("Dash", {"xp": 5})  # first's index hasn't seen this yet
+    first.compact()
+
+    assert sorted(JournalStorage(path).names()) == ["Dash", "Kira"]
+    assert JournalStorage(path).get("Kira") == {"xp": 2}
+
+
+def _compact_after_first_refresh(reader, writer, monkeypatch):
+    """Make writer compact the journal right after reader's next _refresh()."""
+    refresh = reader._refresh
+
+    def refresh_then_compact():
+        refresh()
+        monkeypatch.setattr(reader, "_refresh", refresh)
+        writer.compact()
+
+    monkeypatch.setattr(reader, "_refresh", refresh_then_compact)
+
+
+def test_reader_survives_compaction_between_refresh_and_read(tmp_path, monkeypatch):
+    path = tmp_path / "characters.journal"
+    writer = JournalStorage(path)
+    reader = JournalStorage(path)
+    writer.put("Kira", {"xp": 1})
+    writer.put("Kira", {"xp": 2})
+    writer.put("Dash", {"xp": 5})  # moves to a lower offset once compacted
+    reader.names()
+
+    _compact_after_first_refresh(reader, writer, monkeypatch)
+    assert reader.get("Dash") == {"xp": 5}
+
+    _compact_after_first_refresh(reader, writer, monkeypatch)
+    writer.put("Dash", {"xp": 6})
+    assert dict(reader.items()) == {"Kira": {"xp": 2}, "Dash": {"xp": 6}}
+
+
+def test_concurrent_writers_with_compaction_lose_nothing(tmp_path):
+    path = tmp_path / "characters.journal"
+    JournalStorage(path)
+    context = multiprocessing.get_context("fork")
+    workers = [context.Process(target=_append_many, args=(path, f"w{n}", 150)) for n in range(4)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+        assert worker.exitcode == 0
+
+    journal = JournalStorage(path)
+    assert len(journal.names()) == 600
+    assert all(journal.get(f"w{n}-{i}") == {"xp": i + 1} for n in range(4) for i in range(150))
+
+
+def test_migrate_json_to_sqlite_round_trip(tmp_path, make_record):
+    records = [make_record("Kira", 100), make_record("Dash", 250, career="Hired Gun", species="Twi'lek")]
+    JSONFileStorage(tmp_path / "characters.json").put_many((record["name"], record) for record in records)
+
+    assert migrate_json_to_sqlite(tmp_path / "characters.json", tmp_path / "characters.db") == 2
+    # Re-running replaces rows instead of duplicating them
+    assert migrate_json_to_sqlite(tmp_path / "characters.json", tmp_path / "characters.db") == 2
+
+    storage = SQLiteStorage(tmp_path / "characters.db")
+    try:
+        assert dict(storage.items()) == {record["name"]: record for record in records}
+        stats = storage.stats()
+        assert stats["total_characters"] == 2
+        assert stats["characters_by_career"] == {"Smuggler": 1, "Hired Gun": 1}
+        assert stats["average_xp"] == 175
+    finally:
+        storage.close()
+
+
+def test_sqlite_backend_loads_migrated_characters(tmp_path, make_record):
+    JSONFileStorage(tmp_path / "characters.json").put("Kira", make_record("Kira", 100))
+
+    # A new SQLite database imports characters.json on first open
+    database = CharacterDatabase(str(tmp_path), backend="sqlite")
+    character = database.load_character("Kira")
+    assert (character.name, character.total_xp, character.agility) == ("Kira", 100, 3)
+    assert database.list_characters() == ["Kira"]
+
+
+def test_backend_missing_a_required_method_cannot_be_instantiated():
+    class ReadOnlyStorage(CharacterStorage):
+        def get(self, name):
+            return None
+
+        def names(self):
+            return []
+
+    with pytest.raises(TypeError, match="backup"):
+        ReadOnlyStorage()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""Check, build and report on MongoDB indexes from the index manifest."""
+
+import argparse
+import json
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+# Connect without triggering the automatic build; this tool decides when to build
+os.environ['INDEX_BUILD_MODE'] = 'off'
+
+from swrpg_character_manager.database import db_manager
+from swrpg_character_manager.indexes import IndexManager, manifest_version
+
+
+def show_status(index_manager):
+    """Compare the stored index version with the manifest."""
+    stored = index_manager.stored_version()
+    current = manifest_version()
+    print(f"📋 Manifest version: {current}")
+    print(f"💾 Stored version:   {stored or 'never built'}")
+    if stored == current:
+        print("✅ Indexes are up to date")
+        return True
+    print("⚠️  Indexes need a build (run: manage_indexes.py build)")
+    return False
+
+
+def build_indexes(index_manager, force=False):
+    """Build the manifest (only if it changed, unless forced)."""
+    result = index_manager.ensure_indexes(force=force)
+    messages = {
+        'current': "✅ Indexes already up to date (use --force to rebuild)",
+        'built': "✅ Index build complete",
+        'busy': "⏳ Another process is building indexes; try again later",
+        'failed': "❌ Some indexes could not be built (see above)"
+    }
+    print(messages[result])
+    return result in ('current', 'built')
+
+
+def show_report(index_manager, as_json=False):
+    """Flag missing, unexpected and unused indexes."""
+    report = index_manager.report()
+    if as_json:
+        print(json.dumps(report, indent=2, default=str))
+        return all(not entry['missing'] for entry in report.values())
+
+    healthy = True
+    for collection, entry in report.items():
+        print(f"\n📁 {collection}")
+        for index in entry['missing']:
+            healthy = False
+            print(f"   ❌ Missing: {index}")
+        for index in entry['unexpected']:
+            print(f"   ❓ Not in manifest: {index}")
+        for index in entry['unused']:
+            print(f"   💤 Unused since {entry['usage'][index]['since']}: {index}")
+        if entry['usage'] is None:
+            print("   ℹ️  Usage stats unavailable ($indexStats not supported)")
+        if not (entry['missing'] or entry['unexpected'] or entry['unused']):
+            print("   ✅ OK")
+    return healthy
+
+
+def main():
+    """Run index management."""
+    parser = argparse.ArgumentParser(description="Manage MongoDB indexes")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    subparsers.add_parser('status', help='Compare stored index version with the manifest')
+    build_parser = subparsers.add_parser('build', help='Build indexes if the manifest changed')
+    build_parser.add_argument('--force', action='store_true', help='Build even if the version matches')
+    report_parser = subparsers.add_parser('report', help='Report missing and unused indexes ($indexStats)')
+    report_parser.add_argument('--json', action='store_true', help='Print the report as JSON')
+    args = parser.parse_args()
+
+    try:
+        db_manager.connect()
+        index_manager = IndexManager(db_manager.db)
+
+        if args.command == 'status':
+            return show_status(index_manager)
+        if args.command == 'build':
+            return build_indexes(index_manager, args.force)
+        return show_report(index_manager, args.json)
+
+    except Exception as e:
+        print(f"❌ Index management failed: {e}")
+        return False
+    finally:
+        try:
+            db_manager.disconnect()
+        except:
+            pass
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
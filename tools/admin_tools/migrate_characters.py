@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 """Migrate existing character storage from JSON files to MongoDB."""
 
+import argparse
 import sys
 import os
 import json
@@ -9,13 +10,94 @@ from datetime import datetime, timezone
 # Add src to path for imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
-def migrate_character_files():
+CHARACTER_FILES = [
+    "./character_data/characters.json",
+    "./web/character_data/characters.json"
+]
+
+
+def character_file_record_to_document(item):
+    """Convert a (user_id, file record) pair into an upsert for the characters collection.
+    
+    Characters that already exist for the user (same name) are left untouched.
+    Runs in migration worker processes, so it must stay at module level.
+    """
+    from dataclasses import asdict
+    from swrpg_character_manager.database import Character
+    
+    user_id, char_data = item
+    
+    # Extract basic character info
+    character = Character(
+        user_id=user_id,
+        name=char_data["name"],
+        player_name=char_data.get("player_name", "Migrated Player"),
+        species=char_data["species"],
+        career=char_data["career"]["name"],
+        background=char_data.get("background", {}).get("background", ""),
+        
+        # Characteristics
+        brawn=char_data["characteristics"]["brawn"],
+        agility=char_data["characteristics"]["agility"],
+        intellect=char_data["characteristics"]["intellect"],
+        cunning=char_data["characteristics"]["cunning"],
+        willpower=char_data["characteristics"]["willpower"],
+        presence=char_data["characteristics"]["presence"],
+        
+        # Experience
+        total_xp=char_data["experience"]["total_xp"],
+        available_xp=char_data["experience"]["available_xp"],
+        spent_xp=char_data["experience"]["spent_xp"],
+        
+        # Equipment
+        credits=char_data.get("equipment", {}).get("credits", 0),
+        equipment=char_data.get("equipment", {}).get("items", [])
+    )
+    
+    # Convert skills format
+    character.skills = {
+        skill_name: {
+            "level": skill_data.get("ranks", 0),
+            "career": skill_data.get("career_skill", False)
+        }
+        for skill_name, skill_data in char_data.get("skills", {}).items()
+    }
+    
+    # Convert talents (if any)
+    character.talents = char_data.get("talents", [])
+    
+    document = asdict(character)
+    document.pop('_id', None)
+    return {"name": character.name, "user_id": user_id}, {"$setOnInsert": document}
+
+
+def iter_character_file_records(user_id):
+    """Yield (user_id, record) for every character in the known character files."""
+    for file_path in CHARACTER_FILES:
+        if not os.path.exists(file_path):
+            continue
+        
+        print(f"   📁 Processing file: {file_path}")
+        try:
+            with open(file_path, 'r') as f:
+                characters_data = json.load(f)
+        except Exception as e:
+            print(f"   ❌ Failed to process file {file_path}: {e}")
+            continue
+        
+        for char_data in characters_data.values():
+            yield user_id, char_data
+
+
+def migrate_character_files(batch_size=1000, workers=None, dry_run=False,
+                            checkpoint_path=".migrate_characters.checkpoint"):
     """Migrate character files to MongoDB."""
     print("🔄 Migrating Character Files to MongoDB...")
     
     try:
-        from swrpg_character_manager.database import db_manager, Character
+        from swrpg_character_manager.database import db_manager
         from swrpg_character_manager.security import audit_log
+        from swrpg_character_manager.migrations import MigrationRunner
         
         # Connect to database
         db_manager.connect()
@@ -29,103 +111,41 @@ def migrate_character_files():
         test_user_id = test_user._id
         print(f"   ✅ Found admin user: {test_user.username} ({test_user_id})")
         
-        # Look for character files
-        character_files = [
-            "./character_data/characters.json",
-            "./web/character_data/characters.json"
-        ]
+        runner = MigrationRunner(
+            db_manager.characters,
+            name="character file import",
+            batch_size=batch_size,
+            workers=workers,
+            dry_run=dry_run,
+            checkpoint_path=checkpoint_path
+        )
+        stats = runner.import_records(iter_character_file_records(test_user_id), character_file_record_to_document)
         
-        migrated_count = 0
-        total_characters = 0
+        for error in stats.errors:
+            print(f"   ❌ Failed to migrate character #{error['key']}: {error['error']}")
         
-        for file_path in character_files:
-            if not os.path.exists(file_path):
-                continue
-                
-            print(f"   📁 Processing file: {file_path}")
-            
-            try:
-                with open(file_path, 'r') as f:
-                    characters_data = json.load(f)
-                
-                for char_name, char_data in characters_data.items():
-                    total_characters += 1
-                    
-                    # Check if character already exists
-                    existing_char = db_manager.characters.find_one({
-                        "name": char_data["name"],
-                        "user_id": test_user_id
-                    })
-                    
-                    if existing_char:
-                        print(f"   ⚠️  Character '{char_name}' already exists, skipping...")
-                        continue
-                    
-                    # Convert file format to database format
-                    try:
-                        # Extract basic character info
-                        character = Character(
-                            user_id=test_user_id,
-                            name=char_data["name"],
-                            player_name=char_data.get("player_name", "Migrated Player"),
-                            species=char_data["species"],
-                            career=char_data["career"]["name"],
-                            background=char_data.get("background", {}).get("background", ""),
-                            
-                            # Characteristics
-                            brawn=char_data["characteristics"]["brawn"],
-                            agility=char_data["characteristics"]["agility"],
-                            intellect=char_data["characteristics"]["intellect"],
-                            cunning=char_data["characteristics"]["cunning"],
-                            willpower=char_data["characteristics"]["willpower"],
-                            presence=char_data["characteristics"]["presence"],
-                            
-                            # Experience
-                            total_xp=char_data["experience"]["total_xp"],
-                            available_xp=char_data["experience"]["available_xp"],
-                            spent_xp=char_data["experience"]["spent_xp"],
-                            
-                            # Equipment
-                            credits=char_data.get("equipment", {}).get("credits", 0),
-                            equipment=char_data.get("equipment", {}).get("items", [])
-                        )
-                        
-                        # Convert skills format
-                        skills_dict = {}
-                        for skill_name, skill_data in char_data.get("skills", {}).items():
-                            skills_dict[skill_name] = {
-                                "level": skill_data.get("ranks", 0),
-                                "career": skill_data.get("career_skill", False)
-                            }
-                        character.skills = skills_dict
-                        
-                        # Convert talents (if any)
-                        character.talents = char_data.get("talents", [])
-                        
-                        # Save to database
-                        character_id = db_manager.create_character(character)
-                        print(f"   ✅ Migrated character: {char_name} -> {character_id}")
-                        
-                        # Log migration event
-                        audit_log.log_data_access(str(test_user_id), "character_migration", "character_data", True)
-                        
-                        migrated_count += 1
-                        
-                    except Exception as e:
-                        print(f"   ❌ Failed to migrate character '{char_name}': {e}")
-                        continue
-                        
-            except Exception as e:
-                print(f"   ❌ Failed to process file {file_path}: {e}")
-                continue
+        total_characters = stats.read
+        migrated_count = stats.upserted
+        
+        # Log migration event
+        audit_log.log_data_access(str(test_user_id), "character_migration", "character_data", stats.failed == 0)
         
         print(f"\n   📊 Migration Summary:")
         print(f"      Total characters found: {total_characters}")
         print(f"      Successfully migrated: {migrated_count}")
+        print(f"      Already present: {stats.matched}")
         print(f"      Assigned to user: {test_user.username}")
         
+        if not dry_run and stats.upserted:
+            # Bulk upserts bypass the manager, so the dashboard counters missed them
+            try:
+                db_manager.reconcile_stats()
+                print(f"      Admin dashboard stats reconciled")
+            except Exception as e:
+                print(f"   ⚠️  Stats reconciliation failed, the next scheduled one will catch up: {e}")
+        
         # Create a test campaign and assign characters
-        if migrated_count > 0:
+        if migrated_count > 0 and not dry_run:
             print(f"\n   🏰 Creating test campaign...")
             
             from swrpg_character_manager.database import Campaign
@@ -147,7 +167,7 @@ def migrate_character_files():
                 print(f"      ✅ Created test campaign: {campaign_id}")
                 
                 # Assign migrated characters to campaign
-                migrated_chars = db_manager.get_user_characters(test_user_id)
+                migrated_chars = db_manager.get_user_character_summaries(test_user_id)
                 assigned_count = 0
                 
                 for character in migrated_chars:
@@ -222,10 +242,18 @@ def verify_migration():
 
 def main():
     """Run character migration."""
+    parser = argparse.ArgumentParser(description="Import character files into MongoDB")
+    parser.add_argument('--batch-size', type=int, default=1000, help='Characters per bulk write')
+    parser.add_argument('--workers', type=int, default=None, help='Transform worker processes (default: CPU count)')
+    parser.add_argument('--dry-run', action='store_true', help='Transform without writing')
+    parser.add_argument('--checkpoint', default='.migrate_characters.checkpoint',
+                        help='File used to resume an interrupted run')
+    args = parser.parse_args()
+    
     print("🛡️  Character Migration from Files to MongoDB")
     print("=" * 50)
     
-    if migrate_character_files():
+    if migrate_character_files(args.batch_size, args.workers, args.dry_run, args.checkpoint):
         if verify_migration():
             print("\n🎉 Character Migration Completed Successfully!")
             print("\n📋 Migration Summary:")
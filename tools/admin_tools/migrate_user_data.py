@@ -1,86 +1,84 @@
 #!/usr/bin/env python3
 """Migrate existing user data to use encrypted emails and email_hash fields."""
 
+import argparse
 import sys
 import os
 
 # Add src to path for imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
-def migrate_existing_users():
+USERS_TO_MIGRATE = {
+    "$or": [
+        {"email_hash": {"$exists": False}},
+        {"email_hash": None},
+        {"email_hash": ""}
+    ]
+}
+
+
+def encrypt_user_email(user):
+    """Build the update that encrypts a user's email and adds its lookup hash.
+    
+    Runs in migration worker processes, so it must stay at module level.
+    """
+    from swrpg_character_manager.security import data_encryption
+    
+    current_email = user.get('email', '')
+    if not current_email:
+        return None  # Nothing to encrypt; counted as skipped
+    
+    if data_encryption.is_email_encrypted(current_email):
+        # Email is already encrypted, just add hash
+        decrypted_email = data_encryption.decrypt_email(current_email)
+        return {"$set": {"email_hash": data_encryption.hash_email_for_index(decrypted_email)}}
+    
+    # Email is plaintext, need to encrypt it
+    return {"$set": {
+        "email": data_encryption.encrypt_email(current_email),
+        "email_hash": data_encryption.hash_email_for_index(current_email)
+    }}
+
+
+def migrate_existing_users(batch_size=1000, workers=None, dry_run=False,
+                           checkpoint_path=".migrate_user_data.checkpoint"):
     """Migrate existing users to encrypted email format."""
     print("🔄 Migrating Existing User Data...")
     
     try:
         from swrpg_character_manager.database import db_manager
-        from swrpg_character_manager.security import data_encryption, audit_log
+        from swrpg_character_manager.security import audit_log
+        from swrpg_character_manager.migrations import MigrationRunner
         
         # Connect to database
         db_manager.connect()
         
-        # Find all users that need migration (those without email_hash)
-        users_to_migrate = list(db_manager.users.find({
-            "$or": [
-                {"email_hash": {"$exists": False}},
-                {"email_hash": None},
-                {"email_hash": ""}
-            ]
-        }))
+        print(f"   Found {db_manager.users.count_documents(USERS_TO_MIGRATE)} users to migrate")
         
-        print(f"   Found {len(users_to_migrate)} users to migrate")
+        runner = MigrationRunner(
+            db_manager.users,
+            name="user email encryption",
+            batch_size=batch_size,
+            workers=workers,
+            dry_run=dry_run,
+            checkpoint_path=checkpoint_path
+        )
+        stats = runner.migrate_collection(
+            encrypt_user_email,
+            query=USERS_TO_MIGRATE,
+            projection={"email": 1, "username": 1}
+        )
         
-        if len(users_to_migrate) == 0:
-            print("   ✅ No users need migration")
-            return True
+        for error in stats.errors:
+            print(f"   ❌ Failed to migrate user {error['key']}: {error['error']}")
+        print(f"   ✅ Successfully migrated {stats.modified} users "
+              f"({stats.skipped} without email, {stats.failed} failed)")
         
-        migrated_count = 0
-        for user in users_to_migrate:
-            try:
-                user_id = user['_id']
-                current_email = user.get('email', '')
-                
-                if not current_email:
-                    print(f"   ⚠️  Skipping user {user_id} - no email")
-                    continue
-                
-                # Check if email is already encrypted
-                if data_encryption.is_email_encrypted(current_email):
-                    # Email is already encrypted, just add hash
-                    try:
-                        decrypted_email = data_encryption.decrypt_email(current_email)
-                        email_hash = data_encryption.hash_email_for_index(decrypted_email)
-                    except:
-                        print(f"   ❌ Failed to decrypt email for user {user_id}")
-                        continue
-                else:
-                    # Email is plaintext, need to encrypt it
-                    decrypted_email = current_email
-                    encrypted_email = data_encryption.encrypt_email(current_email)
-                    email_hash = data_encryption.hash_email_for_index(current_email)
-                    
-                    # Update the email field with encrypted version
-                    db_manager.users.update_one(
-                        {"_id": user_id},
-                        {"$set": {"email": encrypted_email}}
-                    )
-                
-                # Add email_hash field
-                db_manager.users.update_one(
-                    {"_id": user_id},
-                    {"$set": {"email_hash": email_hash}}
-                )
-                
-                migrated_count += 1
-                print(f"   ✅ Migrated user {user.get('username', 'unknown')} ({user_id})")
-                
-                # Log migration event
-                audit_log.log_data_access("system", "user_migration", "email_encryption", True)
-                
-            except Exception as e:
-                print(f"   ❌ Failed to migrate user {user_id}: {e}")
-                continue
+        # Log migration event
+        audit_log.log_data_access("system", "user_migration", "email_encryption", stats.failed == 0)
         
-        print(f"   ✅ Successfully migrated {migrated_count} users")
+        if dry_run:
+            return True
         
         # Now recreate the unique index
         print("   🔧 Recreating unique email_hash index...")
@@ -113,10 +111,18 @@ def migrate_existing_users():
 
 def main():
     """Run user data migration."""
+    parser = argparse.ArgumentParser(description="Encrypt user emails and add email_hash fields")
+    parser.add_argument('--batch-size', type=int, default=1000, help='Users per bulk write')
+    parser.add_argument('--workers', type=int, default=None, help='Transform worker processes (default: CPU count)')
+    parser.add_argument('--dry-run', action='store_true', help='Transform without writing')
+    parser.add_argument('--checkpoint', default='.migrate_user_data.checkpoint',
+                        help='File used to resume an interrupted run')
+    args = parser.parse_args()
+    
     print("🛡️  User Data Migration for NIST Compliance")
     print("=" * 50)
     
-    if migrate_existing_users():
+    if migrate_existing_users(args.batch_size, args.workers, args.dry_run, args.checkpoint):
         print("\n🎉 Migration Completed Successfully!")
         print("\n📋 Migration Summary:")
         print("   ✅ Existing user emails encrypted")
@@ -3,8 +3,8 @@
 import os
 import sys
 import secrets
-from datetime import datetime, timedelta
-from flask import Flask, render_template, request, jsonify, redirect, url_for, session
+from datetime import datetime, timedelta, timezone
+from flask import Flask, Response, render_template, request, jsonify, redirect, url_for, session, stream_with_context
 from flask_jwt_extended import JWTManager, jwt_required, get_jwt_identity, get_jwt
 from bson import ObjectId
 from dotenv import load_dotenv
@@ -12,16 +12,18 @@ from dotenv import load_dotenv
 # Add the src directory to the Python path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
-from swrpg_character_manager.database import db_manager, User, Campaign, Character
+from swrpg_character_manager.database import db_manager, User, Character, MAX_SKILL_RANK, MAX_CHARACTERISTIC_VALUE
+from swrpg_character_manager.async_database import async_db_manager
+from swrpg_character_manager import api_common
+from swrpg_character_manager.security import audit_log
 from swrpg_character_manager.auth import auth_manager
-from swrpg_character_manager.character_creator import CharacterCreator
+from swrpg_character_manager.password_hashing import PasswordHashingBusy
+from swrpg_character_manager.character_creator import get_character_creator
 from swrpg_character_manager.advancement import AdvancementManager
 from swrpg_character_manager.social_auth import social_auth_manager
 from swrpg_character_manager.character_walkthrough import character_walkthrough
 from secure_error_handlers import setup_production_error_handlers, setup_production_logging
-
-# Initialize character creator
-creator = CharacterCreator()
+from reference_snapshots import ReferenceSnapshot
 
 load_dotenv()
 
@@ -101,8 +103,8 @@ jwt = JWTManager(app)
 setup_production_error_handlers(app)
 setup_production_logging(app)
 
-# Initialize character management components
-creator = CharacterCreator()
+# Initialize character management components (reference data is shared process-wide)
+creator = get_character_creator()
 advancement = AdvancementManager()
 
 @app.before_request
@@ -144,6 +146,13 @@ class ServerHeaderMiddleware:
 # Wrap the Flask app with our middleware
 app.wsgi_app = ServerHeaderMiddleware(app.wsgi_app)
 
+def password_hashing_busy_response():
+    """503 for requests rejected because the password hashing pool is saturated."""
+    response = jsonify({'error': 'Server is busy, please try again shortly'})
+    response.status_code = 503
+    response.headers['Retry-After'] = '1'
+    return response
+
 # Authentication Routes
 @app.route('/api/auth/register', methods=['POST'])
 def register():
@@ -165,6 +174,8 @@ def register():
         else:
             return jsonify({'error': message}), 400
 
+    except PasswordHashingBusy:
+        return password_hashing_busy_response()
     except Exception as e:
         return jsonify({'error': 'Operation failed'}), 500
 
@@ -184,44 +195,23 @@ def login():
             app.logger.error("No JSON data received")
             return jsonify({'error': 'No data provided'}), 400
             
-        app.logger.info(f"Login attempt for: {data.get('email', 'no-email')}")
-        
         email = data.get('email')
         password = data.get('password')
-        
-        # Debug: Log password details (remove after fix)
-        app.logger.info(f"Password received: length={len(password)} repr={repr(password)}")
 
         if not email or not password:
             return jsonify({'error': 'Email and password are required'}), 400
 
-        app.logger.info(f"Attempting authentication for: {email}")
-        
-        # Debug: Check database connection in web app
-        try:
-            user_check = db_manager.get_user_by_email(email)
-            if user_check:
-                app.logger.info(f"User found in web app db: {user_check.username}")
-                # Test password directly
-                is_valid = auth_manager.verify_password(password, user_check.password_hash)
-                app.logger.info(f"Password verification in web app: {is_valid}")
-            else:
-                app.logger.error("User not found in web app database")
-        except Exception as e:
-            app.logger.error(f"Database check failed: {e}")
-        
-        success, message, user = auth_manager.authenticate_user(email, password)
-        app.logger.info(f"Authentication result: {success} - {message}")
-        
-        if user:
-            app.logger.info(f"User found: {user.username} / {user.role}")
-        else:
-            app.logger.info("No user object returned")
+        result = auth_manager.authenticate(email, password)
+        app.logger.info(
+            f"Login {'succeeded' if result.success else 'failed'}: lookup={result.lookup_ms:.1f}ms "
+            f"verify={result.verify_ms:.1f}ms rehash={result.rehash_ms:.1f}ms"
+        )
 
-        if not success:
-            app.logger.warning(f"Authentication failed for {email}: {message}")
-            return jsonify({'error': message}), 401
+        if not result.success:
+            app.logger.warning(f"Authentication failed for {email}: {result.message}")
+            return jsonify({'error': result.message}), 401
 
+        user = result.user
 
         # Create access token
         access_token = auth_manager.create_access_token(user)
@@ -232,6 +222,8 @@ def login():
         session['username'] = user.username
         session['role'] = user.role
         session['authenticated'] = True
+        session_id = db_manager.record_session(user._id, datetime.now(timezone.utc) + app.permanent_session_lifetime)
+        session['session_id'] = str(session_id)
 
         return jsonify({
             'message': 'Login successful',
@@ -243,6 +235,9 @@ def login():
             }
         }), 200
 
+    except PasswordHashingBusy:
+        app.logger.warning("Login rejected: password hashing pool saturated")
+        return password_hashing_busy_response()
     except Exception as e:
         app.logger.error(f"Login error: {e}")
         return jsonify({'error': f'Login failed: {str(e)}'}), 500
@@ -252,8 +247,7 @@ def login():
 def get_current_user():
     """Get current user information."""
     try:
-        current_user_id = get_current_user_id()
-        user = db_manager.get_user_by_id(current_user_id)
+        user = auth_manager.get_current_user()
 
         if not user:
             return jsonify({'error': 'User not found'}), 404
@@ -279,7 +273,10 @@ def get_current_user():
 def logout():
     """Logout user and clear session."""
     try:
-        # Clear session data
+        # Drop the session record (for the active session count), then clear session data
+        session_id = session.get('session_id')
+        if session_id and ObjectId.is_valid(session_id):
+            db_manager.end_session(ObjectId(session_id))
         session.clear()
         return jsonify({'message': 'Logout successful'}), 200
     except Exception as e:
@@ -301,7 +298,7 @@ def change_password():
             return jsonify({'error': 'Current password and new password are required'}), 400
         
         # Get current user
-        user = db_manager.get_user_by_id(current_user_id)
+        user = auth_manager.get_current_user()
         if not user:
             return jsonify({'error': 'User not found'}), 404
         
@@ -312,14 +309,20 @@ def change_password():
         # Hash new password
         new_password_hash = auth_manager.hash_password(new_password)
         
-        # Update password
+        # Update password (this revokes previously issued access tokens)
         success = db_manager.update_user(current_user_id, {'password_hash': new_password_hash})
         
         if success:
-            return jsonify({'message': 'Password changed successfully'}), 200
+            user = db_manager.get_user_by_id(current_user_id)
+            return jsonify({
+                'message': 'Password changed successfully',
+                'access_token': auth_manager.create_access_token(user)
+            }), 200
         else:
             return jsonify({'error': 'Failed to update password'}), 500
     
+    except PasswordHashingBusy:
+        return password_hashing_busy_response()
     except Exception as e:
         return jsonify({'error': 'Operation failed'}), 500
 
@@ -491,22 +494,15 @@ def get_campaigns():
     """Get user's campaigns."""
     try:
         current_user_id = get_current_user_id()
-        campaigns = db_manager.get_user_campaigns(current_user_id)
-
-        campaign_data = []
-        for campaign in campaigns:
-            campaign_data.append({
-                'id': str(campaign._id),
-                'name': campaign.name,
-                'description': campaign.description,
-                'is_game_master': campaign.game_master_id == current_user_id,
-                'player_count': len(campaign.players),
-                'character_count': len(campaign.characters),
-                'created_at': campaign.created_at.isoformat()
-            })
 
-        return jsonify({'campaigns': campaign_data}), 200
+        return paginated_response(
+            'campaigns',
+            lambda after, limit: db_manager.iter_user_campaigns(current_user_id, after=after, limit=limit),
+            lambda campaign: api_common.serialize_campaign_summary(campaign, current_user_id)
+        )
 
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -516,42 +512,13 @@ def create_campaign():
     """Create a new campaign."""
     try:
         current_user_id = get_current_user_id()
-        data = request.get_json()
-
-        # Validate required fields
-        if not data.get('name') or not data.get('name').strip():
-            return jsonify({'error': 'Campaign name is required'}), 400
-
-        if not data.get('game_system'):
-            return jsonify({'error': 'Game system is required'}), 400
-
-        # Prepare campaign settings with additional fields
-        campaign_settings = {
-            'game_system': data.get('game_system'),
-            'max_players': data.get('max_players', 4)
-        }
-
-        campaign = Campaign(
-            name=data.get('name').strip(),
-            description=data.get('description', ''),
-            game_master_id=current_user_id,
-            settings=campaign_settings
-        )
-
+        campaign = api_common.new_campaign(request.get_json(silent=True), current_user_id)
         campaign_id = db_manager.create_campaign(campaign)
 
-        return jsonify({
-            'message': 'Campaign created successfully',
-            'campaign_id': str(campaign_id),
-            'campaign': {
-                'id': str(campaign_id),
-                'name': campaign.name,
-                'description': campaign.description,
-                'game_system': campaign_settings['game_system'],
-                'max_players': campaign_settings['max_players']
-            }
-        }), 201
+        return jsonify(api_common.serialize_created_campaign(campaign_id, campaign)), 201
 
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         app.logger.error(f"Campaign creation error: {str(e)}")
         return jsonify({'error': str(e)}), 500
@@ -578,6 +545,69 @@ def generate_campaign_invite(campaign_id):
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/campaigns/<campaign_id>/dashboard', methods=['GET'])
+@auth_manager.require_auth
+def get_campaign_dashboard(campaign_id):
+    """Get a campaign with its players and character summaries in one request."""
+    try:
+        current_user_id = get_current_user_id()
+        if not ObjectId.is_valid(campaign_id):
+            return jsonify({'error': 'Campaign not found'}), 404
+
+        dashboard = db_manager.get_campaign_dashboard(ObjectId(campaign_id))
+        if not dashboard:
+            return jsonify({'error': 'Campaign not found'}), 404
+
+        # Members come back with the campaign, so access needs no extra query
+        is_game_master = dashboard['game_master_id'] == current_user_id
+        is_member = is_game_master or current_user_id in (dashboard.get('players') or [])
+        if not is_member and auth_manager.get_current_user().role != 'admin':
+            return jsonify({'error': 'Access denied'}), 403
+
+        usernames = {member['_id']: member.get('username') for member in dashboard['members']}
+        characteristics = ('brawn', 'agility', 'intellect', 'cunning', 'willpower', 'presence')
+
+        return jsonify({
+            'campaign': {
+                'id': str(dashboard['_id']),
+                'name': dashboard.get('name'),
+                'description': dashboard.get('description'),
+                'settings': dashboard.get('settings') or {},
+                'game_master': {
+                    'id': str(dashboard['game_master_id']),
+                    'username': usernames.get(dashboard['game_master_id'])
+                },
+                'is_game_master': is_game_master,
+                'created_at': dashboard['created_at'].isoformat() if dashboard.get('created_at') else None
+            },
+            'players': [
+                {'id': str(player_id), 'username': usernames.get(player_id)}
+                for player_id in dashboard.get('players') or []
+            ],
+            'characters': [
+                {
+                    'id': str(char['_id']),
+                    'name': char.get('name'),
+                    'user_id': str(char['user_id']) if char.get('user_id') else None,
+                    'username': usernames.get(char.get('user_id')),
+                    'player_name': char.get('player_name'),
+                    'species': char.get('species'),
+                    'career': char.get('career'),
+                    'total_xp': char.get('total_xp'),
+                    'available_xp': char.get('available_xp'),
+                    'spent_xp': char.get('spent_xp'),
+                    'wounds': char.get('wounds'),
+                    'strain': char.get('strain'),
+                    'characteristics': {name: char.get(name) for name in characteristics}
+                }
+                for char in dashboard['characters']
+            ]
+        }), 200
+
+    except Exception as e:
+        app.logger.error(f"Get campaign dashboard error: {str(e)}")
+        return jsonify({'error': 'Operation failed'}), 500
+
 @app.route('/api/campaigns/join', methods=['POST'])
 @auth_manager.require_auth
 def join_campaign():
@@ -601,6 +631,80 @@ def join_campaign():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/campaigns/<campaign_id>/award-xp', methods=['POST'])
+@auth_manager.require_auth
+def award_campaign_xp(campaign_id):
+    """Award XP to the characters of a campaign in one batch.
+    
+    Body: {"xp_amount": int, "awards": {"<character_id>": int}, "reason": str}.
+    xp_amount goes to every active character in the campaign; awards sets
+    per-character amounts (and overrides xp_amount for those characters).
+    """
+    try:
+        current_user_id = get_current_user_id()
+        campaign = db_manager.get_campaign_by_id(ObjectId(campaign_id))
+
+        if not campaign:
+            return jsonify({'error': 'Campaign not found'}), 404
+
+        current_user = auth_manager.get_current_user()
+        if campaign.game_master_id != current_user_id and current_user.role != 'admin':
+            return jsonify({'error': 'Access denied'}), 403
+
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict):
+            return jsonify({'error': 'Request body must be a JSON object'}), 400
+        xp_amount = data.get('xp_amount')
+        per_character = data.get('awards') or {}
+        reason = data.get('reason', 'XP Award')
+
+        if not isinstance(per_character, dict):
+            return jsonify({'error': 'awards must map character IDs to XP amounts'}), 400
+
+        amounts = ([xp_amount] if xp_amount is not None else []) + list(per_character.values())
+        if not amounts or not all(api_common.is_positive_xp(amount) for amount in amounts):
+            return jsonify({'error': 'XP amounts must be positive integers'}), 400
+        if not all(ObjectId.is_valid(character_id) for character_id in per_character):
+            return jsonify({'error': 'Invalid character ID in awards'}), 400
+
+        # Resolve the party from projected summaries, then award in one bulk write
+        members = {char._id: char for char in db_manager.get_campaign_character_summaries(campaign._id)}
+        awards = {character_id: xp_amount for character_id in members} if xp_amount is not None else {}
+        awards.update({ObjectId(character_id): amount for character_id, amount in per_character.items()})
+
+        results = []
+        valid_awards = {character_id: amount for character_id, amount in awards.items() if character_id in members}
+        updated = db_manager.award_campaign_xp(campaign._id, valid_awards)
+
+        for character_id, amount in awards.items():
+            totals = updated.get(character_id)
+            if totals is None:
+                results.append({
+                    'character_id': str(character_id),
+                    'success': False,
+                    'error': 'Character not found in campaign'
+                })
+                continue
+
+            results.append({
+                'character_id': str(character_id),
+                'name': members[character_id].name,
+                'success': True,
+                'xp_awarded': amount,
+                'total_xp': totals['total_xp'],
+                'available_xp': totals['available_xp']
+            })
+
+        awarded_count = sum(1 for result in results if result['success'])
+        return jsonify({
+            'message': f'Awarded XP to {awarded_count} characters for: {reason}',
+            'results': results
+        }), 200
+
+    except Exception as e:
+        app.logger.error(f"Award campaign XP error: {str(e)}")
+        return jsonify({'error': 'Operation failed'}), 500
+
 # Health Check Route (for Docker)
 @app.route('/health')
 def health_check():
@@ -628,29 +732,16 @@ def get_characters():
     """Get all characters for the current user."""
     try:
         current_user_id = get_current_user_id()
-        user = db_manager.get_user_by_id(current_user_id)
         
-        # Get characters from database
-        characters = db_manager.get_user_characters(current_user_id)
-        
-        # Convert to dict format
-        characters_data = []
-        for char in characters:
-            characters_data.append({
-                'id': str(char._id),
-                'name': char.name,
-                'playerName': char.player_name,
-                'species': char.species,
-                'career': char.career,
-                'background': char.background or '',
-                'created_at': char.created_at.isoformat() if hasattr(char, 'created_at') else None
-            })
-        
-        return jsonify({
-            'characters': characters_data,
-            'total': len(characters_data)
-        })
+        # Character summaries only - the list view needs no sheet data
+        return paginated_response(
+            'characters',
+            lambda after, limit: db_manager.iter_user_character_summaries(current_user_id, after=after, limit=limit),
+            api_common.serialize_character_summary
+        )
         
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         app.logger.error(f"Error getting characters: {e}")
         return jsonify({'error': 'Failed to retrieve characters'}), 500
@@ -711,40 +802,13 @@ def get_character_detail(character_id):
         current_user_id = get_current_user_id()
         character = db_manager.get_character_by_id(ObjectId(character_id))
         
-        if not character:
-            return jsonify({'error': 'Character not found'}), 404
+        # Owners and admins may read a character
+        current_user = auth_manager.get_current_user()
+        error = api_common.character_access_error(character, current_user_id, current_user.role, allow_admin=True)
+        if error:
+            return jsonify({'error': error[1]}), error[0]
             
-        # Check if user owns this character or is admin
-        current_user = db_manager.get_user_by_id(current_user_id)
-        if character.user_id != current_user_id and current_user.role != 'admin':
-            return jsonify({'error': 'Access denied'}), 403
-            
-        return jsonify({
-            'id': str(character._id),
-            'name': character.name,
-            'player_name': character.player_name,
-            'species': character.species,
-            'career': character.career,
-            'background': character.background,
-            'brawn': character.brawn,
-            'agility': character.agility,
-            'intellect': character.intellect,
-            'cunning': character.cunning,
-            'willpower': character.willpower,
-            'presence': character.presence,
-            'total_xp': character.total_xp,
-            'available_xp': character.available_xp,
-            'spent_xp': character.spent_xp,
-            'skills': character.skills,
-            'talents': character.talents,
-            'credits': character.credits,
-            'equipment': character.equipment,
-            'obligations': character.obligations,
-            'creation_context': character.creation_context,
-            'created_at': character.created_at.isoformat() if character.created_at else None,
-            'updated_at': character.updated_at.isoformat() if character.updated_at else None,
-            'campaign_id': str(character.campaign_id) if character.campaign_id else None
-        }), 200
+        return jsonify(api_common.serialize_character_detail(character)), 200
         
     except Exception as e:
         app.logger.error(f"Get character detail error: {str(e)}")
@@ -758,34 +822,17 @@ def update_character(character_id):
         current_user_id = get_current_user_id()
         character = db_manager.get_character_by_id(ObjectId(character_id))
         
-        if not character:
-            return jsonify({'error': 'Character not found'}), 404
-            
-        # Check if user owns this character
-        if character.user_id != current_user_id:
-            return jsonify({'error': 'Access denied'}), 403
-            
-        data = request.get_json()
-        
-        # Build update dictionary
-        updates = {}
-        updatable_fields = ['name', 'player_name', 'background', 'brawn', 'agility', 
-                           'intellect', 'cunning', 'willpower', 'presence', 'credits',
-                           'equipment', 'obligations', 'skills', 'talents']
-        
-        for field in updatable_fields:
-            if field in data:
-                updates[field] = data[field]
+        error = api_common.character_access_error(character, current_user_id)
+        if error:
+            return jsonify({'error': error[1]}), error[0]
         
-        if updates:
-            success = db_manager.update_character(ObjectId(character_id), updates)
-            if success:
-                return jsonify({'message': 'Character updated successfully'}), 200
-            else:
-                return jsonify({'error': 'Failed to update character'}), 500
-        else:
-            return jsonify({'error': 'No valid fields to update'}), 400
+        updates = api_common.character_updates(request.get_json(silent=True))
+        if db_manager.update_character(ObjectId(character_id), updates):
+            return jsonify({'message': 'Character updated successfully'}), 200
+        return jsonify({'error': 'Failed to update character'}), 500
             
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         app.logger.error(f"Update character error: {str(e)}")
         return jsonify({'error': 'Operation failed'}), 500
@@ -798,15 +845,12 @@ def delete_character(character_id):
         current_user_id = get_current_user_id()
         character = db_manager.get_character_by_id(ObjectId(character_id))
         
-        if not character:
-            return jsonify({'error': 'Character not found'}), 404
-            
-        # Check if user owns this character
-        if character.user_id != current_user_id:
-            return jsonify({'error': 'Access denied'}), 403
+        error = api_common.character_access_error(character, current_user_id, active_only=True)
+        if error:
+            return jsonify({'error': error[1]}), error[0]
             
         # Mark character as inactive instead of deleting
-        success = db_manager.update_character(ObjectId(character_id), {'is_active': False})
+        success = db_manager.deactivate_character(ObjectId(character_id))
         
         if success:
             return jsonify({'message': 'Character deleted successfully'}), 200
@@ -823,47 +867,27 @@ def award_xp(character_id):
     """Award XP to a character."""
     try:
         current_user_id = get_current_user_id()
-        character = db_manager.get_character_by_id(ObjectId(character_id))
-        
-        if not character:
-            return jsonify({'error': 'Character not found'}), 404
-            
-        # Check if user owns this character or is GM of the campaign
-        current_user = db_manager.get_user_by_id(current_user_id)
-        can_award = (character.user_id == current_user_id or 
-                    current_user.role == 'admin' or 
-                    current_user.role == 'gamemaster')
-        
-        if not can_award:
-            return jsonify({'error': 'Access denied'}), 403
-            
-        data = request.get_json()
-        xp_amount = data.get('xp_amount', 0)
-        reason = data.get('reason', 'XP Award')
+        xp_amount, reason = api_common.parse_xp_award(request.get_json(silent=True))
         
-        if xp_amount <= 0:
-            return jsonify({'error': 'XP amount must be positive'}), 400
-            
-        # Award XP
-        new_total_xp = character.total_xp + xp_amount
-        new_available_xp = character.available_xp + xp_amount
+        current_user = auth_manager.get_current_user()
+        owner_filter = api_common.xp_award_owner_filter(current_user.role, current_user_id)
         
-        updates = {
-            'total_xp': new_total_xp,
-            'available_xp': new_available_xp
-        }
+        # Award XP in a single guarded update
+        result = db_manager.award_character_xp(ObjectId(character_id), xp_amount, user_id=owner_filter)
         
-        success = db_manager.update_character(ObjectId(character_id), updates)
+        if not result:
+            if not db_manager.get_character_by_id(ObjectId(character_id)):
+                return jsonify({'error': 'Character not found'}), 404
+            return jsonify({'error': 'Access denied'}), 403
         
-        if success:
-            return jsonify({
-                'message': f'Awarded {xp_amount} XP for: {reason}',
-                'total_xp': new_total_xp,
-                'available_xp': new_available_xp
-            }), 200
-        else:
-            return jsonify({'error': 'Failed to award XP'}), 500
+        return jsonify({
+            'message': f'Awarded {xp_amount} XP for: {reason}',
+            'total_xp': result['total_xp'],
+            'available_xp': result['available_xp']
+        }), 200
             
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         app.logger.error(f"Award XP error: {str(e)}")
         return jsonify({'error': 'Operation failed'}), 500
@@ -874,56 +898,28 @@ def advance_skill(character_id):
     """Advance a character's skill."""
     try:
         current_user_id = get_current_user_id()
-        character = db_manager.get_character_by_id(ObjectId(character_id))
-        
-        if not character:
-            return jsonify({'error': 'Character not found'}), 404
-            
-        # Check if user owns this character
-        if character.user_id != current_user_id:
-            return jsonify({'error': 'Access denied'}), 403
-            
         data = request.get_json()
         skill_name = data.get('skill_name')
         
-        if not skill_name or skill_name not in character.skills:
+        try:
+            # Rank and XP checks are part of the update itself
+            result = db_manager.advance_character_skill(ObjectId(character_id), skill_name, current_user_id)
+        except ValueError:
             return jsonify({'error': 'Invalid skill name'}), 400
-            
-        current_rank = character.skills[skill_name].get('rank', 0)
-        new_rank = current_rank + 1
         
-        if new_rank > 5:
-            return jsonify({'error': 'Skill rank cannot exceed 5'}), 400
-            
-        # Calculate XP cost (5 * new rank)
-        xp_cost = 5 * new_rank
-        
-        if character.available_xp < xp_cost:
-            return jsonify({'error': f'Insufficient XP. Need {xp_cost}, have {character.available_xp}'}), 400
-            
-        # Update skill and XP
-        character.skills[skill_name]['rank'] = new_rank
-        new_available_xp = character.available_xp - xp_cost
-        new_spent_xp = character.spent_xp + xp_cost
+        if not result:
+            return advancement_failure_response(character_id, current_user_id, skill_name=skill_name)
         
-        updates = {
-            'skills': character.skills,
-            'available_xp': new_available_xp,
-            'spent_xp': new_spent_xp
-        }
-        
-        success = db_manager.update_character(ObjectId(character_id), updates)
+        new_rank = result['skills'][skill_name]['rank']
+        xp_cost = 5 * new_rank
         
-        if success:
-            return jsonify({
-                'message': f'Advanced {skill_name} to rank {new_rank}',
-                'skill_name': skill_name,
-                'new_rank': new_rank,
-                'xp_cost': xp_cost,
-                'available_xp': new_available_xp
-            }), 200
-        else:
-            return jsonify({'error': 'Failed to advance skill'}), 500
+        return jsonify({
+            'message': f'Advanced {skill_name} to rank {new_rank}',
+            'skill_name': skill_name,
+            'new_rank': new_rank,
+            'xp_cost': xp_cost,
+            'available_xp': result['available_xp']
+        }), 200
             
     except Exception as e:
         app.logger.error(f"Advance skill error: {str(e)}")
@@ -935,62 +931,72 @@ def advance_characteristic(character_id):
     """Advance a character's characteristic."""
     try:
         current_user_id = get_current_user_id()
-        character = db_manager.get_character_by_id(ObjectId(character_id))
-        
-        if not character:
-            return jsonify({'error': 'Character not found'}), 404
-            
-        # Check if user owns this character
-        if character.user_id != current_user_id:
-            return jsonify({'error': 'Access denied'}), 403
-            
         data = request.get_json()
         characteristic_name = data.get('characteristic_name')
         
         valid_characteristics = ['brawn', 'agility', 'intellect', 'cunning', 'willpower', 'presence']
         if characteristic_name not in valid_characteristics:
             return jsonify({'error': 'Invalid characteristic name'}), 400
-            
-        current_value = getattr(character, characteristic_name)
-        new_value = current_value + 1
         
-        if new_value > 6:
-            return jsonify({'error': 'Characteristic cannot exceed 6'}), 400
-            
-        # Calculate XP cost based on new value
-        xp_costs = {3: 30, 4: 40, 5: 50, 6: 60}
-        xp_cost = xp_costs.get(new_value, 10)
+        # Value cap and XP checks are part of the update itself
+        result = db_manager.advance_character_characteristic(ObjectId(character_id), characteristic_name, current_user_id)
         
-        if character.available_xp < xp_cost:
-            return jsonify({'error': f'Insufficient XP. Need {xp_cost}, have {character.available_xp}'}), 400
-            
-        # Update characteristic and XP
-        new_available_xp = character.available_xp - xp_cost
-        new_spent_xp = character.spent_xp + xp_cost
+        if not result:
+            return advancement_failure_response(character_id, current_user_id, characteristic_name=characteristic_name)
         
-        updates = {
-            characteristic_name: new_value,
-            'available_xp': new_available_xp,
-            'spent_xp': new_spent_xp
-        }
-        
-        success = db_manager.update_character(ObjectId(character_id), updates)
+        new_value = result[characteristic_name]
+        xp_cost = characteristic_xp_cost(new_value)
         
-        if success:
-            return jsonify({
-                'message': f'Advanced {characteristic_name} to {new_value}',
-                'characteristic_name': characteristic_name,
-                'new_value': new_value,
-                'xp_cost': xp_cost,
-                'available_xp': new_available_xp
-            }), 200
-        else:
-            return jsonify({'error': 'Failed to advance characteristic'}), 500
+        return jsonify({
+            'message': f'Advanced {characteristic_name} to {new_value}',
+            'characteristic_name': characteristic_name,
+            'new_value': new_value,
+            'xp_cost': xp_cost,
+            'available_xp': result['available_xp']
+        }), 200
             
     except Exception as e:
         app.logger.error(f"Advance characteristic error: {str(e)}")
         return jsonify({'error': 'Operation failed'}), 500
 
+def characteristic_xp_cost(new_value):
+    """XP cost of raising a characteristic to new_value."""
+    xp_costs = {3: 30, 4: 40, 5: 50, 6: 60}
+    return xp_costs.get(new_value, 10)
+
+def advancement_failure_response(character_id, current_user_id, skill_name=None, characteristic_name=None):
+    """Explain why a guarded advancement update matched no character.
+    
+    Only runs on the failure path; the successful path never reads the character.
+    """
+    character = db_manager.get_character_by_id(ObjectId(character_id))
+    
+    if not character:
+        return jsonify({'error': 'Character not found'}), 404
+        
+    # Check if user owns this character
+    if character.user_id != current_user_id:
+        return jsonify({'error': 'Access denied'}), 403
+    
+    if skill_name is not None:
+        if skill_name not in character.skills:
+            return jsonify({'error': 'Invalid skill name'}), 400
+        new_rank = character.skills[skill_name].get('rank', 0) + 1
+        if new_rank > MAX_SKILL_RANK:
+            return jsonify({'error': f'Skill rank cannot exceed {MAX_SKILL_RANK}'}), 400
+        xp_cost = 5 * new_rank
+    else:
+        new_value = getattr(character, characteristic_name) + 1
+        if new_value > MAX_CHARACTERISTIC_VALUE:
+            return jsonify({'error': f'Characteristic cannot exceed {MAX_CHARACTERISTIC_VALUE}'}), 400
+        xp_cost = characteristic_xp_cost(new_value)
+    
+    if character.available_xp < xp_cost:
+        return jsonify({'error': f'Insufficient XP. Need {xp_cost}, have {character.available_xp}'}), 400
+    
+    # The guard failed but the character now looks advanceable: it changed concurrently
+    return jsonify({'error': 'Character was modified concurrently, please retry'}), 409
+
 @app.route('/api/characters/<character_id>/assign-campaign', methods=['POST'])
 @auth_manager.require_auth
 def assign_character_to_campaign(character_id):
@@ -1037,37 +1043,64 @@ def assign_character_to_campaign(character_id):
         return jsonify({'error': 'Operation failed'}), 500
 
 # Character Data API Routes
+def build_species_payload():
+    """Convert CharacterCreator species data to the API format, sorted by name."""
+    species_list = []
+    
+    for species_name, species_info in creator.species_data.items():
+        # Convert the internal species data format to API format
+        species_entry = {
+            'name': species_name,
+            'description': species_info.get('description', f'{species_name} species from the Star Wars universe.'),
+            'characteristics': {
+                'brawn': species_info.get('brawn', 2),
+                'agility': species_info.get('agility', 2), 
+                'intellect': species_info.get('intellect', 2),
+                'cunning': species_info.get('cunning', 2),
+                'willpower': species_info.get('willpower', 2),
+                'presence': species_info.get('presence', 2)
+            },
+            'wound_threshold': species_info.get('wound_threshold', 10),
+            'strain_threshold': species_info.get('strain_threshold', 10),
+            'starting_xp': species_info.get('starting_xp', 100),
+            'special_abilities': species_info.get('special_abilities', [])
+        }
+        species_list.append(species_entry)
+    
+    # Sort alphabetically for better UI experience
+    species_list.sort(key=lambda x: x['name'])
+    return {'species': species_list}
+
+def build_careers_payload():
+    """Convert CharacterCreator careers to the API format, sorted by name."""
+    careers_list = []
+    
+    for career_name, career_obj in creator.careers.items():
+        # Convert the internal career data format to API format
+        career_entry = {
+            'name': career_name,
+            'description': career_obj.description if hasattr(career_obj, 'description') else f'{career_name} career from the Star Wars RPG.',
+            'career_skills': career_obj.career_skills,
+            'game_line': career_obj.game_line.value if hasattr(career_obj.game_line, 'value') else str(career_obj.game_line),
+            'starting_wound_threshold': career_obj.starting_wound_threshold,
+            'starting_strain_threshold': career_obj.starting_strain_threshold,
+            'specializations': []  # Would be populated from specializations data
+        }
+        careers_list.append(career_entry)
+    
+    # Sort alphabetically for better UI experience
+    careers_list.sort(key=lambda x: x['name'])
+    return {'careers': careers_list}
+
+# Reference data never changes at runtime: serialize and compress it once
+species_snapshot = ReferenceSnapshot(build_species_payload())
+careers_snapshot = ReferenceSnapshot(build_careers_payload())
+
 @app.route('/api/character-data/species', methods=['GET'])
 def get_species_data():
     """Get all species data for character creation."""
     try:
-        # Use the loaded species data from CharacterCreator
-        species_list = []
-        
-        for species_name, species_info in creator.species_data.items():
-            # Convert the internal species data format to API format
-            species_entry = {
-                'name': species_name,
-                'description': species_info.get('description', f'{species_name} species from the Star Wars universe.'),
-                'characteristics': {
-                    'brawn': species_info.get('brawn', 2),
-                    'agility': species_info.get('agility', 2), 
-                    'intellect': species_info.get('intellect', 2),
-                    'cunning': species_info.get('cunning', 2),
-                    'willpower': species_info.get('willpower', 2),
-                    'presence': species_info.get('presence', 2)
-                },
-                'wound_threshold': species_info.get('wound_threshold', 10),
-                'strain_threshold': species_info.get('strain_threshold', 10),
-                'starting_xp': species_info.get('starting_xp', 100),
-                'special_abilities': species_info.get('special_abilities', [])
-            }
-            species_list.append(species_entry)
-        
-        # Sort alphabetically for better UI experience
-        species_list.sort(key=lambda x: x['name'])
-        
-        return jsonify({'species': species_list}), 200
+        return species_snapshot.response()
         
     except Exception as e:
         app.logger.error(f"Get species data error: {str(e)}")
@@ -1077,26 +1110,7 @@ def get_species_data():
 def get_careers_data():
     """Get all careers data for character creation."""
     try:
-        # Use the loaded career data from CharacterCreator
-        careers_list = []
-        
-        for career_name, career_obj in creator.careers.items():
-            # Convert the internal career data format to API format
-            career_entry = {
-                'name': career_name,
-                'description': career_obj.description if hasattr(career_obj, 'description') else f'{career_name} career from the Star Wars RPG.',
-                'career_skills': career_obj.career_skills,
-                'game_line': career_obj.game_line.value if hasattr(career_obj.game_line, 'value') else str(career_obj.game_line),
-                'starting_wound_threshold': career_obj.starting_wound_threshold,
-                'starting_strain_threshold': career_obj.starting_strain_threshold,
-                'specializations': []  # Would be populated from specializations data
-            }
-            careers_list.append(career_entry)
-        
-        # Sort alphabetically for better UI experience
-        careers_list.sort(key=lambda x: x['name'])
-        
-        return jsonify({'careers': careers_list}), 200
+        return careers_snapshot.response()
         
     except Exception as e:
         app.logger.error(f"Get careers data error: {str(e)}")
@@ -1108,15 +1122,9 @@ def get_careers_data():
 def get_admin_stats():
     """Get system statistics for admin dashboard."""
     try:
-        # Basic stats - would be expanded with more detailed information
-        stats = {
-            'total_users': 1,  # Placeholder
-            'total_characters': 0,  # Placeholder
-            'total_campaigns': 0,  # Placeholder
-            'active_sessions': 1,  # Placeholder
-        }
-        
-        return jsonify(stats), 200
+        # ?reconcile=true recomputes the counters instead of waiting for the periodic pass
+        force_reconcile = request.args.get('reconcile', '').lower() == 'true'
+        return jsonify(db_manager.get_admin_stats(force_reconcile=force_reconcile)), 200
         
     except Exception as e:
         app.logger.error(f"Get admin stats error: {str(e)}")
@@ -1125,18 +1133,118 @@ def get_admin_stats():
 @app.route('/api/admin/users', methods=['GET'])
 @auth_manager.require_role('admin')
 def get_all_users():
-    """Get all users for admin management."""
+    """Get users for admin management, one page at a time.
+    
+    Filters: ?role=, ?active=true|false, ?provider=google|discord|local,
+    ?created_after= / ?created_before= (ISO 8601). Pages default to
+    ADMIN_USERS_PAGE_SIZE users; follow 'next' with ?after=.
+    """
     try:
-        # This would return basic user information for admin management
-        # For now, return empty array as placeholder
-        users = []
+        role = request.args.get('role')
+        if role and role not in ('player', 'gamemaster', 'admin'):
+            raise ValueError('role must be player, gamemaster or admin')
+        
+        active = request.args.get('active')
+        if active is not None and active not in ('true', 'false'):
+            raise ValueError('active must be true or false')
+        
+        provider = request.args.get('provider')
+        if provider and provider not in ('google', 'discord', 'local'):
+            raise ValueError('provider must be google, discord or local')
+        
+        created_range = {}
+        for arg in ('created_after', 'created_before'):
+            if request.args.get(arg):
+                created = datetime.fromisoformat(request.args[arg])
+                created_range[arg] = created if created.tzinfo else created.replace(tzinfo=timezone.utc)
+        
+        def serialize(user):
+            return {
+                'id': str(user._id),
+                'username': user.username,
+                'email': user.email,
+                'role': user.role,
+                'is_active': user.is_active,
+                'providers': [name for name in ('google', 'discord') if getattr(user, f'{name}_id')] or ['local'],
+                'created_at': user.created_at.isoformat() if user.created_at else None,
+                'updated_at': user.updated_at.isoformat() if user.updated_at else None
+            }
         
-        return jsonify({'users': users, 'total': len(users)}), 200
+        return paginated_response(
+            'users',
+            lambda after, limit: db_manager.iter_users(
+                role=role,
+                is_active=None if active is None else active == 'true',
+                provider=provider,
+                after=after,
+                limit=limit,
+                **created_range
+            ),
+            serialize,
+            default_limit=ADMIN_USERS_PAGE_SIZE
+        )
         
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         app.logger.error(f"Get all users error: {str(e)}")
         return jsonify({'error': 'Operation failed'}), 500
 
+@app.route('/api/admin/audit-metrics', methods=['GET'])
+@auth_manager.require_role('admin')
+def get_audit_metrics():
+    """Get audit pipeline counters for this worker process."""
+    try:
+        return jsonify(audit_log.metrics()), 200
+        
+    except Exception as e:
+        app.logger.error(f"Get audit metrics error: {str(e)}")
+        return jsonify({'error': 'Operation failed'}), 500
+
+@app.route('/api/admin/db-pool-metrics', methods=['GET'])
+@auth_manager.require_role('admin')
+def get_db_pool_metrics():
+    """Get MongoDB connection pool utilization for this worker process."""
+    try:
+        return jsonify({
+            'sync': db_manager.pool_metrics(),
+            'async': async_db_manager.pool_metrics()
+        }), 200
+        
+    except Exception as e:
+        app.logger.error(f"Get pool metrics error: {str(e)}")
+        return jsonify({'error': 'Operation failed'}), 500
+
+# Admin user listing page size when no ?limit= is given
+ADMIN_USERS_PAGE_SIZE = 50
+
+def get_page_args(default_limit=None):
+    """Parse keyset pagination arguments (?limit=&after=) from the request."""
+    return api_common.parse_page_args(request.args.get('limit'), request.args.get('after'), default_limit)
+
+def wants_ndjson():
+    """Check whether the client asked for a streamed NDJSON listing."""
+    return api_common.wants_ndjson(request.args.get('format'), request.headers.get('Accept'))
+
+def paginated_response(key, fetch, serialize, default_limit=None):
+    """Build a keyset-paginated listing response.
+    
+    fetch(after, limit) must return an iterator of records in _id order. JSON
+    responses hold one page plus a 'next' cursor (null on the last page);
+    NDJSON responses stream every record straight from the database cursor.
+    Listings too large to return whole pass a default_limit.
+    """
+    limit, after = get_page_args(default_limit)
+    
+    if wants_ndjson():
+        def generate():
+            for record in fetch(after, limit):
+                yield api_common.ndjson_line(serialize(record))
+        return Response(stream_with_context(generate()), mimetype=api_common.NDJSON_MIMETYPE)
+    
+    items = [serialize(record) for record in fetch(after, api_common.page_fetch_limit(limit))]
+    return jsonify(api_common.build_page(key, items, limit)), 200
+
 def get_current_user_id():
     """Get current user ID from either JWT token or session."""
     try:
@@ -1166,7 +1274,7 @@ def campaigns_page():
     """Campaign management page."""
     try:
         current_user_id = get_current_user_id()
-        current_user = db_manager.get_user_by_id(current_user_id)
+        current_user = auth_manager.get_current_user()
         return render_template('campaigns.html', current_user=current_user)
     except Exception as e:
         app.logger.error(f"Error loading campaigns page: {e}")
@@ -1183,7 +1291,7 @@ def admin_page():
     """Admin panel page."""
     try:
         current_user_id = get_current_user_id()
-        current_user = db_manager.get_user_by_id(current_user_id)
+        current_user = auth_manager.get_current_user()
         
         # Check if user is admin
         if not current_user or current_user.role != 'admin':
@@ -1200,7 +1308,7 @@ def profile_page():
     """User profile page."""
     try:
         current_user_id = get_current_user_id()
-        current_user = db_manager.get_user_by_id(current_user_id)
+        current_user = auth_manager.get_current_user()
         return render_template('profile.html', current_user=current_user)
     except Exception as e:
         app.logger.error(f"Error loading profile page: {e}")
@@ -1220,7 +1328,7 @@ def character_detail_page(character_id):
                                  error_message='Character not found'), 404
             
         # Check if user owns this character or is admin
-        current_user = db_manager.get_user_by_id(current_user_id)
+        current_user = auth_manager.get_current_user()
         if character.user_id != current_user_id and current_user.role != 'admin':
             return render_template('error.html', 
                                  error_code=403, 
@@ -1242,7 +1350,7 @@ def create_character_start():
     """Character creation page."""
     try:
         current_user_id = get_current_user_id()
-        current_user = db_manager.get_user_by_id(current_user_id)
+        current_user = auth_manager.get_current_user()
         return render_template('create_character_fixed.html', current_user=current_user)
     except Exception as e:
         app.logger.error(f"Error loading character creation page: {e}")
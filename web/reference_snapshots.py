@@ -0,0 +1,61 @@
+# Precomputed HTTP snapshots of static reference data
+import gzip
+import hashlib
+import json
+from flask import Response, request
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; snapshots fall back to gzip
+    brotli = None
+
+
+class ReferenceSnapshot:
+    """A JSON payload serialized, compressed and hashed once, then served as-is.
+
+    Meant for data that never changes while the process runs (species, careers).
+    Every content-coding gets its own strong ETag so caches never mix them up.
+    """
+
+    def __init__(self, payload, max_age=3600):
+        body = json.dumps(payload, separators=(',', ':'), sort_keys=True).encode('utf-8')
+        digest = hashlib.sha256(body).hexdigest()[:32]
+
+        # encoding -> (body, etag)
+        self.variants = {
+            'identity': (body, digest),
+            'gzip': (gzip.compress(body, compresslevel=9, mtime=0), f'{digest}-gz'),
+        }
+        if brotli is not None:
+            self.variants['br'] = (brotli.compress(body, quality=11), f'{digest}-br')
+
+        self.etags = [etag for _, etag in self.variants.values()]
+        self.cache_control = f'public, max-age={max_age}'
+
+    def _negotiate_encoding(self):
+        """Pick the smallest variant the client accepts."""
+        accepted = request.accept_encodings
+        for encoding in ('br', 'gzip'):
+            if encoding in self.variants and accepted.quality(encoding) > 0:
+                return encoding
+        return 'identity'
+
+    def response(self):
+        """Build the response for the current request, answering 304 on a matching ETag.
+
+        If-None-Match uses weak comparison (RFC 9110), so W/"etag" matches too.
+        """
+        encoding = self._negotiate_encoding()
+        body, etag = self.variants[encoding]
+
+        if any(request.if_none_match.contains_weak(known) for known in self.etags):
+            response = Response(status=304)
+        else:
+            response = Response(body, mimetype='application/json')
+            if encoding != 'identity':
+                response.headers['Content-Encoding'] = encoding
+
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = self.cache_control
+        response.headers['Vary'] = 'Accept-Encoding'
+        return response
@@ -17,6 +17,12 @@ os.chdir(web_dir)
 # Import the Flask application
 from app_with_auth import app
 
+# Under `gunicorn --preload` this runs once in the master: freeze everything loaded
+# so far (reference data included) so the workers' garbage collector doesn't touch
+# those objects and dirty the pages they share copy-on-write.
+import gc
+gc.freeze()
+
 # This is what Gunicorn will use
 application = app
 